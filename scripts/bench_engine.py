@@ -0,0 +1,57 @@
+"""Time analyze_market_structure on a synthetic zigzag series of monowaves."""
+
+from __future__ import annotations
+
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from neowave_core.models import Monowave
+from neowave_core.wave_engine import analyze_market_structure
+
+
+def synthetic_monowaves(count: int, seed: int = 7) -> list[Monowave]:
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    price, idx = 100.0, 0
+    monowaves: list[Monowave] = []
+    for i in range(count):
+        bars = rng.randint(2, 9)
+        move = rng.uniform(0.5, 6.0) * (1 if i % 2 == 0 else -1)
+        end_price = max(price + move, 1.0)
+        monowaves.append(
+            Monowave(
+                id=i,
+                start_idx=idx,
+                end_idx=idx + bars,
+                start_time=base + timedelta(hours=idx),
+                end_time=base + timedelta(hours=idx + bars),
+                start_price=price,
+                end_price=end_price,
+                high_price=max(price, end_price),
+                low_price=min(price, end_price),
+                direction="up" if end_price >= price else "down",
+                price_change=end_price - price,
+                abs_price_change=abs(end_price - price),
+                duration=bars,
+            )
+        )
+        price, idx = end_price, idx + bars
+    return monowaves
+
+
+def main(count: str = "120", repeats: str = "5") -> int:
+    monowaves = synthetic_monowaves(int(count))
+    timings = []
+    for _ in range(int(repeats)):
+        t0 = time.perf_counter()
+        scenarios = analyze_market_structure(monowaves, beam_width=6)
+        timings.append((time.perf_counter() - t0) * 1000.0)
+    print(f"{len(monowaves)} monowaves, {len(scenarios)} scenarios: median {statistics.median(timings):.1f} ms, best {min(timings):.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main(*sys.argv[1:3]))
@@ -0,0 +1,22 @@
+"""Precompile rules/neowave_rules.json into the hash-versioned rule-set artifact."""
+
+from __future__ import annotations
+
+import sys
+
+from neowave_core.rules_loader import build_rules_artifact, load_compiled_rules
+
+
+def main(path: str = "rules/neowave_rules.json") -> int:
+    try:
+        artifact = build_rules_artifact(path)
+    except FileNotFoundError as exc:
+        print(exc)
+        return 1
+    compiled = load_compiled_rules(path)
+    print(f"Wrote {artifact} (rules hash {compiled.source_hash[:16]})")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main(*sys.argv[1:2]))
@@ -3,12 +3,13 @@
 from neowave_core.config import AnalysisConfig
 from neowave_core.data_loader import fetch_ohlcv
 from neowave_core.macro_scanner import MacroScanner
-from neowave_core.models import Monowave, PatternValidation, Scenario, WaveNode
+from neowave_core.models import Monowave, PatternValidation, Scenario, WaveNode, WaveTree
 from neowave_core.parser import parse_wave_tree
+from neowave_core.pattern_evaluator import PatternEvaluator, RuleProfiler
 from neowave_core.rules_db import RULE_DB, load_rule_db
 from neowave_core.scenarios import generate_scenarios, serialize_scenario, serialize_wave_node
-from neowave_core.swings import detect_monowaves, detect_monowaves_from_df, merge_by_similarity
-from neowave_core.wave_engine import analyze_market_structure, get_view_nodes, verify_pattern
+from neowave_core.swings import MonowaveIndex, SwingRangeIndex, detect_monowaves, detect_monowaves_from_df, merge_by_similarity
+from neowave_core.wave_engine import AnalysisReport, AnalysisResult, BeamSearch, BestFirstSearch, SearchStrategy, WaveIndex, analyze_incremental, analyze_market_structure, analyze_segmented, get_view_nodes, run_analysis, verify_pattern, verify_patterns
 
 __all__ = [
     "AnalysisConfig",
@@ -16,6 +17,9 @@ __all__ = [
     "PatternValidation",
     "Scenario",
     "WaveNode",
+    "WaveTree",
+    "PatternEvaluator",
+    "RuleProfiler",
     "RULE_DB",
     "load_rule_db",
     "parse_wave_tree",
@@ -24,9 +28,21 @@ __all__ = [
     "detect_monowaves_from_df",
     "identify_major_pivots",
     "merge_by_similarity",
+    "MonowaveIndex",
+    "SwingRangeIndex",
     "analyze_market_structure",
+    "analyze_incremental",
+    "analyze_segmented",
+    "run_analysis",
+    "AnalysisReport",
+    "AnalysisResult",
+    "WaveIndex",
+    "SearchStrategy",
+    "BeamSearch",
+    "BestFirstSearch",
     "generate_scenarios",
     "fetch_ohlcv",
     "MacroScanner",
     "verify_pattern",
+    "verify_patterns",
 ]
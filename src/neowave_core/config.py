@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import logging
 import os
 from dataclasses import dataclass, field
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
 
 
 DEFAULT_SYMBOL = "BTCUSD"
@@ -25,6 +29,13 @@ def _env_float(name: str, default: float) -> float:
         return default
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
 def _env_int(name: str, default: int) -> int:
     raw = os.getenv(name)
     if raw is None:
@@ -35,6 +46,16 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _env_choice(name: str, default: str, choices: Iterable[str]) -> str:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    if raw not in choices:
+        logger.warning("Ignoring %s=%r (expected one of %s); using %r", name, raw, sorted(choices), default)
+        return default
+    return raw
+
+
 @dataclass(slots=True)
 class AnalysisConfig:
     """Runtime configuration for a NEoWave analysis run."""
@@ -47,10 +68,15 @@ class AnalysisConfig:
     min_price_retrace_ratio: float = DEFAULT_MIN_PRICE_RETRACE_RATIO
     min_time_ratio: float = DEFAULT_MIN_TIME_RATIO
     target_monowaves: int = DEFAULT_TARGET_MONOWAVES
+    profile_rules: bool = False  # collect per-rule PatternEvaluator statistics
+    analysis_workers: int = 0  # >1 expands beam members in a process pool
+    analysis_strategy: str = "beam"  # scenario search strategy: "beam" or "best_first"
 
     @classmethod
     def from_env(cls) -> "AnalysisConfig":
         """Build a config using environment variables (see .env.example)."""
+        from neowave_core.wave_engine import SEARCH_STRATEGIES
+
         return cls(
             symbol=os.getenv("SYMBOL", DEFAULT_SYMBOL),
             interval=os.getenv("INTERVAL", DEFAULT_INTERVAL),
@@ -60,4 +86,7 @@ class AnalysisConfig:
             min_price_retrace_ratio=_env_float("MIN_PRICE_RETRACE_RATIO", DEFAULT_MIN_PRICE_RETRACE_RATIO),
             min_time_ratio=_env_float("MIN_TIME_RATIO", DEFAULT_MIN_TIME_RATIO),
             target_monowaves=_env_int("TARGET_MONOWAVES", DEFAULT_TARGET_MONOWAVES),
+            profile_rules=_env_bool("PROFILE_RULES", False),
+            analysis_workers=_env_int("ANALYSIS_WORKERS", 0),
+            analysis_strategy=_env_choice("ANALYSIS_STRATEGY", "beam", SEARCH_STRATEGIES),
         )
@@ -1,20 +1,21 @@
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from typing import Any, Sequence
 
 import pandas as pd
 
 from neowave_core.models import Monowave, PatternValidation, Scenario, WaveNode
-from neowave_core.pattern_evaluator import PatternEvaluator
+from neowave_core.pattern_evaluator import PatternEvaluator, RuleProfiler
 from neowave_core.rules_db import RULE_DB, load_rule_db
 from neowave_core.swings import auto_select_timeframe, detect_monowaves_from_df
 from neowave_core.wave_engine import (
     PatternMatch,
     find_all_local_patterns,
     wrap_monowaves,
-    _new_scenario_id,
+    content_scenario_id,
     build_wavenode_from_match
 )
 
@@ -30,10 +31,11 @@ class MacroScanner:
     """
 
     rule_db: dict[str, Any]
+    profiler: RuleProfiler | None = None
     evaluator: PatternEvaluator = field(init=False)
 
     def __post_init__(self):
-        self.evaluator = PatternEvaluator(self.rule_db)
+        self.evaluator = PatternEvaluator(self.rule_db, profiler=self.profiler)
 
     def scan(self, df: pd.DataFrame, target_wave_count: int = 12) -> list[Scenario]:
         """
@@ -101,7 +103,7 @@ class MacroScanner:
             collapsed_roots = self._collapse_match_in_sequence(nodes, match)
             
             sc = Scenario(
-                id=_new_scenario_id(),
+                id=content_scenario_id(collapsed_roots),
                 root_nodes=collapsed_roots,
                 global_score=match.score, # Start with pattern score
                 status="active",
@@ -259,25 +261,12 @@ class MacroScanner:
     def _collapse_match_in_sequence(self, nodes: list[WaveNode], match: PatternMatch) -> list[WaveNode]:
         """
         Returns a new list of nodes where the matched segment is replaced by a single parent node.
+        The segment start is found by binary search; the rest is copied as two slices.
         """
-        new_nodes = []
-        i = 0
-        while i < len(nodes):
-            if nodes[i].start_idx == match.start_index:
-                # This is the start of the match
-                parent = build_wavenode_from_match(match)
-                new_nodes.append(parent)
-                # Skip to end of match
-                # match.end_index is the end_idx of the last node in match
-                # We need to find which node in 'nodes' corresponds to that.
-                # The nodes list is sequential.
-                # match.wave_nodes contains the nodes.
-                count = len(match.wave_nodes)
-                i += count
-            else:
-                new_nodes.append(nodes[i])
-                i += 1
-        return new_nodes
+        pos = bisect_left(nodes, match.start_index, key=lambda node: node.start_idx)
+        if pos == len(nodes) or nodes[pos].start_idx != match.start_index:
+            return list(nodes)
+        return [*nodes[:pos], build_wavenode_from_match(match), *nodes[pos + len(match.wave_nodes):]]
 
     def _scan_partial_patterns(self, nodes: list[WaveNode]) -> list[Scenario]:
         """
@@ -367,7 +356,7 @@ class MacroScanner:
                 # We are at the edge. Projection is valid.
                 roots = nodes[:i] + [parent]
                 sc = Scenario(
-                    id=_new_scenario_id(),
+                    id=content_scenario_id(roots),
                     root_nodes=roots,
                     global_score=0.5,
                     status="active",
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field, asdict
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Literal, Sequence
 
 Direction = Literal["up", "down"]
 
 
+def _epoch(value: datetime) -> float:
+    """Epoch seconds; naive datetimes are read as UTC so differences match plain subtraction."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
 def _to_datetime(value: Any) -> datetime:
     if isinstance(value, datetime):
         return value
@@ -127,30 +134,54 @@ class WaveNode:
     validation: PatternValidation = field(default_factory=PatternValidation)
     score: float = 0.0
     label: str | None = None
+    # Parse-tree annotations: set by the parser and rule_engine, left at their defaults by the engine.
+    is_complete: bool = True
+    invalidation_point: float | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    box_ratio: float | None = None
+    energy_metric: float | None = None
+    sub_scale_analysis: dict[str, Any] | None = None
 
-    @property
-    def price_change(self) -> float:
+    # Derived once in __post_init__; nodes are treated as immutable after construction.
+    price_change: float = field(init=False, repr=False, compare=False)
+    abs_price_change: float = field(init=False, repr=False, compare=False)
+    duration: float = field(init=False, repr=False, compare=False)  # seconds; bars for leaves with metrics
+    start_ts: float = field(init=False, repr=False, compare=False)  # epoch seconds
+    end_ts: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.start_ts = _epoch(self.start_time)
+        self.end_ts = _epoch(self.end_time)
         if self.children:
-            return self.children[-1].end_price - self.children[0].start_price
-        if "price_change" in self.metrics:
-            return self.metrics["price_change"]
-        return self.end_price - self.start_price
+            first, last = self.children[0], self.children[-1]
+            self.price_change = last.end_price - first.start_price
+            self.abs_price_change = abs(self.price_change)
+            self.duration = last.end_ts - first.start_ts
+            return
+        self.price_change = self.metrics.get("price_change", self.end_price - self.start_price)
+        self.abs_price_change = self.metrics.get("abs_price_change", abs(self.price_change))
+        self.duration = float(self.metrics["duration"]) if "duration" in self.metrics else self.end_ts - self.start_ts
 
+    # Swing-style views read by the pattern checkers, the parser and rule_engine.
     @property
-    def abs_price_change(self) -> float:
-        if self.children:
-            return abs(self.children[-1].end_price - self.children[0].start_price)
-        if "abs_price_change" in self.metrics:
-            return self.metrics["abs_price_change"]
-        return abs(self.price_change)
+    def sub_waves(self) -> list["WaveNode"]:
+        return self.children
 
     @property
-    def duration(self) -> float:
-        if self.children:
-            return (self.children[-1].end_time - self.children[0].start_time).total_seconds()
-        if "duration" in self.metrics:
-            return float(self.metrics["duration"])
-        return (self.end_time - self.start_time).total_seconds()
+    def degree_level(self) -> int:
+        return self.level
+
+    @property
+    def high(self) -> float:
+        return self.high_price
+
+    @property
+    def low(self) -> float:
+        return self.low_price
+
+    @property
+    def length(self) -> float:
+        return self.abs_price_change
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -207,6 +238,14 @@ class WaveNode:
         )
 
 
+@dataclass(slots=True)
+class WaveTree:
+    """Parsed wave forest: root nodes covering the swings left to right."""
+
+    roots: list[WaveNode]
+    anchor_label: str | None = None
+
+
 @dataclass(slots=True)
 class Scenario:
     id: int
@@ -219,6 +258,7 @@ class Scenario:
     probability: float = 0.5
     invalidation_levels: list[dict[str, Any]] = field(default_factory=list)
     view_level: int = 0  # 0=Micro, 1=Macro
+    partial: bool = False  # search stopped at its deadline before converging
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -227,4 +267,5 @@ class Scenario:
             "global_score": self.global_score,
             "status": self.status,
             "invalidation_reasons": list(self.invalidation_reasons),
+            "partial": self.partial,
         }
@@ -1,35 +1,76 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Iterable, List, Sequence
+import copy
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Iterable, List, Sequence
 
-from neowave_core.models import WaveNode
+import numpy as np
+
+from neowave_core.models import PatternValidation, WaveNode, WaveTree
 from neowave_core.patterns import (
+    PatternCheckResult,
+    SegmentCache,
+    SwingArrays,
     is_double_three,
     is_flat,
+    is_flat_batch,
     is_impulse,
+    is_impulse_batch,
     is_terminal_impulse,
+    is_terminal_impulse_batch,
     is_triangle,
+    is_triangle_batch,
     is_triple_three,
     is_zigzag,
+    is_zigzag_batch,
 )
 from neowave_core.rules_loader import (
+    CompiledRules,
     FlatRuleSet,
     ImpulseRuleSet,
     TerminalImpulseRuleSet,
     TriangleRuleSet,
     ZigzagRuleSet,
-    extract_flat_rules,
-    extract_impulse_rules,
-    extract_terminal_impulse_rules,
-    extract_triangle_rules,
-    extract_zigzag_rules,
+    compile_rules,
 )
-from neowave_core.swings import Swing
+from neowave_core.swings import Direction, Swing
+from neowave_core.wave_engine import content_wave_id
+
+MERGE_MIN_SCORE = 0.45
+# Batch scores replicate the scalar checkers; the slack only guards float noise in the prefilter.
+_BATCH_SLACK = 1e-9
 
 DEGREE_SCALE = ["Micro", "Subminuette", "Minuette", "Minute", "Minor", "Intermediate", "Primary"]
 
 
+def build_wave_leaves(swings: Sequence[Swing], degree: str) -> list[WaveNode]:
+    """One leaf node per swing, labelled by position.
+
+    Leaves carry no bar-count ``duration`` metric, so their durations are in seconds like
+    every merged node above them.
+    """
+    return [
+        WaveNode(
+            id=sw.id,
+            level=0,
+            degree_label=degree,
+            start_idx=sw.start_idx,
+            end_idx=sw.end_idx,
+            start_time=sw.start_time,
+            end_time=sw.end_time,
+            high_price=sw.high_price,
+            low_price=sw.low_price,
+            start_price=sw.start_price,
+            end_price=sw.end_price,
+            direction=Direction.from_prices(sw.start_price, sw.end_price),
+            pattern_type="Monowave",
+            metrics={"volume_sum": sw.volume_sum},
+            label=str(i),
+        )
+        for i, sw in enumerate(swings)
+    ]
+
+
 @dataclass(slots=True)
 class ParseSettings:
     similarity_threshold: float = 0.33
@@ -53,7 +94,7 @@ def _degree_for_level(level: int) -> str:
     return f"Degree{level}"
 
 
-def _anchor_label(swings: Sequence[Swing]) -> str | None:
+def _anchor_label(swings: Sequence[WaveNode]) -> str | None:
     if not swings:
         return None
     min_idx = min(range(len(swings)), key=lambda idx: swings[idx].low)
@@ -94,11 +135,12 @@ def _role_labels(pattern_type: str, count: int) -> list[str]:
 
 
 def _relabel_children(children: list[WaveNode], pattern_type: str) -> list[WaveNode]:
+    """Copies of the children labelled by role; chart nodes are shared between parents, so never relabel in place."""
     labels = _role_labels(pattern_type, len(children))
-    for child, label in zip(children, labels):
-        child.label = label
-        child.metadata = {**child.metadata, "wave_label": label, "parent_pattern": pattern_type}
-    return children
+    return [
+        replace(child, label=label, metadata={**child.metadata, "wave_label": label, "parent_pattern": pattern_type})
+        for child, label in zip(children, labels)
+    ]
 
 
 def _make_node(
@@ -117,22 +159,24 @@ def _make_node(
     start_price = relabeled[0].start_price
     end_price = relabeled[-1].end_price
     return WaveNode(
-        label=label,
-        pattern_type=pattern_type,
-        degree=_degree_for_level(degree_level),
+        id=content_wave_id(pattern_type, None, relabeled),
+        level=degree_level,
+        degree_label=_degree_for_level(degree_level),
         start_idx=relabeled[0].start_idx,
         end_idx=relabeled[-1].end_idx,
-        start_price=start_price,
-        end_price=end_price,
         start_time=start_time,
         end_time=end_time,
-        high=max(child.high for child in relabeled),
-        low=min(child.low for child in relabeled),
-        sub_waves=relabeled,
-        degree_level=degree_level,
+        high_price=max(child.high_price for child in relabeled),
+        low_price=min(child.low_price for child in relabeled),
+        start_price=start_price,
+        end_price=end_price,
+        direction=Direction.from_prices(start_price, end_price),
+        children=relabeled,
+        pattern_type=pattern_type,
+        validation=PatternValidation(hard_valid=True, soft_score=score, satisfied_rules=[pattern_type]),
         score=score,
+        label=label,
         is_complete=is_complete,
-        rules_passed=[pattern_type],
         invalidation_point=invalidation_point,
         metadata={"details": details or {}, "role_labels": [child.label for child in relabeled]},
     )
@@ -148,27 +192,47 @@ def _pattern_invalidation(pattern_type: str, children: Sequence[WaveNode]) -> fl
     return None
 
 
+def _select_checker(checkers: dict[str, Callable[[bool], PatternCheckResult]]) -> tuple[str, PatternCheckResult | None]:
+    """Score every checker without evidence; re-run only the winner with full evidence."""
+    scores = {label: check(False).score for label, check in checkers.items()}
+    best_label = max(scores, key=scores.__getitem__)
+    if scores[best_label] < MERGE_MIN_SCORE:
+        return best_label, None
+    return best_label, checkers[best_label](True)
+
+
+def _basic_checker(
+    segments: SegmentCache | None,
+    pattern: str,
+    check: Callable[..., PatternCheckResult],
+    nodes: Sequence[WaveNode],
+    rules: Any,
+) -> Callable[[bool], PatternCheckResult]:
+    """``check(nodes, rules, evidence=...)``, read through ``segments`` when one is shared."""
+    if segments is not None:
+        return lambda evidence: segments.check(pattern, nodes, evidence)
+    return lambda evidence: check(nodes, rules, evidence=evidence)
+
+
 def _try_merge_five(
     nodes: Sequence[WaveNode],
     ctx: RuleContext,
     degree_level: int,
     tail_end_idx: int,
+    segments: SegmentCache | None = None,
 ) -> WaveNode | None:
     if len(nodes) != 5 or not _uniform_degree(nodes):
         return None
     if not _similarity_ok(nodes, ctx.similarity_threshold):
         return None
 
-    impulse_res = is_impulse(nodes, ctx.impulse)
-    terminal_res = is_terminal_impulse(nodes, ctx.terminal)
-    triangle_res = is_triangle(nodes, ctx.triangle)
-    candidates = [
-        ("Impulse", impulse_res),
-        ("TerminalImpulse", terminal_res),
-        ("Triangle", triangle_res),
-    ]
-    best_label, best_res = max(candidates, key=lambda item: item[1].score)
-    if best_res.score < 0.45:
+    checkers = {
+        "Impulse": lambda evidence: is_impulse(nodes, ctx.impulse, evidence=evidence),
+        "TerminalImpulse": lambda evidence: is_terminal_impulse(nodes, ctx.terminal, evidence=evidence),
+        "Triangle": _basic_checker(segments, "triangle", is_triangle, nodes, ctx.triangle),
+    }
+    best_label, best_res = _select_checker(checkers)
+    if best_res is None:
         return None
     is_complete = nodes[-1].end_idx < tail_end_idx
     invalidation = _pattern_invalidation(best_label, nodes)
@@ -189,17 +253,19 @@ def _try_merge_three(
     ctx: RuleContext,
     degree_level: int,
     tail_end_idx: int,
+    segments: SegmentCache | None = None,
 ) -> WaveNode | None:
     if len(nodes) != 3 or not _uniform_degree(nodes):
         return None
     if not _similarity_ok(nodes, ctx.similarity_threshold):
         return None
 
-    zigzag_res = is_zigzag(nodes, ctx.zigzag)
-    flat_res = is_flat(nodes, ctx.flat)
-    candidates = [("Zigzag", zigzag_res), ("Flat", flat_res)]
-    best_label, best_res = max(candidates, key=lambda item: item[1].score)
-    if best_res.score < 0.45:
+    checkers = {
+        "Zigzag": _basic_checker(segments, "zigzag", is_zigzag, nodes, ctx.zigzag),
+        "Flat": _basic_checker(segments, "flat", is_flat, nodes, ctx.flat),
+    }
+    best_label, best_res = _select_checker(checkers)
+    if best_res is None:
         return None
     is_complete = nodes[-1].end_idx < tail_end_idx
     invalidation = _pattern_invalidation(best_label, nodes)
@@ -249,10 +315,11 @@ def _try_merge_combinations(
     ctx: RuleContext,
     degree_level: int,
     tail_end_idx: int,
+    segments: SegmentCache | None = None,
 ) -> WaveNode | None:
     result: WaveNode | None = None
     if len(nodes) == 7 and ctx.combination.get("allow_double", True):
-        combo_res = is_double_three(nodes, ctx.combination.get("DoubleThree", {}))
+        combo_res = is_double_three(nodes, ctx.combination.get("DoubleThree", {}), segments)
         if combo_res.score >= 0.4:
             children = _build_combo_children(nodes, "DoubleThree", degree_level, combo_res.details or {})
             result = _make_node(
@@ -266,7 +333,7 @@ def _try_merge_combinations(
                 invalidation_point=_pattern_invalidation("DoubleThree", nodes),
             )
     if len(nodes) == 11 and ctx.combination.get("allow_triple", True):
-        combo_res = is_triple_three(nodes, ctx.combination.get("TripleThree", {}))
+        combo_res = is_triple_three(nodes, ctx.combination.get("TripleThree", {}), segments)
         if combo_res.score >= 0.4:
             children = _build_combo_children(nodes, "TripleThree", degree_level, combo_res.details or {})
             result = _make_node(
@@ -282,114 +349,262 @@ def _try_merge_combinations(
     return result
 
 
-def _merge_pass(nodes: list[WaveNode], ctx: RuleContext, tail_end_idx: int) -> tuple[list[WaveNode], bool]:
-    merged_any = False
-    degree_level = nodes[0].degree_level + 1 if nodes else 1
-    idx = 0
-    new_nodes: list[WaveNode] = []
-    while idx < len(nodes):
-        merged = False
-        window5 = nodes[idx : idx + 5]
-        if len(window5) == 5:
-            candidate = _try_merge_five(window5, ctx, degree_level, tail_end_idx)
-            if candidate:
-                new_nodes.append(candidate)
-                idx += 5
-                merged_any = True
-                merged = True
-        if not merged:
-            window3 = nodes[idx : idx + 3]
-            if len(window3) == 3:
-                candidate3 = _try_merge_three(window3, ctx, degree_level, tail_end_idx)
-                if candidate3:
-                    new_nodes.append(candidate3)
-                    idx += 3
-                    merged_any = True
-                    merged = True
-        if not merged:
-            new_nodes.append(nodes[idx])
-            idx += 1
-    return new_nodes, merged_any
-
-
-def _merge_combinations(nodes: list[WaveNode], ctx: RuleContext, tail_end_idx: int) -> tuple[list[WaveNode], bool]:
-    merged_any = False
-    idx = 0
-    new_nodes: list[WaveNode] = []
-    while idx < len(nodes):
-        merged = False
-        window7 = nodes[idx : idx + 7]
-        if len(window7) == 7:
-            candidate = _try_merge_combinations(window7, ctx, nodes[idx].degree_level, tail_end_idx)
-            if candidate:
-                new_nodes.append(candidate)
-                idx += 7
-                merged = True
-                merged_any = True
-        if not merged:
-            window11 = nodes[idx : idx + 11]
-            if len(window11) == 11:
-                candidate = _try_merge_combinations(window11, ctx, nodes[idx].degree_level, tail_end_idx)
-                if candidate:
-                    new_nodes.append(candidate)
-                    idx += 11
-                    merged = True
-                    merged_any = True
-        if not merged:
-            new_nodes.append(nodes[idx])
-            idx += 1
-    return new_nodes, merged_any
+def _window_scores(nodes: Sequence[WaveNode], ctx: RuleContext, width: int) -> np.ndarray:
+    """Best 5-swing or 3-swing checker score for every window start, scored in one vectorized sweep."""
+    arrays = SwingArrays.from_swings(nodes)
+    lengths, durations, directions = arrays.lengths, arrays.durations, arrays.directions
+    if width == 5:
+        return np.maximum.reduce(
+            [
+                is_impulse_batch(lengths, durations, directions, arrays.highs, arrays.lows, ctx.impulse).scores,
+                is_terminal_impulse_batch(lengths, durations, directions, arrays.highs, arrays.lows, ctx.terminal).scores,
+                is_triangle_batch(lengths, durations, directions, ctx.triangle).scores,
+            ]
+        )
+    return np.maximum(
+        is_zigzag_batch(lengths, durations, directions, ctx.zigzag).scores,
+        is_flat_batch(lengths, durations, directions, ctx.flat).scores,
+    )
 
 
-def parse_wave_tree(
-    swings: Iterable[Swing],
-    rules: dict[str, Any],
-    settings: ParseSettings | None = None,
-) -> WaveTree:
-    """Build a hierarchical WaveTree using bottom-up pattern collapsing."""
-    config = settings or ParseSettings()
-    swing_list = list(swings)
-    leaves: List[WaveNode] = build_wave_leaves(swing_list, degree=_degree_for_level(0))
-    tail_end_idx = leaves[-1].end_idx if leaves else -1
-    combination_rules = rules.get("Corrections", {}).get("Combination", {})
-    combo_allow_double = combination_rules.get("allow_double", True) and config.complexity_cap >= 2
-    combo_allow_triple = combination_rules.get("allow_triple", True) and config.complexity_cap >= 3
+@dataclass(slots=True)
+class _Derivation:
+    """One recorded way of building a span: the node merged when its window was checked, and the child derivations it was scored on."""
+
+    value: float  # summed pattern scores of the subtree, so deeper parses with confident patterns rank higher
+    kind: str  # "leaf", "five", "three" or "combo"
+    node: WaveNode
+    children: tuple["_Derivation", ...] = ()
+
+
+SpanKey = tuple[int, int, int]  # (first leaf, end leaf exclusive, degree level)
+
+CHART_BEAM = 3  # derivations kept per span, degree and pattern type
+CHART_SPAN_ENDS = 3  # best span ends extended per start and degree
+CHART_CHAINS = 16  # best child chains (by summed value) checked per start, degree and production length
+_PRODUCTIONS = {5: "five", 3: "three", 7: "combo", 11: "combo"}
+_COMBINATIONS = ("DoubleThree", "TripleThree")
+
+
+class WaveChart:
+    """CYK-style chart over leaf spans with the k best derivations per span, degree and pattern type.
+
+    Productions mirror the greedy merges: five same-degree nodes (Impulse,
+    TerminalImpulse, Triangle), three (Zigzag, Flat), and seven/eleven (DoubleThree,
+    TripleThree when the complexity cap allows). Rule checks only read a child's span
+    (prices, times, extremes), so each span at a degree is represented by one node for
+    checks. Spans are filled one degree at a time. To keep the work polynomial only the
+    ``CHART_SPAN_ENDS`` best span ends per start and degree are extended, and only the
+    ``CHART_CHAINS`` best child chains per start and length are checked; windows whose
+    batch-kernel score stays below ``MERGE_MIN_SCORE`` never reach the scalar checkers.
+    The pruning makes the chart a beam: covers are the k best among the spans it kept,
+    which matches exhaustive enumeration only while the caps do not bind (short inputs).
+    Zigzag, flat and triangle results are cached per span of representative nodes in one
+    ``SegmentCache``, so the W/Y/Z segments of the 7- and 11-windows reuse the basic merges.
+    """
+
+    def __init__(self, leaves: Sequence[WaveNode], ctx: RuleContext, tail_end_idx: int, k: int = CHART_BEAM):
+        self.leaves = list(leaves)
+        self.ctx = ctx
+        self.tail_end_idx = tail_end_idx
+        self.k = k
+        self.cells: dict[SpanKey, dict[str, list[_Derivation]]] = {}
+        self.nodes: dict[SpanKey, WaveNode] = {}  # representative node of each span
+        self.ends: dict[tuple[int, int], list[int]] = {}  # (start, degree) -> span ends
+        self.segments = SegmentCache({"zigzag": ctx.zigzag, "flat": ctx.flat, "triangle": ctx.triangle})
+        for i, leaf in enumerate(self.leaves):
+            self._add((i, i + 1, 0), leaf.pattern_type or "Monowave", _Derivation(0.0, "leaf", leaf))
+        self._fill()
+
+    def value(self, key: SpanKey) -> float:
+        return self.best(key).value
+
+    def best(self, key: SpanKey) -> _Derivation:
+        return max((derivations[0] for derivations in self.cells[key].values()), key=lambda d: d.value)
+
+    def _add(self, key: SpanKey, ptype: str, derivation: _Derivation) -> None:
+        cell = self.cells.setdefault(key, {})
+        if not cell:
+            self.nodes[key] = derivation.node
+            self.ends.setdefault((key[0], key[2]), []).append(key[1])
+        ranked = cell.setdefault(ptype, [])
+        ranked.append(derivation)
+        ranked.sort(key=lambda d: d.value, reverse=True)
+        del ranked[self.k :]
+
+    def _prune_ends(self, degree: int) -> None:
+        for (start, level), ends in self.ends.items():
+            if level == degree and len(ends) > CHART_SPAN_ENDS:
+                ends.sort(key=lambda end: (-self.value((start, end, degree)), end))
+                del ends[CHART_SPAN_ENDS:]
+
+    def _chains(self, start: int, degree: int, length: int, memo: dict[tuple[int, int], list[tuple[float, tuple[SpanKey, ...]]]]) -> list[tuple[float, tuple[SpanKey, ...]]]:
+        """The best chains of ``length`` adjacent spans from ``start`` at ``degree``, with their summed values."""
+        if length == 0:
+            return [(0.0, ())]
+        chains = memo.get((start, length))
+        if chains is None:
+            options = []
+            for end in self.ends.get((start, degree), ()):
+                key = (start, end, degree)
+                head = self.value(key)
+                options.extend((head + value, (key,) + rest) for value, rest in self._chains(end, degree, length - 1, memo))
+            options.sort(key=lambda item: item[0], reverse=True)
+            chains = memo[(start, length)] = options[:CHART_CHAINS]
+        return chains
+
+    def _prefilter(self, chains: list[tuple[SpanKey, ...]], length: int) -> list[tuple[SpanKey, ...]]:
+        """Chains whose batch-kernel score can reach ``MERGE_MIN_SCORE``.
+
+        The chains' representative nodes are laid end to end, so the sliding window at
+        every ``length``-th offset is exactly one chain.
+        """
+        if not chains:
+            return chains
+        scores = _window_scores([self.nodes[key] for chain in chains for key in chain], self.ctx, length)[::length]
+        return [chain for chain, score in zip(chains, scores) if score >= MERGE_MIN_SCORE - _BATCH_SLACK]
+
+    def _fill(self) -> None:
+        degree = 0
+        while True:
+            memo: dict[tuple[int, int], list[tuple[float, tuple[SpanKey, ...]]]] = {}
+            starts = sorted(start for start, level in self.ends if level == degree)
+            added = False
+            for length, kind in _PRODUCTIONS.items():
+                if kind == "combo" and not self.ctx.combination.get("allow_double" if length == 7 else "allow_triple", True):
+                    continue
+                chains = [chain for start in starts for _, chain in self._chains(start, degree, length, memo)]
+                if kind != "combo":
+                    chains = self._prefilter(chains, length)
+                for chain in chains:
+                    node = self._merge(kind, [self.nodes[key] for key in chain], degree, self.segments)
+                    if node is None:
+                        continue
+                    children = tuple(self.best(key) for key in chain)
+                    value = node.score + sum(child.value for child in children)
+                    self._add((chain[0][0], chain[-1][1], degree + 1), node.pattern_type, _Derivation(value, kind, node, children))
+                    added = True
+            if not added:
+                return
+            degree += 1
+            self._prune_ends(degree)
+
+    def _merge(self, kind: str, children: list[WaveNode], degree: int, segments: SegmentCache | None = None) -> WaveNode | None:
+        if kind == "five":
+            return _try_merge_five(children, self.ctx, degree + 1, self.tail_end_idx, segments)
+        if kind == "three":
+            return _try_merge_three(children, self.ctx, degree + 1, self.tail_end_idx, segments)
+        return _try_merge_combinations(children, self.ctx, degree, self.tail_end_idx, segments)
+
+    def build(self, derivation: _Derivation) -> WaveNode:
+        """Materialize a fresh subtree of a recorded derivation (children are relabeled per parent, so nodes are never shared).
+
+        The merged node recorded for the derivation supplies the pattern, score and
+        details; nothing is re-checked, so the tree is exactly the one that was scored.
+        """
+        template = derivation.node
+        if derivation.kind == "leaf":
+            return copy.copy(template)
+        children = [self.build(child) for child in derivation.children]
+        details = template.metadata.get("details") or {}
+        if derivation.kind == "combo":
+            children = _build_combo_children(children, template.pattern_type, template.degree_level - 1, details)
+        return _make_node(
+            label=template.label,
+            pattern_type=template.pattern_type,
+            degree_level=template.degree_level,
+            children=children,
+            score=template.score,
+            is_complete=template.is_complete,
+            details=details,
+            invalidation_point=template.invalidation_point,
+        )
+
+    def k_best_covers(self, k: int) -> list[list[SpanKey]]:
+        """The ``k`` best sequences of the chart's spans covering every leaf: highest total value, then fewest roots.
+
+        Exact over the spans in the chart; those are pruned (see ``WaveChart``), so on long
+        inputs this is a beam approximation of the k best parses.
+        """
+        n = len(self.leaves)
+        spans_ending: dict[int, list[SpanKey]] = {}
+        for key in self.cells:
+            spans_ending.setdefault(key[1], []).append(key)
+        best: list[list[tuple[float, int, tuple[SpanKey, ...]]]] = [[(0.0, 0, ())]] + [[] for _ in range(n)]
+        for end in range(1, n + 1):
+            options = [
+                (value + self.value(key), roots + 1, covered + (key,))
+                for key in spans_ending.get(end, ())
+                for value, roots, covered in best[key[0]]
+            ]
+            best[end] = sorted(options, key=lambda item: (-item[0], item[1]))[:k]
+        return [list(covered) for _, _, covered in best[n]]
+
+
+def _finish_roots(roots: list[WaveNode], ctx: RuleContext, tail_end_idx: int) -> list[WaveNode]:
+    # As in the greedy parser, a Composite is only tried when no combination merged at the top.
+    combos_merged = any(root.pattern_type in _COMBINATIONS for root in roots)
+    if not combos_merged and 1 < len(roots) <= 5 and _uniform_degree(roots) and _similarity_ok(roots, ctx.similarity_threshold):
+        # Attempt one final merge as a generic composite if similar enough.
+        composite = _make_node(
+            label="Composite",
+            pattern_type="Composite",
+            degree_level=roots[0].degree_level + 1,
+            children=list(roots),
+            score=0.4,
+            is_complete=roots[-1].end_idx < tail_end_idx,
+            details={"note": "Collapsed as composite due to similarity"},
+            invalidation_point=None,
+        )
+        return [composite]
+    return roots
+
+
+def _rule_context(rules: dict[str, Any] | CompiledRules, config: ParseSettings) -> RuleContext:
+    compiled = compile_rules(rules)
+    combination_rules = compiled.combination
     combination_config = {
         **combination_rules,
-        "allow_double": combo_allow_double,
-        "allow_triple": combo_allow_triple,
+        "allow_double": combination_rules.get("allow_double", True) and config.complexity_cap >= 2,
+        "allow_triple": combination_rules.get("allow_triple", True) and config.complexity_cap >= 3,
     }
-    ctx = RuleContext(
-        impulse=extract_impulse_rules(rules.get("Impulse", {}).get("TrendingImpulse", {})),
-        terminal=extract_terminal_impulse_rules(rules.get("Impulse", {}).get("TerminalImpulse", {})),
-        zigzag=extract_zigzag_rules(rules.get("Corrections", {}).get("Zigzag", {})),
-        flat=extract_flat_rules(rules.get("Corrections", {}).get("Flat", {})),
-        triangle=extract_triangle_rules(rules.get("Corrections", {}).get("Triangle", {})),
+    return RuleContext(
+        impulse=compiled.impulse,
+        terminal=compiled.terminal,
+        zigzag=compiled.zigzag,
+        flat=compiled.flat,
+        triangle=compiled.triangle,
         combination=combination_config,
         similarity_threshold=config.similarity_threshold,
     )
 
-    current_nodes = leaves
-    merged = True
-    while merged and len(current_nodes) >= 3:
-        current_nodes, merged = _merge_pass(current_nodes, ctx, tail_end_idx)
 
-    # Apply complexity cap: allow up to triple three, else leave as undefined.
-    current_nodes, combos_merged = _merge_combinations(current_nodes, ctx, tail_end_idx)
-    if not combos_merged and len(current_nodes) > 1 and len(current_nodes) <= 5 and _uniform_degree(current_nodes):
-        # Attempt one final merge as a generic composite if similar enough.
-        if _similarity_ok(current_nodes, ctx.similarity_threshold):
-            composite = _make_node(
-                label="Composite",
-                pattern_type="Composite",
-                degree_level=current_nodes[0].degree_level + 1,
-                children=list(current_nodes),
-                score=0.4,
-                is_complete=current_nodes[-1].end_idx < tail_end_idx,
-                details={"note": "Collapsed as composite due to similarity"},
-                invalidation_point=None,
-            )
-            current_nodes = [composite]
+def parse_wave_trees(
+    swings: Iterable[Swing],
+    rules: dict[str, Any] | CompiledRules,
+    settings: ParseSettings | None = None,
+    k: int = CHART_BEAM,
+) -> list[WaveTree]:
+    """The ``k`` best WaveTrees from one pruned chart parse over the swings (best first, approximate on long inputs)."""
+    config = settings or ParseSettings()
+    swing_list = list(swings)
+    leaves: List[WaveNode] = build_wave_leaves(swing_list, degree=_degree_for_level(0))
+    if not leaves:
+        return [WaveTree(roots=[], anchor_label=_anchor_label(leaves))]
+    tail_end_idx = leaves[-1].end_idx
+    ctx = _rule_context(rules, config)
+    chart = WaveChart(leaves, ctx, tail_end_idx, k=k)
+    anchor = _anchor_label(leaves)
+    return [
+        WaveTree(roots=_finish_roots([chart.build(chart.best(key)) for key in cover], ctx, tail_end_idx), anchor_label=anchor)
+        for cover in chart.k_best_covers(k)
+    ]
 
-    tree = WaveTree(roots=current_nodes, anchor_label=_anchor_label(swing_list))
-    return tree
+
+def parse_wave_tree(
+    swings: Iterable[Swing],
+    rules: dict[str, Any] | CompiledRules,
+    settings: ParseSettings | None = None,
+) -> WaveTree:
+    """Build a hierarchical WaveTree: the best parse of the chart (see ``WaveChart``)."""
+    return parse_wave_trees(swings, rules, settings, k=1)[0]
@@ -1,65 +1,302 @@
 from __future__ import annotations
 
+import logging
 import math
+import threading
+import time
+from dataclasses import dataclass, field
+from types import CodeType
 from typing import Any, Callable, Sequence
 
 from neowave_core.models import PatternValidation, WaveNode
 from neowave_core.patterns.metrics import compute_metrics_for_pattern
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class RuleStats:
+    """Accumulated evaluation statistics for a single RULE_DB rule."""
+
+    pattern: str
+    subtype: str
+    rule_id: str
+    evaluations: int = 0
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    total_time: float = 0.0  # seconds
+    last_error: str | None = None
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.evaluations if self.evaluations else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "pattern": self.pattern,
+            "subtype": self.subtype,
+            "rule_id": self.rule_id,
+            "evaluations": self.evaluations,
+            "passed": self.passed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "pass_rate": round(self.pass_rate, 4),
+            "total_time_ms": round(self.total_time * 1000.0, 4),
+            "avg_time_us": round(self.total_time * 1e6 / self.evaluations, 3) if self.evaluations else 0.0,
+            "last_error": self.last_error,
+        }
+
+
+class RuleProfiler:
+    """Thread-safe collector of per pattern/subtype/rule evaluation statistics."""
+
+    def __init__(self) -> None:
+        self._stats: dict[tuple[str, str, str], RuleStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, pattern: str, subtype: str, rule_id: str, passed: bool, elapsed: float, error: str | None = None) -> None:
+        key = (pattern, subtype, rule_id)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = RuleStats(pattern=pattern, subtype=subtype, rule_id=rule_id)
+            stats.evaluations += 1
+            stats.total_time += elapsed
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = error
+            if passed:
+                stats.passed += 1
+            else:
+                stats.failed += 1
+
+    def stats(self) -> list[RuleStats]:
+        """Return a copy of the collected stats, most expensive rules first."""
+        with self._lock:
+            copies = [
+                RuleStats(
+                    pattern=s.pattern,
+                    subtype=s.subtype,
+                    rule_id=s.rule_id,
+                    evaluations=s.evaluations,
+                    passed=s.passed,
+                    failed=s.failed,
+                    errors=s.errors,
+                    total_time=s.total_time,
+                    last_error=s.last_error,
+                )
+                for s in self._stats.values()
+            ]
+        return sorted(copies, key=lambda s: s.total_time, reverse=True)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [s.to_dict() for s in self.stats()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+@dataclass(slots=True)
+class PatternScore:
+    """Evidence-free rule outcome: validity, soft penalty and soft-violation count only."""
+
+    hard_valid: bool
+    soft_score: float
+    soft_violations: int = 0
+
+    @classmethod
+    def from_validation(cls, validation: PatternValidation) -> "PatternScore":
+        return cls(validation.hard_valid, validation.soft_score, len(validation.violated_soft_rules))
+
+
+@dataclass(slots=True)
+class FamilyEvaluation:
+    """Result of evaluating several subtypes of one pattern family against shared metrics.
+
+    ``validation`` (and ``validations``) are only populated when evidence was requested;
+    ``score`` is always set for the best subtype.
+    """
+
+    pattern: str
+    best_subtype: str | None
+    validation: PatternValidation | None
+    metrics: dict[str, float]
+    validations: dict[str, PatternValidation] = field(default_factory=dict)
+    score: PatternScore | None = None
+
+
+def _default_rank(score: PatternScore) -> float:
+    return score.soft_score + 0.01 * score.soft_violations
+
 
 class PatternEvaluator:
     """Evaluates a candidate pattern window using RULE_DB style definitions."""
 
-    def __init__(self, rule_db: dict[str, Any], tolerance: float = 0.02):
+    def __init__(self, rule_db: dict[str, Any], tolerance: float = 0.02, profiler: RuleProfiler | None = None):
         self.rule_db = rule_db
         self.tolerance = tolerance
+        self.profiler = profiler
+        self.rule_errors = 0  # rule expressions that raised outside the profiler (counted as failures)
+        self._code_cache: dict[str, CodeType] = {}
 
     def evaluate(self, pattern_name: str, subtype: str, waves: Sequence[WaveNode], context: dict[str, Any] | None = None) -> tuple[PatternValidation, dict[str, float]]:
-        rules = self._select_rules(pattern_name, subtype)
+        subtype, rules = self._select_rules(pattern_name, subtype)
+        metrics = self._metrics(pattern_name, subtype, waves, context)
+        validation = self._evaluate_rules(pattern_name, subtype, rules, self._namespace(metrics))
+        return validation, metrics
+
+    def score(self, pattern_name: str, subtype: str, waves: Sequence[WaveNode], context: dict[str, Any] | None = None) -> tuple[PatternScore, dict[str, float]]:
+        """Scoring-only variant of ``evaluate``: no rule descriptions are collected.
+
+        Use ``explain`` with the returned metrics to rebuild the full evidence later.
+        """
+        subtype, rules = self._select_rules(pattern_name, subtype)
+        metrics = self._metrics(pattern_name, subtype, waves, context)
+        return self._score_rules(pattern_name, subtype, rules, self._namespace(metrics)), metrics
+
+    def explain(self, pattern_name: str, subtype: str, metrics: dict[str, Any]) -> PatternValidation:
+        """Rebuild the full validation evidence from stored metrics.
+
+        Not profiled: the rules were already counted when the candidate was scored.
+        """
+        subtype, rules = self._select_rules(pattern_name, subtype)
+        return self._evaluate_rules(pattern_name, subtype, rules, self._namespace(metrics), profile=False)
+
+    def evaluate_family(
+        self,
+        pattern_name: str,
+        subtypes: Sequence[str],
+        waves: Sequence[WaveNode],
+        context: dict[str, Any] | None = None,
+        include_all: bool = False,
+        rank: Callable[[PatternScore], float] = _default_rank,
+        evidence: bool = True,
+    ) -> FamilyEvaluation:
+        """Evaluate every subtype of a family in one pass over shared metrics.
+
+        Metrics are computed once (they do not depend on the subtype) and the
+        best hard-valid subtype is the one with the lowest ``rank``; ties keep
+        the order of ``subtypes``. Per-subtype validations are returned only
+        when ``include_all`` is set. With ``evidence=False`` only scores are
+        computed and ``validation`` stays ``None``.
+        """
+        metrics = self._metrics(pattern_name, subtypes[0] if subtypes else "", waves, context)
+        namespace = self._namespace(metrics)
+        best_subtype: str | None = None
+        best_validation: PatternValidation | None = None
+        best_score: PatternScore | None = None
+        best_rank = math.inf
+        validations: dict[str, PatternValidation] = {}
+        seen: set[str] = set()
+        for requested in subtypes:
+            subtype, rules = self._select_rules(pattern_name, requested)
+            if subtype in seen:
+                continue
+            seen.add(subtype)
+            if evidence:
+                validation: PatternValidation | None = self._evaluate_rules(pattern_name, subtype, rules, namespace)
+                score = PatternScore.from_validation(validation)
+                if include_all:
+                    validations[subtype] = validation
+            else:
+                validation = None
+                score = self._score_rules(pattern_name, subtype, rules, namespace)
+            if not score.hard_valid:
+                continue
+            value = rank(score)
+            if value < best_rank:
+                best_subtype, best_validation, best_score, best_rank = subtype, validation, score, value
+        return FamilyEvaluation(pattern_name, best_subtype, best_validation, metrics, validations, best_score)
+
+    def _metrics(self, pattern_name: str, subtype: str, waves: Sequence[WaveNode], context: dict[str, Any] | None) -> dict[str, float]:
         metrics = compute_metrics_for_pattern(pattern_name, subtype, waves)
         if context:
             metrics = {**context, **metrics}
+        return metrics
+
+    def _evaluate_rules(self, pattern_name: str, subtype: str, rules: dict[str, Any], namespace: dict[str, Any], profile: bool = True) -> PatternValidation:
         validation = PatternValidation(hard_valid=True, soft_score=0.0, satisfied_rules=[], violated_soft_rules=[], violated_hard_rules=[])
-        for rule in rules.get("price_rules", []):
-            self._apply_rule(rule, metrics, validation)
-        for rule in rules.get("time_rules", []):
-            self._apply_rule(rule, metrics, validation)
-        for rule in rules.get("volume_rules", []):
-            self._apply_rule(rule, metrics, validation)
+        for group in ("price_rules", "time_rules", "volume_rules"):
+            for rule in rules.get(group, []):
+                passed = self._rule_passed(pattern_name, subtype, rule, namespace, profile)
+                self._record_outcome(rule, passed, validation)
         validation.soft_score = round(validation.soft_score, 3)
-        return validation, metrics
+        return validation
+
+    def _score_rules(self, pattern_name: str, subtype: str, rules: dict[str, Any], namespace: dict[str, Any]) -> PatternScore:
+        hard_valid = True
+        soft_score = 0.0
+        soft_violations = 0
+        for group in ("price_rules", "time_rules", "volume_rules"):
+            for rule in rules.get(group, []):
+                if self._rule_passed(pattern_name, subtype, rule, namespace):
+                    continue
+                if bool(rule.get("hard", False)):
+                    hard_valid = False
+                else:
+                    soft_score += float(rule.get("weight", 0.1))
+                    soft_violations += 1
+        return PatternScore(hard_valid, round(soft_score, 3), soft_violations)
+
+    def rule_stats(self) -> list[dict[str, Any]]:
+        """Per-rule profiling snapshot (empty when profiling is disabled)."""
+        return self.profiler.snapshot() if self.profiler is not None else []
 
-    def _select_rules(self, pattern_name: str, subtype: str) -> dict[str, Any]:
+    def _select_rules(self, pattern_name: str, subtype: str) -> tuple[str, dict[str, Any]]:
         if pattern_name not in self.rule_db:
             raise KeyError(f"Unknown pattern: {pattern_name}")
         subrules = self.rule_db.get(pattern_name, {})
         if subtype not in subrules:
             # fallback to any available subtype
             subtype = next(iter(subrules.keys()))
-        return subrules[subtype]
+        return subtype, subrules[subtype]
 
     def _allowed_funcs(self) -> dict[str, Callable[..., Any]]:
         return {"min": min, "max": max, "abs": abs, "sqrt": math.sqrt}
 
-    def _eval_expr(self, expr: str, metrics: dict[str, Any]) -> bool:
-        safe_locals = {**metrics, **self._allowed_funcs()}
-        return bool(eval(expr, {"__builtins__": {}}, safe_locals))  # noqa: S307 - expressions are controlled from RULE_DB
+    def _namespace(self, metrics: dict[str, Any]) -> dict[str, Any]:
+        return {**metrics, **self._allowed_funcs()}
 
-    def _apply_rule(self, rule: dict[str, Any], metrics: dict[str, Any], validation: PatternValidation) -> None:
+    def _eval_expr(self, expr: str, namespace: dict[str, Any]) -> bool:
+        code = self._code_cache.get(expr)
+        if code is None:
+            code = self._code_cache[expr] = compile(expr, "<rule>", "eval")
+        return bool(eval(code, {"__builtins__": {}}, namespace))  # noqa: S307 - expressions are controlled from RULE_DB
+
+    def _rule_passed(self, pattern_name: str, subtype: str, rule: dict[str, Any], namespace: dict[str, Any], profile: bool = True) -> bool:
+        if profile and self.profiler is not None:
+            return self._rule_passed_profiled(pattern_name, subtype, rule, namespace)
+        try:
+            return self._eval_expr(rule.get("expr", "True"), namespace)
+        except Exception as exc:  # noqa: BLE001 - counted and logged; the rule fails
+            self.rule_errors += 1
+            logger.debug("Rule %s/%s/%s raised %s: %s", pattern_name, subtype, rule.get("id", rule.get("expr")), type(exc).__name__, exc)
+            return False
+
+    def _rule_passed_profiled(self, pattern_name: str, subtype: str, rule: dict[str, Any], namespace: dict[str, Any]) -> bool:
         expr = rule.get("expr", "True")
-        desc = rule.get("description", expr)
-        is_hard = bool(rule.get("hard", False))
-        weight = float(rule.get("weight", 0.1))
+        error: str | None = None
+        t0 = time.perf_counter()
         try:
-            passed = self._eval_expr(expr, metrics)
-        except Exception:
+            passed = self._eval_expr(expr, namespace)
+        except Exception as exc:  # noqa: BLE001 - counted and surfaced through the profiler
             passed = False
+            error = f"{type(exc).__name__}: {exc}"
+            logger.debug("Rule %s/%s/%s raised %s", pattern_name, subtype, rule.get("id", expr), error)
+        elapsed = time.perf_counter() - t0
+        self.profiler.record(pattern_name, subtype, str(rule.get("id", expr)), passed, elapsed, error)
+        return passed
+
+    def _record_outcome(self, rule: dict[str, Any], passed: bool, validation: PatternValidation) -> None:
+        desc = rule.get("description", rule.get("expr", "True"))
         if passed:
             validation.satisfied_rules.append(desc)
             return
-        if is_hard:
+        if bool(rule.get("hard", False)):
             validation.hard_valid = False
             validation.violated_hard_rules.append(desc)
         else:
-            validation.soft_score += weight
+            validation.soft_score += float(rule.get("weight", 0.1))
             validation.violated_soft_rules.append(desc)
@@ -1,9 +1,10 @@
-from neowave_core.patterns.complex_corrections import is_double_three, is_triple_three
-from neowave_core.patterns.flat import is_flat
-from neowave_core.patterns.impulse import is_impulse
-from neowave_core.patterns.terminal_impulse import is_terminal_impulse
-from neowave_core.patterns.triangle import is_triangle
-from neowave_core.patterns.zigzag import is_zigzag
+from neowave_core.patterns.common_types import BatchScores, PatternCheckResult, SwingArrays
+from neowave_core.patterns.complex_corrections import SegmentCache, is_double_three, is_triple_three
+from neowave_core.patterns.flat import is_flat, is_flat_batch
+from neowave_core.patterns.impulse import is_impulse, is_impulse_batch
+from neowave_core.patterns.terminal_impulse import is_terminal_impulse, is_terminal_impulse_batch
+from neowave_core.patterns.triangle import is_triangle, is_triangle_batch
+from neowave_core.patterns.zigzag import is_zigzag, is_zigzag_batch
 
 __all__ = [
     "is_impulse",
@@ -13,4 +14,13 @@ __all__ = [
     "is_triangle",
     "is_double_three",
     "is_triple_three",
+    "is_impulse_batch",
+    "is_terminal_impulse_batch",
+    "is_zigzag_batch",
+    "is_flat_batch",
+    "is_triangle_batch",
+    "BatchScores",
+    "PatternCheckResult",
+    "SegmentCache",
+    "SwingArrays",
 ]
@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Sequence
 
+import numpy as np
+
 from neowave_core.swings import Direction, Swing
 
 
@@ -51,3 +53,64 @@ def similarity_ratio(a: float, b: float) -> float:
     if maximum == 0:
         return 1.0
     return min(abs(a), abs(b)) / maximum
+
+
+@dataclass(slots=True)
+class BatchScores:
+    """Scores for every sliding window of a swing sequence; entry i is the window starting at swing i."""
+
+    scores: np.ndarray
+    valid: np.ndarray
+
+
+@dataclass(slots=True)
+class SwingArrays:
+    """Column view of a swing sequence for the vectorized ``*_batch`` checkers."""
+
+    lengths: np.ndarray
+    durations: np.ndarray
+    directions: np.ndarray  # +1 up, -1 down
+    highs: np.ndarray
+    lows: np.ndarray
+
+    @classmethod
+    def from_swings(cls, swings: Sequence[Swing]) -> "SwingArrays":
+        return cls(
+            lengths=np.array([float(s.length) for s in swings], dtype=float),
+            durations=np.array([float(s.duration) for s in swings], dtype=float),
+            directions=np.array([direction_code(s.direction) for s in swings], dtype=np.int8),
+            highs=np.array([float(s.high) for s in swings], dtype=float),
+            lows=np.array([float(s.low) for s in swings], dtype=float),
+        )
+
+
+def direction_code(direction: Direction | str | None) -> int:
+    value = direction.value if isinstance(direction, Direction) else direction
+    return 1 if value == Direction.UP.value else -1
+
+
+def sliding_windows(values: Sequence[float] | np.ndarray, width: int) -> np.ndarray:
+    """Return an (n - width + 1, width) read-only view of every contiguous window."""
+    arr = np.asarray(values)
+    if arr.shape[0] < width:
+        return np.empty((0, width), dtype=arr.dtype)
+    return np.lib.stride_tricks.sliding_window_view(arr, width)
+
+
+def safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Vectorized ``length_ratio``: |num| / |den|, or 0 where the denominator is zero."""
+    num = np.abs(numerator)
+    den = np.abs(denominator)
+    return np.divide(num, den, out=np.zeros_like(num, dtype=float), where=den != 0)
+
+
+def similarity_ratios(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Vectorized ``similarity_ratio``: min/max of magnitudes, 1.0 when both are zero."""
+    lo = np.minimum(np.abs(a), np.abs(b))
+    hi = np.maximum(np.abs(a), np.abs(b))
+    return np.divide(lo, hi, out=np.ones_like(hi, dtype=float), where=hi != 0)
+
+
+def windows_alternate(directions: np.ndarray, width: int) -> np.ndarray:
+    windows = sliding_windows(directions, width)
+    return np.all(windows[:, 1:] != windows[:, :-1], axis=1)
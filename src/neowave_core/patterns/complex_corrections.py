@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Any, Sequence
 
 from neowave_core.patterns.common_types import PatternCheckResult, is_alternating, length_ratio, pattern_direction
 from neowave_core.patterns.flat import is_flat
@@ -10,22 +10,72 @@ from neowave_core.rule_checks import RuleCheck
 from neowave_core.swings import Swing
 
 
-def _select_correction(swings: Sequence[Swing]) -> PatternCheckResult:
+_BASIC_CHECKERS = {"zigzag": is_zigzag, "flat": is_flat, "triangle": is_triangle}
+
+
+def _segment_span(swings: Sequence[Swing]) -> tuple[int, ...]:
+    """Boundaries of a segment: each swing's ``start_idx`` and the last swing's ``end_idx``."""
+    return tuple(s.start_idx for s in swings) + (swings[-1].end_idx,)
+
+
+class SegmentCache:
+    """Basic-correction results per segment span and pattern, shared by every pass over the same swings.
+
+    Results are keyed by the segment's swing boundaries and the pattern. The checkers only
+    read a swing's span (prices, times, extremes), so the parser's zigzag/flat/triangle
+    merges and the W/Y/Z segments of overlapping 7- and 11-swing combination windows read the
+    same entries. ``rules`` holds the rule set per pattern (defaults when missing); a
+    score-only result is recomputed with evidence the first time evidence is asked for.
+    """
+
+    __slots__ = ("_rules", "_results", "hits", "misses")
+
+    def __init__(self, rules: dict[str, Any] | None = None) -> None:
+        self._rules = dict(rules or {})
+        self._results: dict[tuple[tuple[int, ...], str], tuple[bool, PatternCheckResult]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def check(self, pattern: str, swings: Sequence[Swing], evidence: bool = True) -> PatternCheckResult:
+        """Cached ``is_<pattern>(swings, rules, evidence=evidence)`` for ``pattern`` in zigzag/flat/triangle."""
+        key = (_segment_span(swings), pattern)
+        entry = self._results.get(key)
+        if entry is not None and (entry[0] or not evidence):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        result = _BASIC_CHECKERS[pattern](swings, self._rules.get(pattern, {}), evidence=evidence)
+        self._results[key] = (evidence, result)
+        return result
+
+
+def _check_basic(pattern: str, swings: Sequence[Swing], evidence: bool = True) -> PatternCheckResult:
+    return _BASIC_CHECKERS[pattern](swings, {}, evidence=evidence)
+
+
+def _select_correction(swings: Sequence[Swing], segments: SegmentCache | None = None) -> PatternCheckResult:
     """Pick the best-fitting basic correction for a segment."""
+    check = segments.check if segments is not None else _check_basic
     candidates: list[PatternCheckResult] = []
     if len(swings) == 3:
-        candidates.append(is_zigzag(swings, {}))
-        candidates.append(is_flat(swings, {}))
+        candidates.append(check("zigzag", swings))
+        candidates.append(check("flat", swings))
     if len(swings) == 5:
-        candidates.append(is_triangle(swings, {}))
+        candidates.append(check("triangle", swings))
     if not candidates:
         return PatternCheckResult("correction", False, 0.0, ["Unsupported correction segment length"])
     best = max(candidates, key=lambda res: res.score)
     return best
 
 
-def is_double_three(swings: Sequence[Swing], rules: dict | None = None) -> PatternCheckResult:
-    """Detect a simple W-X-Y double three using 7 swings (W:3, X:1, Y:3)."""
+def is_double_three(swings: Sequence[Swing], rules: dict | None = None, segments: SegmentCache | None = None) -> PatternCheckResult:
+    """Detect a simple W-X-Y double three using 7 swings (W:3, X:1, Y:3).
+
+    ``segments`` reuses W/Y correction results across overlapping windows.
+    """
     if len(swings) != 7:
         return PatternCheckResult("double_three", False, 0.0, ["Double three requires exactly 7 swings"])
     if not is_alternating(swings):
@@ -35,8 +85,8 @@ def is_double_three(swings: Sequence[Swing], rules: dict | None = None) -> Patte
     x_wave = swings[3]
     y_segment = swings[4:]
 
-    w_result = _select_correction(w_segment)
-    y_result = _select_correction(y_segment)
+    w_result = _select_correction(w_segment, segments)
+    y_result = _select_correction(y_segment, segments)
     violations: list[str] = []
     rule_checks: list[RuleCheck] = []
     penalty = 0.0
@@ -102,8 +152,11 @@ def is_double_three(swings: Sequence[Swing], rules: dict | None = None) -> Patte
     return PatternCheckResult("double_three", is_valid, score, violations, details=details, rule_checks=rule_checks)
 
 
-def is_triple_three(swings: Sequence[Swing], rules: dict | None = None) -> PatternCheckResult:
-    """Detect a W-X-Y-X-Z triple three using 11 swings (3-1-3-1-3 structure)."""
+def is_triple_three(swings: Sequence[Swing], rules: dict | None = None, segments: SegmentCache | None = None) -> PatternCheckResult:
+    """Detect a W-X-Y-X-Z triple three using 11 swings (3-1-3-1-3 structure).
+
+    ``segments`` reuses W/Y/Z correction results across overlapping windows.
+    """
     if len(swings) != 11:
         return PatternCheckResult("triple_three", False, 0.0, ["Triple three requires exactly 11 swings"])
     if not is_alternating(swings):
@@ -115,9 +168,9 @@ def is_triple_three(swings: Sequence[Swing], rules: dict | None = None) -> Patte
     x2_wave = swings[7]
     z_segment = swings[8:]
 
-    w_result = _select_correction(w_segment)
-    y_result = _select_correction(y_segment)
-    z_result = _select_correction(z_segment)
+    w_result = _select_correction(w_segment, segments)
+    y_result = _select_correction(y_segment, segments)
+    z_result = _select_correction(z_segment, segments)
     violations: list[str] = []
     rule_checks: list[RuleCheck] = []
     penalty = 0.0
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 from typing import Sequence
 
-from neowave_core.patterns.common_types import PatternCheckResult, pattern_direction
+import numpy as np
+
+from neowave_core.patterns.common_types import BatchScores, PatternCheckResult, pattern_direction, safe_ratio, sliding_windows
 from neowave_core.rule_checks import RuleCheck
 from neowave_core.rules_loader import FlatRuleSet, extract_flat_rules
 from neowave_core.swings import Swing
 
 
-def is_flat(swings: Sequence[Swing], rules: dict | FlatRuleSet | None = None) -> PatternCheckResult:
-    """Check a 3-swing flat correction."""
+def is_flat(swings: Sequence[Swing], rules: dict | FlatRuleSet | None = None, evidence: bool = True) -> PatternCheckResult:
+    """Check a 3-swing flat correction (``evidence=False`` skips violations, checks and details)."""
     violations: list[str] = []
     rule_checks: list[RuleCheck] = []
     if len(swings) != 3:
@@ -33,10 +35,12 @@ def is_flat(swings: Sequence[Swing], rules: dict | FlatRuleSet | None = None) ->
         critical: bool = False,
     ) -> None:
         nonlocal penalty
-        rule_checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
+        if evidence:
+            rule_checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
         if condition:
             return
-        violations.append(description)
+        if evidence:
+            violations.append(description)
         penalty += weight
         if critical:
             penalty = max(penalty, 1.0)
@@ -96,34 +100,38 @@ def is_flat(swings: Sequence[Swing], rules: dict | FlatRuleSet | None = None) ->
     # Additional C vs B sizing for subtype clarity.
     c_ratio_b = lengths[2] / lengths[1] if lengths[1] else 0.0
     if subtype == "weak_b" and c_ratio_b < 1.0:
-        violations.append("Weak-B flat with short C (double failure risk)")
         penalty += 0.1
-        rule_checks.append(
-            RuleCheck(
-                key="weak_b_c_follow_through",
-                description="Weak-B flat with short C (double failure risk)",
-                value=c_ratio_b,
-                expected=">= 1.0",
-                passed=False,
-                penalty=0.1,
+        if evidence:
+            violations.append("Weak-B flat with short C (double failure risk)")
+            rule_checks.append(
+                RuleCheck(
+                    key="weak_b_c_follow_through",
+                    description="Weak-B flat with short C (double failure risk)",
+                    value=c_ratio_b,
+                    expected=">= 1.0",
+                    passed=False,
+                    penalty=0.1,
+                )
             )
-        )
     if c_ratio_b > params.c_elongated:
-        violations.append("Wave C elongated relative to Wave B")
         penalty += 0.1
-        rule_checks.append(
-            RuleCheck(
-                key="wavec_elongated",
-                description="Wave C elongated relative to Wave B",
-                value=c_ratio_b,
-                expected=f"<= {params.c_elongated:.2f}",
-                passed=False,
-                penalty=0.1,
+        if evidence:
+            violations.append("Wave C elongated relative to Wave B")
+            rule_checks.append(
+                RuleCheck(
+                    key="wavec_elongated",
+                    description="Wave C elongated relative to Wave B",
+                    value=c_ratio_b,
+                    expected=f"<= {params.c_elongated:.2f}",
+                    passed=False,
+                    penalty=0.1,
+                )
             )
-        )
 
     score = max(0.0, 1.0 - penalty)
     is_valid = score >= 0.5
+    if not evidence:
+        return PatternCheckResult("flat", is_valid, score)
     details = {
         "direction": trend.value,
         "b_ratio": b_ratio,
@@ -133,3 +141,31 @@ def is_flat(swings: Sequence[Swing], rules: dict | FlatRuleSet | None = None) ->
         "rule_checks": rule_checks,
     }
     return PatternCheckResult("flat", is_valid, score, violations, details=details, rule_checks=rule_checks)
+
+
+def is_flat_batch(
+    lengths: Sequence[float] | np.ndarray,
+    durations: Sequence[float] | np.ndarray,
+    directions: Sequence[int] | np.ndarray,
+    rules: dict | FlatRuleSet | None = None,
+) -> BatchScores:
+    """Score every 3-swing window with the ``is_flat`` rules, without building evidence."""
+    params = rules if isinstance(rules, FlatRuleSet) else extract_flat_rules(rules if isinstance(rules, dict) else None)
+    L = sliding_windows(np.asarray(lengths, dtype=float), 3)
+    D = sliding_windows(np.asarray(durations, dtype=float), 3)
+    dirs = sliding_windows(np.asarray(directions), 3)
+    structure = (dirs[:, 0] != dirs[:, 1]) & (dirs[:, 0] == dirs[:, 2])
+    penalty = np.zeros(L.shape[0])
+
+    b_ratio = safe_ratio(L[:, 1], L[:, 0])
+    c_ratio_a = safe_ratio(L[:, 2], L[:, 0])
+    critical = ~(b_ratio >= params.b_min) | ~(c_ratio_a >= params.c_min)
+    timed = D[:, 0] > 0
+    penalty += np.where(timed & ~(D[:, 1] >= D[:, 0]), 0.1, 0.0)
+    penalty += np.where(timed & ~(D[:, 2] >= D[:, 0]), 0.1, 0.0)
+    c_ratio_b = safe_ratio(L[:, 2], L[:, 1])
+    penalty += np.where((b_ratio <= params.weak_b_threshold) & (c_ratio_b < 1.0), 0.1, 0.0)
+    penalty += np.where(c_ratio_b > params.c_elongated, 0.1, 0.0)
+
+    scores = np.where(critical | ~structure, 0.0, np.maximum(0.0, 1.0 - penalty))
+    return BatchScores(scores=scores, valid=structure & (scores >= 0.5))
@@ -2,7 +2,18 @@ from __future__ import annotations
 
 from typing import Sequence
 
-from neowave_core.patterns.common_types import PatternCheckResult, is_alternating, pattern_direction
+import numpy as np
+
+from neowave_core.patterns.common_types import (
+    BatchScores,
+    PatternCheckResult,
+    is_alternating,
+    pattern_direction,
+    safe_ratio,
+    similarity_ratios,
+    sliding_windows,
+    windows_alternate,
+)
 from neowave_core.rule_checks import RuleCheck
 from neowave_core.rules_loader import ImpulseRuleSet, extract_impulse_rules
 from neowave_core.swings import Direction, Swing
@@ -36,8 +47,11 @@ def _no_overlap(trend: Direction, wave1: Swing, wave4: Swing) -> bool:
     return wave4.high < wave1.low
 
 
-def is_impulse(swings: Sequence[Swing], rules: dict | ImpulseRuleSet | None = None) -> PatternCheckResult:
-    """Validate a 5-swing impulse using NEoWave rules."""
+def is_impulse(swings: Sequence[Swing], rules: dict | ImpulseRuleSet | None = None, evidence: bool = True) -> PatternCheckResult:
+    """Validate a 5-swing impulse using NEoWave rules.
+
+    With ``evidence=False`` only validity and score are computed (no violations, rule checks or details).
+    """
     violations: list[str] = []
     rule_checks: list[RuleCheck] = []
     if len(swings) != 5:
@@ -62,11 +76,13 @@ def is_impulse(swings: Sequence[Swing], rules: dict | ImpulseRuleSet | None = No
         critical: bool = False,
     ) -> None:
         nonlocal penalty
-        rule_checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
+        if evidence:
+            rule_checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
         if condition:
             return
         penalty += weight
-        violations.append(description)
+        if evidence:
+            violations.append(description)
         if critical:
             penalty = max(penalty, 1.0)
 
@@ -128,7 +144,7 @@ def is_impulse(swings: Sequence[Swing], rules: dict | ImpulseRuleSet | None = No
             extension_present,
             0.6,
         )
-    else:
+    elif evidence:
         rule_checks.append(
             RuleCheck(
                 key="extension_present",
@@ -195,8 +211,10 @@ def is_impulse(swings: Sequence[Swing], rules: dict | ImpulseRuleSet | None = No
         )
 
     score = max(0.0, 1.0 - penalty)
-    subtype = "terminal" if overlap else "trending"
     is_valid = score >= 0.55
+    if not evidence:
+        return PatternCheckResult("impulse", is_valid, score)
+    subtype = "terminal" if overlap else "trending"
     details = {
         "direction": trend.value,
         "extension_present": extension_present,
@@ -206,3 +224,65 @@ def is_impulse(swings: Sequence[Swing], rules: dict | ImpulseRuleSet | None = No
         "rule_checks": rule_checks,
     }
     return PatternCheckResult("impulse", is_valid, score, violations, details=details, rule_checks=rule_checks)
+
+
+def is_impulse_batch(
+    lengths: Sequence[float] | np.ndarray,
+    durations: Sequence[float] | np.ndarray,
+    directions: Sequence[int] | np.ndarray,
+    highs: Sequence[float] | np.ndarray,
+    lows: Sequence[float] | np.ndarray,
+    rules: dict | ImpulseRuleSet | None = None,
+) -> BatchScores:
+    """Score every 5-swing window with the ``is_impulse`` rules, without building evidence.
+
+    Inputs are per-swing columns (directions as +1/-1); penalties are added in
+    the same order as ``is_impulse`` so scores match the scalar checker.
+    """
+    params = rules if isinstance(rules, ImpulseRuleSet) else extract_impulse_rules(rules if isinstance(rules, dict) else None)
+    L = sliding_windows(np.asarray(lengths, dtype=float), 5)
+    D = sliding_windows(np.asarray(durations, dtype=float), 5)
+    H = sliding_windows(np.asarray(highs, dtype=float), 5)
+    Lo = sliding_windows(np.asarray(lows, dtype=float), 5)
+    up = sliding_windows(np.asarray(directions), 5)[:, 0] > 0
+    alternating = windows_alternate(np.asarray(directions), 5)
+    penalty = np.zeros(L.shape[0])
+    critical = np.zeros(L.shape[0], dtype=bool)
+
+    w2_ratio = safe_ratio(L[:, 1], L[:, 0])
+    penalty += np.where(w2_ratio >= params.wave2_min, 0.0, 0.1)
+    fail = ~(w2_ratio < params.wave2_max)
+    penalty += np.where(fail, 1.0, 0.0)
+    critical |= fail
+    penalty += np.where(L[:, 2] > L[:, 1], 0.0, 0.2)
+    penalty += np.where(L[:, 2] >= L[:, 0], 0.0, 0.2)
+    fail = ~(L[:, 2] >= np.minimum(L[:, 0], L[:, 4]))
+    penalty += np.where(fail, 1.0, 0.0)
+    critical |= fail
+
+    motive = np.sort(L[:, [0, 2, 4]], axis=1)
+    has_extension = (motive[:, 1] != 0) & (motive[:, 2] >= params.extension_ratio * motive[:, 1])
+    w1, w3, w5 = L[:, 0], L[:, 2], L[:, 4]
+    allowed = ((w3 >= w1) & (w3 >= w5) & (w5 < w3) & (w3 < params.extension_ratio * w1)) | (
+        (w1 >= w3) & (w1 >= w5) & (w1 < params.extension_ratio * w3)
+    )
+    penalty += np.where(has_extension | allowed, 0.0, 0.6)
+
+    wave5_ok = (L[:, 3] != 0) & (L[:, 4] >= params.wave5_vs_wave4_min * L[:, 3])
+    penalty += np.where(wave5_ok, 0.0, 0.3)
+
+    overlap = np.where(up, ~(Lo[:, 3] > H[:, 0]), ~(H[:, 3] < Lo[:, 0]))
+    penalty += np.where(overlap, 0.4, 0.0)
+
+    w2_time = safe_ratio(D[:, 1], D[:, 0])
+    penalty += np.where((D[:, 0] > 0) & ~(w2_time >= params.similarity_threshold), 0.1, 0.0)
+    w4_time = safe_ratio(D[:, 3], D[:, 2])
+    penalty += np.where((D[:, 2] > 0) & ~(w4_time >= params.similarity_threshold), 0.1, 0.0)
+
+    for left in range(4):
+        price_ok = similarity_ratios(L[:, left], L[:, left + 1]) >= params.similarity_threshold
+        time_ok = similarity_ratios(D[:, left], D[:, left + 1]) >= params.similarity_threshold
+        penalty += np.where(price_ok | time_ok, 0.0, 0.05)
+
+    scores = np.where(critical | ~alternating, 0.0, np.maximum(0.0, 1.0 - penalty))
+    return BatchScores(scores=scores, valid=alternating & (scores >= 0.55))
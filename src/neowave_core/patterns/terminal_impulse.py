@@ -2,14 +2,21 @@ from __future__ import annotations
 
 from typing import Sequence
 
+import numpy as np
+
 from neowave_core.patterns.common_types import (
+    BatchScores,
     PatternCheckResult,
     is_alternating,
     length_ratio,
     pattern_direction,
+    safe_ratio,
     similarity_ratio,
+    similarity_ratios,
+    sliding_windows,
     swing_lengths,
     swing_durations,
+    windows_alternate,
 )
 from neowave_core.rule_checks import RuleCheck
 from neowave_core.rules_loader import TerminalImpulseRuleSet, extract_terminal_impulse_rules
@@ -22,8 +29,12 @@ def _has_overlap(trend: Direction, wave1: Swing, wave4: Swing) -> bool:
     return wave4.high >= wave1.low
 
 
-def is_terminal_impulse(swings: Sequence[Swing], rules: dict | TerminalImpulseRuleSet | None = None) -> PatternCheckResult:
-    """Validate a 5-swing terminal/ending diagonal."""
+def is_terminal_impulse(
+    swings: Sequence[Swing],
+    rules: dict | TerminalImpulseRuleSet | None = None,
+    evidence: bool = True,
+) -> PatternCheckResult:
+    """Validate a 5-swing terminal/ending diagonal (``evidence=False`` skips violations, checks and details)."""
     if len(swings) != 5:
         return PatternCheckResult("terminal_impulse", False, 0.0, ["Terminal impulse requires 5 swings"])
     if not is_alternating(swings):
@@ -51,10 +62,12 @@ def is_terminal_impulse(swings: Sequence[Swing], rules: dict | TerminalImpulseRu
         critical: bool = False,
     ) -> None:
         nonlocal penalty
-        rule_checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
+        if evidence:
+            rule_checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
         if condition:
             return
-        violations.append(description)
+        if evidence:
+            violations.append(description)
         penalty += weight
         if critical:
             penalty = max(penalty, 1.0)
@@ -145,6 +158,8 @@ def is_terminal_impulse(swings: Sequence[Swing], rules: dict | TerminalImpulseRu
 
     score = max(0.0, 1.0 - penalty)
     is_valid = score >= 0.5
+    if not evidence:
+        return PatternCheckResult("terminal_impulse", is_valid, score)
     details = {
         "direction": trend.value,
         "mode": "contracting" if contracting else "expanding",
@@ -153,3 +168,45 @@ def is_terminal_impulse(swings: Sequence[Swing], rules: dict | TerminalImpulseRu
         "rule_checks": rule_checks,
     }
     return PatternCheckResult("terminal_impulse", is_valid, score, violations, details=details, rule_checks=rule_checks)
+
+
+def is_terminal_impulse_batch(
+    lengths: Sequence[float] | np.ndarray,
+    durations: Sequence[float] | np.ndarray,
+    directions: Sequence[int] | np.ndarray,
+    highs: Sequence[float] | np.ndarray,
+    lows: Sequence[float] | np.ndarray,
+    rules: dict | TerminalImpulseRuleSet | None = None,
+) -> BatchScores:
+    """Score every 5-swing window with the ``is_terminal_impulse`` rules, without building evidence."""
+    params = (
+        rules
+        if isinstance(rules, TerminalImpulseRuleSet)
+        else extract_terminal_impulse_rules(rules if isinstance(rules, dict) else None)
+    )
+    L = sliding_windows(np.asarray(lengths, dtype=float), 5)
+    D = sliding_windows(np.asarray(durations, dtype=float), 5)
+    H = sliding_windows(np.asarray(highs, dtype=float), 5)
+    Lo = sliding_windows(np.asarray(lows, dtype=float), 5)
+    up = sliding_windows(np.asarray(directions), 5)[:, 0] > 0
+    alternating = windows_alternate(np.asarray(directions), 5)
+    penalty = np.zeros(L.shape[0])
+
+    critical = ~(L[:, 2] >= np.minimum(L[:, 0], L[:, 4]))
+    penalty += np.where(critical, 0.5, 0.0)
+    contracting = (L[:, 0] > L[:, 2]) & (L[:, 2] > L[:, 4])
+    expanding = (L[:, 0] < L[:, 2]) & (L[:, 2] < L[:, 4])
+    penalty += np.where(contracting | expanding, 0.0, 0.25)
+    penalty += np.where(safe_ratio(L[:, 1], L[:, 0]) >= params.correction_depth_min, 0.0, 0.1)
+    penalty += np.where(safe_ratio(L[:, 3], L[:, 2]) >= params.correction_depth_min, 0.0, 0.1)
+    penalty += np.where(similarity_ratios(L[:, 0], L[:, 2]) >= params.proportion_similarity, 0.0, 0.1)
+    penalty += np.where(similarity_ratios(L[:, 2], L[:, 4]) >= params.proportion_similarity, 0.0, 0.1)
+    timed = (D[:, 0] > 0) & (D[:, 1] > 0)
+    penalty += np.where(timed & ~(safe_ratio(D[:, 1], D[:, 0]) >= params.correction_depth_min), 0.05, 0.0)
+    timed = (D[:, 2] > 0) & (D[:, 3] > 0)
+    penalty += np.where(timed & ~(safe_ratio(D[:, 3], D[:, 2]) >= params.correction_depth_min), 0.05, 0.0)
+    overlap = np.where(up, Lo[:, 3] <= H[:, 0], H[:, 3] >= Lo[:, 0])
+    penalty += np.where(overlap, 0.0, 0.2)
+
+    scores = np.where(critical | ~alternating, 0.0, np.maximum(0.0, 1.0 - penalty))
+    return BatchScores(scores=scores, valid=alternating & (scores >= 0.5))
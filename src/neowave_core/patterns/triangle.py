@@ -2,31 +2,40 @@ from __future__ import annotations
 
 from typing import Sequence
 
+import numpy as np
+
 from neowave_core.patterns.common_types import (
+    BatchScores,
     PatternCheckResult,
     is_alternating,
     length_ratio,
     pattern_direction,
+    safe_ratio,
     similarity_ratio,
+    similarity_ratios,
+    sliding_windows,
     swing_lengths,
+    windows_alternate,
 )
 from neowave_core.rule_checks import RuleCheck
 from neowave_core.rules_loader import TriangleRuleSet, extract_triangle_rules
 from neowave_core.swings import Swing
 
 
-def _evaluate_contracting(lengths: list[float], params: TriangleRuleSet) -> tuple[float, list[str], list[RuleCheck]]:
+def _evaluate_contracting(lengths: list[float], params: TriangleRuleSet, evidence: bool = True) -> tuple[float, list[str], list[RuleCheck]]:
     violations: list[str] = []
     checks: list[RuleCheck] = []
     penalty = 0.0
 
     def record(key: str, description: str, value: float | bool, expected: str, condition: bool, weight: float) -> None:
         nonlocal penalty
-        checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
+        if evidence:
+            checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
         if condition:
             return
         penalty += weight
-        violations.append(description)
+        if evidence:
+            violations.append(description)
 
     c_ratio = length_ratio(lengths[2], lengths[0])
     e_ratio = length_ratio(lengths[4], lengths[2])
@@ -83,18 +92,20 @@ def _evaluate_contracting(lengths: list[float], params: TriangleRuleSet) -> tupl
     return score, violations, checks
 
 
-def _evaluate_expanding(lengths: list[float], params: TriangleRuleSet) -> tuple[float, list[str], list[RuleCheck]]:
+def _evaluate_expanding(lengths: list[float], params: TriangleRuleSet, evidence: bool = True) -> tuple[float, list[str], list[RuleCheck]]:
     violations: list[str] = []
     checks: list[RuleCheck] = []
     penalty = 0.0
 
     def record(key: str, description: str, value: float | bool, expected: str, condition: bool, weight: float) -> None:
         nonlocal penalty
-        checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
+        if evidence:
+            checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
         if condition:
             return
         penalty += weight
-        violations.append(description)
+        if evidence:
+            violations.append(description)
 
     record(
         "expanding_c_vs_a",
@@ -141,18 +152,20 @@ def _evaluate_expanding(lengths: list[float], params: TriangleRuleSet) -> tuple[
     return score, violations, checks
 
 
-def _evaluate_neutral(lengths: list[float], params: TriangleRuleSet) -> tuple[float, list[str], list[RuleCheck]]:
+def _evaluate_neutral(lengths: list[float], params: TriangleRuleSet, evidence: bool = True) -> tuple[float, list[str], list[RuleCheck]]:
     violations: list[str] = []
     checks: list[RuleCheck] = []
     penalty = 0.0
 
     def record(key: str, description: str, value: float | bool, expected: str, condition: bool, weight: float) -> None:
         nonlocal penalty
-        checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
+        if evidence:
+            checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
         if condition:
             return
         penalty += weight
-        violations.append(description)
+        if evidence:
+            violations.append(description)
 
     record(
         "neutral_c_largest",
@@ -192,8 +205,8 @@ def _evaluate_neutral(lengths: list[float], params: TriangleRuleSet) -> tuple[fl
     return score, violations, checks
 
 
-def is_triangle(swings: Sequence[Swing], rules: dict | TriangleRuleSet | None = None) -> PatternCheckResult:
-    """Check a 5-swing triangle and classify the subtype."""
+def is_triangle(swings: Sequence[Swing], rules: dict | TriangleRuleSet | None = None, evidence: bool = True) -> PatternCheckResult:
+    """Check a 5-swing triangle and classify the subtype (``evidence=False`` skips violations, checks and details)."""
     if len(swings) != 5:
         return PatternCheckResult("triangle", False, 0.0, ["Triangle requires exactly 5 swings"])
     if not is_alternating(swings):
@@ -201,17 +214,73 @@ def is_triangle(swings: Sequence[Swing], rules: dict | TriangleRuleSet | None =
 
     params = rules if isinstance(rules, TriangleRuleSet) else extract_triangle_rules(rules if isinstance(rules, dict) else None)
     lengths = swing_lengths(swings)
-    candidates = []
-    for subtype, evaluator in (
+    evaluators = (
         ("contracting", _evaluate_contracting),
         ("expanding", _evaluate_expanding),
         ("neutral", _evaluate_neutral),
-    ):
-        score, violations, checks = evaluator(lengths, params)
-        candidates.append((score, subtype, violations, checks))
+    )
+    # Score every subtype without evidence, then rebuild checks for the winner only.
+    scores = [evaluator(lengths, params, evidence=False)[0] for _, evaluator in evaluators]
+    best_index = max(range(len(evaluators)), key=lambda i: scores[i])
+    best_score = scores[best_index]
+    is_valid = best_score >= 0.45
+    if not evidence:
+        return PatternCheckResult("triangle", is_valid, best_score)
 
-    best_score, best_subtype, best_violations, best_checks = max(candidates, key=lambda item: item[0])
+    best_subtype, best_evaluator = evaluators[best_index]
+    _, best_violations, best_checks = best_evaluator(lengths, params)
     direction = pattern_direction(swings)
-    is_valid = best_score >= 0.45
     details = {"direction": direction.value, "subtype": best_subtype, "wave_lengths": lengths, "rule_checks": best_checks}
     return PatternCheckResult("triangle", is_valid, best_score, best_violations, details=details, rule_checks=best_checks)
+
+
+def is_triangle_batch(
+    lengths: Sequence[float] | np.ndarray,
+    durations: Sequence[float] | np.ndarray,
+    directions: Sequence[int] | np.ndarray,
+    rules: dict | TriangleRuleSet | None = None,
+) -> BatchScores:
+    """Score every 5-swing window with the ``is_triangle`` rules (best subtype), without building evidence.
+
+    ``durations`` is accepted for signature parity with the other kernels; triangle rules are price-only.
+    """
+    params = rules if isinstance(rules, TriangleRuleSet) else extract_triangle_rules(rules if isinstance(rules, dict) else None)
+    L = sliding_windows(np.asarray(lengths, dtype=float), 5)
+    alternating = windows_alternate(np.asarray(directions), 5)
+    a, b, c, d, e = (L[:, i] for i in range(5))
+
+    def _score(penalty: np.ndarray) -> np.ndarray:
+        return np.maximum(0.0, 1.0 - penalty)
+
+    # Contracting
+    penalty = np.zeros(L.shape[0])
+    c_ratio = safe_ratio(c, a)
+    e_ratio = safe_ratio(e, c)
+    penalty += np.where(c_ratio <= max(params.contracting_c_to_a * 1.1, 0.9), 0.0, 0.25)
+    penalty += np.where((params.contracting_e_min <= e_ratio) & (e_ratio <= params.contracting_e_max), 0.0, 0.2)
+    penalty += np.where(b < a, 0.0, 0.1)
+    penalty += np.where(d <= c, 0.0, 0.1)
+    penalty += np.where(e <= c, 0.0, 0.1)
+    penalty += np.where(a >= c, 0.0, 0.2)
+    contracting = _score(penalty)
+
+    # Expanding
+    penalty = np.zeros(L.shape[0])
+    penalty += np.where(c_ratio >= params.expanding_c_min, 0.0, 0.3)
+    penalty += np.where(e_ratio >= params.expanding_e_min, 0.0, 0.3)
+    penalty += np.where(b >= a, 0.0, 0.1)
+    penalty += np.where(d >= b, 0.0, 0.1)
+    penalty += np.where(e_ratio <= params.expanding_e_max, 0.0, 0.2)
+    expanding = _score(penalty)
+
+    # Neutral
+    penalty = np.zeros(L.shape[0])
+    penalty += np.where(c >= L.max(axis=1), 0.0, 0.25)
+    a_c_ratio = safe_ratio(a, c)
+    penalty += np.where((params.neutral_a_min <= a_c_ratio) & (a_c_ratio <= params.neutral_a_max), 0.0, 0.2)
+    penalty += np.where((params.neutral_e_min <= e_ratio) & (e_ratio <= params.neutral_e_max), 0.0, 0.2)
+    penalty += np.where(similarity_ratios(a, e) >= params.similarity_tolerance, 0.0, 0.15)
+    neutral = _score(penalty)
+
+    scores = np.where(alternating, np.maximum(np.maximum(contracting, expanding), neutral), 0.0)
+    return BatchScores(scores=scores, valid=alternating & (scores >= 0.45))
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 from typing import Sequence
 
-from neowave_core.patterns.common_types import PatternCheckResult, pattern_direction
+import numpy as np
+
+from neowave_core.patterns.common_types import BatchScores, PatternCheckResult, pattern_direction, safe_ratio, sliding_windows
 from neowave_core.rule_checks import RuleCheck
 from neowave_core.rules_loader import ZigzagRuleSet, extract_zigzag_rules
 from neowave_core.swings import Swing
 
 
-def is_zigzag(swings: Sequence[Swing], rules: dict | ZigzagRuleSet | None = None) -> PatternCheckResult:
-    """Check a 3-swing zigzag correction."""
+def is_zigzag(swings: Sequence[Swing], rules: dict | ZigzagRuleSet | None = None, evidence: bool = True) -> PatternCheckResult:
+    """Check a 3-swing zigzag correction (``evidence=False`` skips violations, checks and details)."""
     violations: list[str] = []
     rule_checks: list[RuleCheck] = []
     if len(swings) != 3:
@@ -34,10 +36,12 @@ def is_zigzag(swings: Sequence[Swing], rules: dict | ZigzagRuleSet | None = None
         critical: bool = False,
     ) -> None:
         nonlocal penalty
-        rule_checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
+        if evidence:
+            rule_checks.append(RuleCheck(key=key, description=description, value=value, expected=expected, passed=condition, penalty=0.0 if condition else weight))
         if condition:
             return
-        violations.append(description)
+        if evidence:
+            violations.append(description)
         penalty += weight
         if critical:
             penalty = max(penalty, 1.0)
@@ -94,6 +98,8 @@ def is_zigzag(swings: Sequence[Swing], rules: dict | ZigzagRuleSet | None = None
 
     score = max(0.0, 1.0 - penalty)
     is_valid = score >= 0.5
+    if not evidence:
+        return PatternCheckResult("zigzag", is_valid, score)
     details = {
         "direction": trend.value,
         "b_ratio": b_ratio,
@@ -102,3 +108,29 @@ def is_zigzag(swings: Sequence[Swing], rules: dict | ZigzagRuleSet | None = None
         "rule_checks": rule_checks,
     }
     return PatternCheckResult("zigzag", is_valid, score, violations, details=details, rule_checks=rule_checks)
+
+
+def is_zigzag_batch(
+    lengths: Sequence[float] | np.ndarray,
+    durations: Sequence[float] | np.ndarray,
+    directions: Sequence[int] | np.ndarray,
+    rules: dict | ZigzagRuleSet | None = None,
+) -> BatchScores:
+    """Score every 3-swing window with the ``is_zigzag`` rules, without building evidence."""
+    params = rules if isinstance(rules, ZigzagRuleSet) else extract_zigzag_rules(rules if isinstance(rules, dict) else None)
+    L = sliding_windows(np.asarray(lengths, dtype=float), 3)
+    D = sliding_windows(np.asarray(durations, dtype=float), 3)
+    dirs = sliding_windows(np.asarray(directions), 3)
+    structure = (dirs[:, 0] != dirs[:, 1]) & (dirs[:, 0] == dirs[:, 2])
+    penalty = np.zeros(L.shape[0])
+
+    b_ratio = safe_ratio(L[:, 1], L[:, 0])
+    c_ratio = safe_ratio(L[:, 2], L[:, 0])
+    critical = ~(b_ratio <= params.b_max) | ~(c_ratio >= params.c_min_valid)
+    timed = D[:, 0] > 0
+    penalty += np.where(timed & ~(D[:, 1] >= D[:, 0]), 0.1, 0.0)
+    penalty += np.where(timed & ~(D[:, 2] >= D[:, 0]), 0.1, 0.0)
+    penalty += np.where(c_ratio < params.c_typical, 0.15, np.where(c_ratio > params.c_elongated, 0.1, 0.0))
+
+    scores = np.where(critical | ~structure, 0.0, np.maximum(0.0, 1.0 - penalty))
+    return BatchScores(scores=scores, valid=structure & (scores >= 0.5))
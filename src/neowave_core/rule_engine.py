@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from typing import Any, Iterable, Sequence
 
 from neowave_core.parser import ParseSettings, parse_wave_tree
+from neowave_core.rules_loader import CompiledRules, compile_rules
 from neowave_core.wave_tree import build_wave_tree_from_parsed, serialize_wave_tree
 
 import numpy as np
 
 from neowave_core.models import WaveNode, WaveTree
 from neowave_core.rule_checks import RuleCheck
-from neowave_core.swings import Swing
+from neowave_core.swings import MonowaveIndex, Swing, SwingRangeIndex
+from neowave_core.wave_engine import shared_executor
 
 
 @dataclass(slots=True)
@@ -25,38 +28,31 @@ def _typical_scale(swings: Sequence[Swing]) -> float:
     for swing in swings:
         if swing.duration <= 0:
             continue
-        ratios.append(swing.price_range / swing.duration)
+        ratios.append((swing.high_price - swing.low_price) / swing.duration)
     if not ratios:
         return 1.0
     return float(np.median(ratios))
 
 
-def _node_window(swings: Sequence[Swing], node: WaveNode) -> list[Swing]:
-    if not swings:
-        return []
-    start = max(0, min(node.start_idx, node.end_idx))
-    end = min(len(swings) - 1, max(node.start_idx, node.end_idx))
-    return list(swings[start : end + 1])
-
-
-def _annotate_metrics(node: WaveNode, swings: Sequence[Swing], typical_scale: float) -> None:
-    window = _node_window(swings, node)
-    if not window:
+def _annotate_metrics(node: WaveNode, index: SwingRangeIndex, typical_scale: float) -> None:
+    bounds = index.bounds(node.start_idx, node.end_idx)
+    if bounds is None:
         node.box_ratio = None
         node.energy_metric = None
         return
-    time_range = (window[-1].end_time - window[0].start_time).total_seconds()
-    price_range = max(sw.high for sw in window) - min(sw.low for sw in window)
-    avg_volume = sum(sw.volume for sw in window) / len(window)
+    start, end = bounds
+    time_range = (index.swings[end].end_time - index.swings[start].start_time).total_seconds()
+    price_range = index.high(start, end) - index.low(start, end)
+    avg_volume = index.volume(start, end) / (end - start + 1)
     scale = typical_scale if typical_scale > 0 else 1.0
     node.box_ratio = price_range / (max(time_range, 1.0) * scale)
     node.energy_metric = price_range * max(time_range, 1.0) * max(avg_volume, 1.0)
 
 
-def _annotate_tree(node: WaveNode, swings: Sequence[Swing], typical_scale: float) -> None:
-    _annotate_metrics(node, swings, typical_scale)
+def _annotate_tree(node: WaveNode, index: SwingRangeIndex, typical_scale: float) -> None:
+    _annotate_metrics(node, index, typical_scale)
     for child in node.sub_waves:
-        _annotate_tree(child, swings, typical_scale)
+        _annotate_tree(child, index, typical_scale)
 
 
 def _rule_check(key: str, description: str, value: float | bool, expected: str, passed: bool, penalty: float) -> RuleCheck:
@@ -184,13 +180,38 @@ def _complexity_penalty(node: WaveNode) -> float:
     return 0.0
 
 
+def _micro_pattern(window: Sequence[Swing], rules: dict[str, Any] | CompiledRules | None, similarity_threshold: float) -> dict[str, Any] | None:
+    """Best micro parse of one window, summarized for the UI (``None`` when nothing parses)."""
+    if rules is None or len(window) < 3:
+        return None
+    try:
+        micro_tree = parse_wave_tree(window, rules, settings=ParseSettings(similarity_threshold=similarity_threshold))
+    except (ValueError, ZeroDivisionError):
+        return None
+    if not micro_tree.roots:
+        return None
+    micro_root = micro_tree.roots[0]
+    micro_ui_tree = build_wave_tree_from_parsed(micro_root)
+    return {
+        "pattern_type": micro_root.pattern_type,
+        "score": micro_root.score,
+        "wave_count": len(micro_root.sub_waves),
+        "swing_indices": (micro_root.start_idx, micro_root.end_idx),
+        "wave_tree": serialize_wave_tree(micro_ui_tree),
+    }
+
+
+def _micro_pattern_worker(payload: tuple[list[Swing], CompiledRules | None, float]) -> dict[str, Any] | None:
+    window, rules, similarity_threshold = payload
+    return _micro_pattern(window, rules, similarity_threshold)
+
+
 def _micro_analysis(
     node: WaveNode,
-    micro_swings: Sequence[Swing],
+    window: Sequence[Swing],
     similarity_threshold: float,
-    rules: dict[str, Any] | None,
+    micro_pattern: dict[str, Any] | None,
 ) -> dict[str, object] | None:
-    window = [sw for sw in micro_swings if node.start_time <= sw.start_time and sw.end_time <= node.end_time]
     if not window:
         return {"scale": "micro", "score": 0.0, "violations": ["No micro swings in node window"], "swing_count": 0}
 
@@ -199,23 +220,6 @@ def _micro_analysis(
     score = 1.0
     violations: list[str] = []
 
-    micro_pattern: dict[str, Any] | None = None
-    if rules is not None and swing_count >= 3:
-        try:
-            micro_tree = parse_wave_tree(window, rules, settings=ParseSettings(similarity_threshold=similarity_threshold))
-            if micro_tree.roots:
-                micro_root = micro_tree.roots[0]
-                micro_ui_tree = build_wave_tree_from_parsed(micro_root)
-                micro_pattern = {
-                    "pattern_type": micro_root.pattern_type,
-                    "score": micro_root.score,
-                    "wave_count": len(micro_root.sub_waves),
-                    "swing_indices": (micro_root.start_idx, micro_root.end_idx),
-                    "wave_tree": serialize_wave_tree(micro_ui_tree),
-                }
-        except Exception:
-            micro_pattern = None
-
     parent_type = node.pattern_type.lower()
     if parent_type in {"impulse", "terminalimpulse", "terminal_impulse"}:
         if swing_count < 5:
@@ -248,10 +252,10 @@ def _micro_analysis(
             score -= 0.1
             violations.append("Micro swings do not alternate for correction")
 
-    similarity_penalty, _ = _adjacent_similarity([WaveNode.from_swing(idx, sw) for idx, sw in enumerate(window)], similarity_threshold)
+    similarity_penalty, _ = _adjacent_similarity([WaveNode.from_monowave(sw) for sw in window], similarity_threshold)
     score -= similarity_penalty
 
-    avg_len = float(np.mean([sw.length for sw in window])) if window else 0.0
+    avg_len = float(np.mean([sw.abs_price_change for sw in window])) if window else 0.0
     avg_time = float(np.mean([sw.duration for sw in window])) if window else 0.0
     ratios: dict[str, float] = {}
     if avg_len > 0:
@@ -277,10 +281,39 @@ def _micro_analysis(
     return result
 
 
-def _attach_micro_to_tree(node: WaveNode, micro_swings: Sequence[Swing], similarity_threshold: float, rules: dict[str, Any] | None) -> None:
-    node.sub_scale_analysis = _micro_analysis(node, micro_swings, similarity_threshold, rules) if micro_swings else None
+def _walk(node: WaveNode) -> Iterable[WaveNode]:
+    yield node
     for child in node.sub_waves:
-        _attach_micro_to_tree(child, micro_swings, similarity_threshold, rules)
+        yield from _walk(child)
+
+
+def _attach_micro_to_tree(
+    roots: Sequence[WaveNode],
+    micro_index: MonowaveIndex,
+    similarity_threshold: float,
+    rules: dict[str, Any] | None,
+    workers: int = 0,
+    executor: Executor | None = None,
+) -> None:
+    """Attach micro analysis to every node of the trees.
+
+    Node windows are sliced from the time-sorted index by binary search and each
+    distinct window is parsed once; with ``workers > 1`` the parses run in ``executor``,
+    or the shared process pool when none is given. Nodes sharing a window (a parent and
+    its only child, or repeated roots) reuse the same micro pattern.
+    """
+    nodes = [node for root in roots for node in _walk(root)]
+    compiled = compile_rules(rules) if rules is not None else None
+    groups = micro_index.group_spans((node.start_time, node.end_time) for node in nodes)
+    windows = [micro_index.monowaves[lo:hi] for lo, hi in groups]
+    if workers > 1 and len(windows) > 1:
+        pool = executor if executor is not None else shared_executor(workers)
+        patterns = list(pool.map(_micro_pattern_worker, [(window, compiled, similarity_threshold) for window in windows]))
+    else:
+        patterns = [_micro_pattern(window, compiled, similarity_threshold) for window in windows]
+    for window, pattern, positions in zip(windows, patterns, groups.values()):
+        for pos in positions:
+            nodes[pos].sub_scale_analysis = _micro_analysis(nodes[pos], window, similarity_threshold, pattern)
 
 
 def _score_node(node: WaveNode, similarity_threshold: float) -> tuple[float, list[str], list[RuleCheck]]:
@@ -353,16 +386,24 @@ def score_scenario_with_neowave_rules(
     tree: WaveTree,
     swings: Sequence[Swing],
     rules: dict[str, Any] | None = None,
-    micro_swings: Sequence[Swing] | None = None,
+    micro_swings: Sequence[Swing] | MonowaveIndex | None = None,
     similarity_threshold: float = 0.33,
+    workers: int = 0,
+    executor: Executor | None = None,
 ) -> ScenarioRuleScore:
-    swing_list = list(swings)
-    typical_scale = _typical_scale(swing_list)
+    """Score a parsed tree with the NEoWave rule checks.
+
+    ``micro_swings`` (contiguous, or a prebuilt ``MonowaveIndex`` to share across
+    calls) adds a micro consistency check per node; ``workers``/``executor`` run the
+    micro parses in a process pool as in ``verify_patterns``.
+    """
+    swing_index = SwingRangeIndex(swings)
+    typical_scale = _typical_scale(swing_index.swings)
 
-    if micro_swings:
-        micro_list = list(micro_swings)
+    if isinstance(micro_swings, MonowaveIndex):
+        micro_index: MonowaveIndex | None = micro_swings if len(micro_swings) else None
     else:
-        micro_list = []
+        micro_index = MonowaveIndex(micro_swings) if micro_swings else None
 
     evidence: list[RuleCheck] = []
     hard: list[str] = []
@@ -370,9 +411,11 @@ def score_scenario_with_neowave_rules(
     base_scores = []
 
     for root in tree.roots:
-        _annotate_tree(root, swing_list, typical_scale)
-        if micro_list:
-            _attach_micro_to_tree(root, micro_list, similarity_threshold, rules)
+        _annotate_tree(root, swing_index, typical_scale)
+    if micro_index is not None:
+        _attach_micro_to_tree(tree.roots, micro_index, similarity_threshold, rules, workers, executor)
+
+    for root in tree.roots:
         node_penalty, node_hard, node_evidence = _score_node(root, similarity_threshold)
         penalty += node_penalty
         hard.extend(node_hard)
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import re
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any, Iterable
 
+logger = logging.getLogger(__name__)
+
+COMPILED_FORMAT_VERSION = 1
+
 
 def load_rules(path: str | Path = "rules/neowave_rules.json") -> dict[str, Any]:
     """Load NEoWave rule definitions from JSON."""
@@ -228,3 +235,142 @@ class TerminalImpulseRuleSet:
 
 def extract_terminal_impulse_rules(rule_block: dict[str, Any] | None) -> TerminalImpulseRuleSet:
     return TerminalImpulseRuleSet()
+
+
+@dataclass(slots=True)
+class CompiledRules:
+    """Typed rule sets extracted once from the free-text JSON rules."""
+
+    source_hash: str
+    impulse: ImpulseRuleSet
+    terminal: TerminalImpulseRuleSet
+    zigzag: ZigzagRuleSet
+    flat: FlatRuleSet
+    triangle: TriangleRuleSet
+    combination: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format_version": COMPILED_FORMAT_VERSION,
+            "source_hash": self.source_hash,
+            "impulse": asdict(self.impulse),
+            "terminal": asdict(self.terminal),
+            "zigzag": asdict(self.zigzag),
+            "flat": asdict(self.flat),
+            "triangle": asdict(self.triangle),
+            "combination": self.combination,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CompiledRules":
+        if data.get("format_version") != COMPILED_FORMAT_VERSION:
+            raise ValueError("Unsupported compiled rules format")
+        return cls(
+            source_hash=str(data["source_hash"]),
+            impulse=ImpulseRuleSet(**data["impulse"]),
+            terminal=TerminalImpulseRuleSet(**data["terminal"]),
+            zigzag=ZigzagRuleSet(**data["zigzag"]),
+            flat=FlatRuleSet(**data["flat"]),
+            triangle=TriangleRuleSet(**data["triangle"]),
+            combination=dict(data.get("combination", {})),
+        )
+
+
+# In-memory LRU cache: content hash -> compiled rules.
+_COMPILED_BY_HASH: OrderedDict[str, CompiledRules] = OrderedDict()
+_COMPILED_CACHE_SIZE = 32
+
+
+def rules_hash(rules: dict[str, Any]) -> str:
+    """Stable content hash of a rules mapping."""
+    canonical = json.dumps(rules, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _compile(rules: dict[str, Any], source_hash: str) -> CompiledRules:
+    corrections = rules.get("Corrections", {})
+    return CompiledRules(
+        source_hash=source_hash,
+        impulse=extract_impulse_rules(rules.get("Impulse", {}).get("TrendingImpulse", {})),
+        terminal=extract_terminal_impulse_rules(rules.get("Impulse", {}).get("TerminalImpulse", {})),
+        zigzag=extract_zigzag_rules(corrections.get("Zigzag", {})),
+        flat=extract_flat_rules(corrections.get("Flat", {})),
+        triangle=extract_triangle_rules(corrections.get("Triangle", {})),
+        combination=dict(corrections.get("Combination", {})),
+    )
+
+
+def compile_rules(rules: dict[str, Any] | CompiledRules) -> CompiledRules:
+    """Compile a rules mapping into typed rule sets, memoized by content hash.
+
+    The mapping is hashed on every call, so a dict mutated in place compiles afresh.
+    The most recently used ``_COMPILED_CACHE_SIZE`` rule sets are kept.
+    """
+    if isinstance(rules, CompiledRules):
+        return rules
+    digest = rules_hash(rules)
+    compiled = _COMPILED_BY_HASH.get(digest)
+    if compiled is None:
+        compiled = _COMPILED_BY_HASH[digest] = _compile(rules, digest)
+        while len(_COMPILED_BY_HASH) > _COMPILED_CACHE_SIZE:
+            _COMPILED_BY_HASH.popitem(last=False)
+    else:
+        _COMPILED_BY_HASH.move_to_end(digest)
+    return compiled
+
+
+def _artifact_path(rules_path: Path, file_hash: str, cache_dir: Path | None) -> Path:
+    directory = cache_dir if cache_dir is not None else rules_path.parent / ".compiled"
+    return directory / f"{rules_path.stem}.{file_hash[:16]}.json"
+
+
+def build_rules_artifact(path: str | Path = "rules/neowave_rules.json", cache_dir: str | Path | None = None) -> Path:
+    """Compile the JSON rules file and write the hash-versioned artifact to disk."""
+    rules_path = Path(path)
+    if not rules_path.exists():
+        raise FileNotFoundError(f"Rules file not found: {rules_path}")
+    raw = rules_path.read_bytes()
+    file_hash = hashlib.sha256(raw).hexdigest()
+    compiled = compile_rules(json.loads(raw))
+    artifact = _artifact_path(rules_path, file_hash, Path(cache_dir) if cache_dir is not None else None)
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    # Drop artifacts compiled from previous versions of the same rules file.
+    for stale in artifact.parent.glob(f"{rules_path.stem}.*.json"):
+        if stale != artifact:
+            stale.unlink(missing_ok=True)
+    tmp = artifact.with_suffix(".tmp")
+    tmp.write_text(json.dumps(compiled.to_dict(), indent=2), encoding="utf-8")
+    tmp.replace(artifact)
+    return artifact
+
+
+def load_compiled_rules(path: str | Path = "rules/neowave_rules.json", cache_dir: str | Path | None = None) -> CompiledRules:
+    """Load compiled rule sets for a rules file, using the memory and disk caches.
+
+    Artifacts are keyed by the file's content hash, so editing the JSON rules
+    invalidates them automatically.
+    """
+    rules_path = Path(path)
+    if not rules_path.exists():
+        raise FileNotFoundError(f"Rules file not found: {rules_path}")
+    raw = rules_path.read_bytes()
+    file_hash = hashlib.sha256(raw).hexdigest()
+    compiled = _COMPILED_BY_HASH.get(file_hash)
+    if compiled is not None:
+        return compiled
+    artifact = _artifact_path(rules_path, file_hash, Path(cache_dir) if cache_dir is not None else None)
+    if artifact.exists():
+        try:
+            compiled = CompiledRules.from_dict(json.loads(artifact.read_text(encoding="utf-8")))
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning("Ignoring unreadable compiled rules %s: %s", artifact, exc)
+            compiled = None
+    if compiled is None:
+        compiled = compile_rules(json.loads(raw))
+        try:
+            build_rules_artifact(rules_path, cache_dir=cache_dir)
+        except OSError as exc:
+            logger.warning("Could not write compiled rules artifact: %s", exc)
+    _COMPILED_BY_HASH[file_hash] = compiled
+    _COMPILED_BY_HASH.setdefault(compiled.source_hash, compiled)
+    return compiled
@@ -3,7 +3,9 @@ from __future__ import annotations
 from typing import Any, Iterable, Sequence
 
 from neowave_core.models import Monowave, PatternValidation, Scenario, WaveNode
-from neowave_core.wave_engine import analyze_market_structure, find_node_by_id, get_view_nodes
+from neowave_core.pattern_evaluator import PatternEvaluator, RuleProfiler
+from neowave_core.rules_db import RULE_DB
+from neowave_core.wave_engine import AnalysisReport, SearchStrategy, WaveIndex, run_analysis
 
 
 def _serialize_validation(validation: PatternValidation) -> dict[str, Any]:
@@ -40,14 +42,16 @@ def serialize_wave_node(node: WaveNode) -> dict[str, Any]:
     }
 
 
-def serialize_scenario(scenario: Scenario, target_wave_count: int = 40) -> dict[str, Any]:
-    view_nodes = get_view_nodes(scenario.root_nodes, target_wave_count=target_wave_count)
+def serialize_scenario(scenario: Scenario, target_wave_count: int = 40, index: WaveIndex | None = None) -> dict[str, Any]:
+    index = index if index is not None else WaveIndex(scenario.root_nodes)
+    view_nodes = index.view_nodes(target_wave_count)
     return {
         "id": scenario.id,
         "global_score": scenario.global_score,
         "status": scenario.status,
         "invalidation_reasons": list(scenario.invalidation_reasons),
         "probability": scenario.probability,
+        "partial": scenario.partial,
         "invalidation_levels": scenario.invalidation_levels,
         "roots": [serialize_wave_node(root) for root in scenario.root_nodes],
         "view_nodes": [serialize_wave_node(node) for node in view_nodes],
@@ -60,8 +64,24 @@ def generate_scenarios(
     rule_db: dict[str, Any] | None = None,
     beam_width: int = 6,
     target_wave_count: int = 40,
+    profiler: RuleProfiler | None = None,
+    workers: int = 0,
+    time_budget_ms: float | None = None,
+    report: AnalysisReport | None = None,
+    strategy: SearchStrategy | str | None = None,
 ) -> list[dict[str, Any]]:
-    scenarios = analyze_market_structure(monowaves, rule_db=rule_db, beam_width=beam_width)
+    """Analyze and serialize scenarios; ``report`` (if given) receives the iteration/timing summary."""
+    result = run_analysis(
+        monowaves,
+        rule_db=rule_db,
+        beam_width=beam_width,
+        profiler=profiler,
+        workers=workers,
+        time_budget_ms=time_budget_ms,
+        report=report,
+        strategy=strategy,
+    )
+    scenarios = result.scenarios
     
     # Post-process scenarios to add probability and invalidation levels
     for sc in scenarios:
@@ -88,7 +108,7 @@ def generate_scenarios(
                 }
             ]
             
-    return [serialize_scenario(sc, target_wave_count=target_wave_count) for sc in scenarios]
+    return [serialize_scenario(sc, target_wave_count=target_wave_count, index=result.index(sc)) for sc in scenarios]
 
 
 def find_wave_node(
@@ -96,9 +116,23 @@ def find_wave_node(
     wave_id: int,
     rule_db: dict[str, Any] | None = None,
     beam_width: int = 6,
+    profiler: RuleProfiler | None = None,
+    workers: int = 0,
+    strategy: SearchStrategy | str | None = None,
 ) -> WaveNode | None:
-    scenarios = analyze_market_structure(monowaves, rule_db=rule_db, beam_width=beam_width)
-    if not scenarios:
+    result = run_analysis(monowaves, rule_db=rule_db, beam_width=beam_width, profiler=profiler, workers=workers, strategy=strategy)
+    if not result.scenarios:
         return None
-    best = scenarios[0]
-    return find_node_by_id(best.root_nodes, wave_id)
+    return result.index(result.scenarios[0]).find(wave_id)
+
+
+def explain_wave_node(node: WaveNode, rule_db: dict[str, Any] | None = None) -> PatternValidation:
+    """Return the node's rule evidence, rebuilding it from the stored metrics if it was scored without evidence."""
+    validation = node.validation
+    if validation.satisfied_rules or validation.violated_soft_rules or validation.violated_hard_rules:
+        return validation
+    db = rule_db if rule_db is not None else RULE_DB
+    if not node.pattern_type or node.pattern_type not in db or not node.metrics:
+        return validation
+    node.validation = PatternEvaluator(db).explain(node.pattern_type, node.pattern_subtype or "", node.metrics)
+    return node.validation
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -33,6 +34,90 @@ class Bar:
     volume: float = 0.0
 
 
+class MonowaveIndex:
+    """Time-sorted monowaves with binary-search lookup of the run contained in a time range.
+
+    Monowaves are assumed contiguous (each one starts where the previous ends), so end
+    times are sorted as well and the contained run is a single slice.
+    """
+
+    __slots__ = ("monowaves", "_starts", "_ends")
+
+    def __init__(self, monowaves: Sequence[Monowave]):
+        self.monowaves = sorted(monowaves, key=lambda mw: mw.start_time)
+        self._starts = [mw.start_time for mw in self.monowaves]
+        self._ends = [mw.end_time for mw in self.monowaves]
+
+    def span(self, start_time: datetime, end_time: datetime) -> tuple[int, int]:
+        """Slice bounds of the monowaves contained in the range (``lo == hi`` when empty)."""
+        lo = bisect_left(self._starts, start_time)
+        hi = bisect_right(self._ends, end_time)
+        return (lo, hi) if hi > lo else (lo, lo)
+
+    def window(self, start_time: datetime, end_time: datetime) -> list[Monowave]:
+        """Monowaves with ``start_time >= start`` and ``end_time <= end``."""
+        lo, hi = self.span(start_time, end_time)
+        return self.monowaves[lo:hi]
+
+    def group_spans(self, ranges: Iterable[tuple[datetime, datetime]]) -> dict[tuple[int, int], list[int]]:
+        """Positions of ``ranges`` grouped by the span each resolves to, in first-seen order."""
+        groups: dict[tuple[int, int], list[int]] = {}
+        for pos, (start_time, end_time) in enumerate(ranges):
+            groups.setdefault(self.span(start_time, end_time), []).append(pos)
+        return groups
+
+    def __len__(self) -> int:
+        return len(self.monowaves)
+
+
+class SwingRangeIndex:
+    """O(1) range queries over a monowave list: sparse tables for high/low, prefix sums for volume.
+
+    Built once in O(n log n); ``bounds`` clamps a pair of monowave indices to the list,
+    after which ``high``, ``low`` and ``volume`` answer any inclusive range in O(1).
+    """
+
+    __slots__ = ("swings", "_highs", "_lows", "_volume")
+
+    def __init__(self, swings: Sequence[Monowave]):
+        self.swings = list(swings)
+        highs = np.array([sw.high_price for sw in self.swings], dtype=float)
+        lows = np.array([sw.low_price for sw in self.swings], dtype=float)
+        self._highs = [highs]
+        self._lows = [lows]
+        width = 1
+        while 2 * width <= len(highs):
+            prev_high, prev_low = self._highs[-1], self._lows[-1]
+            self._highs.append(np.maximum(prev_high[:-width], prev_high[width:]))
+            self._lows.append(np.minimum(prev_low[:-width], prev_low[width:]))
+            width *= 2
+        self._volume = np.concatenate(([0.0], np.cumsum([sw.volume_sum for sw in self.swings], dtype=float)))
+
+    def __len__(self) -> int:
+        return len(self.swings)
+
+    def bounds(self, start_idx: int, end_idx: int) -> tuple[int, int] | None:
+        """Inclusive range between two indices (either order) clamped to the list, or ``None`` when empty."""
+        if not self.swings:
+            return None
+        start = max(0, min(start_idx, end_idx))
+        end = min(len(self.swings) - 1, max(start_idx, end_idx))
+        return (start, end) if start <= end else None
+
+    def high(self, start: int, end: int) -> float:
+        level = (end - start + 1).bit_length() - 1
+        table = self._highs[level]
+        return float(max(table[start], table[end - (1 << level) + 1]))
+
+    def low(self, start: int, end: int) -> float:
+        level = (end - start + 1).bit_length() - 1
+        table = self._lows[level]
+        return float(min(table[start], table[end - (1 << level) + 1]))
+
+    def volume(self, start: int, end: int) -> float:
+        return float(self._volume[end + 1] - self._volume[start])
+
+
 def _normalize_bars(data: Iterable[dict[str, Any]] | pd.DataFrame) -> list[Bar]:
     if isinstance(data, pd.DataFrame):
         if "timestamp" not in data.columns:
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
-import itertools
-from dataclasses import dataclass
+import hashlib
+import heapq
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 from typing import Any, Iterable, Sequence
 
 from neowave_core.models import Monowave, PatternValidation, Scenario, WaveNode
-from neowave_core.pattern_evaluator import PatternEvaluator
-from neowave_core.patterns.metrics import compute_metrics_for_pattern, infer_net_direction, is_alternating_directions
+from neowave_core.pattern_evaluator import PatternEvaluator, PatternScore, RuleProfiler
+from neowave_core.patterns.metrics import infer_net_direction, is_alternating_directions
 from neowave_core.rules_db import RULE_DB, load_rule_db
+from neowave_core.rules_loader import rules_hash
+from neowave_core.swings import MonowaveIndex, identify_major_pivots
 
-# Global id generators to keep wave/scenario ids stable during a run.
-_wave_id_counter = itertools.count(10_000)
-_scenario_id_counter = itertools.count(1)
+# Content-addressed ids are truncated to 53 bits so they survive JSON/JavaScript numbers.
+_ID_MASK = (1 << 53) - 1
+
+FLAT_SUBTYPES = ("Normal", "Expanded", "Running")
+TRIANGLE_SUBTYPES = ("Contracting", "Expanding", "Neutral")
 
 
 @dataclass(slots=True)
@@ -21,71 +29,101 @@ class PatternMatch:
     start_index: int
     end_index: int
     wave_nodes: list[WaveNode]
-    validation: PatternValidation
+    validation: PatternValidation | None  # None until the match is selected (scoring-only search)
     metrics: dict[str, float]
     score: float
+    evaluator: PatternEvaluator | None = None
+    # Complex corrections: the component matches and connector nodes that become the children.
+    legs: list["PatternMatch | WaveNode"] | None = None
+
+    def resolve_validation(self) -> PatternValidation:
+        """Rule evidence for this match, rebuilt from the stored metrics on first use."""
+        if self.validation is None and self.legs is not None:
+            self.validation = complex_validation(self.pattern_type, self.metrics)
+        if self.validation is None:
+            if self.evaluator is None:
+                raise ValueError(f"No evidence or evaluator stored for {self.pattern_type} match")
+            self.validation = self.evaluator.explain(self.pattern_type, self.subtype or "", self.metrics)
+        return self.validation
+
+
+def _content_id(*parts: Any) -> int:
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & _ID_MASK
 
 
-def _new_wave_id() -> int:
-    return next(_wave_id_counter)
+def content_wave_id(pattern_type: str | None, subtype: str | None, children: Sequence[WaveNode]) -> int:
+    """Deterministic wave id from the pattern, its span and its children's ids.
+
+    Leaves keep their monowave ids, so the same analysis yields the same ids across
+    requests, worker processes and restarts.
+    """
+    first, last = children[0], children[-1]
+    return _content_id(
+        "wave",
+        pattern_type,
+        subtype,
+        first.start_idx,
+        last.end_idx,
+        first.start_time.isoformat(),
+        last.end_time.isoformat(),
+        tuple(child.id for child in children),
+    )
 
 
-def _new_scenario_id() -> int:
-    return next(_scenario_id_counter)
+def content_scenario_id(root_nodes: Sequence[WaveNode]) -> int:
+    """Deterministic scenario id from its root node ids (identical structures share an id)."""
+    return _content_id("scenario", tuple(node.id for node in root_nodes))
 
 
 def wrap_monowaves(monowaves: Iterable[Monowave]) -> list[WaveNode]:
     return [WaveNode.from_monowave(mw) for mw in monowaves]
 
 
-def _pattern_score(validation: PatternValidation, pattern_type: str) -> float:
+def _pattern_score(validation: PatternScore, pattern_type: str) -> float:
     """Lower is better; soft_score plus small complexity premium."""
-    complexity_penalty = 0.1 if pattern_type in {"DoubleThree", "TripleThree"} else 0.0
+    complexity_penalty = 0.1 if pattern_type in {"DoubleThree", "TripleThree", "Diametric"} else 0.0
     base_bias = {
         "Impulse": 0.02,
         "Zigzag": 0.05,
         "Flat": 0.06,
         "Triangle": 0.08,
     }.get(pattern_type, 0.05)
-    return base_bias + validation.soft_score + complexity_penalty + 0.01 * len(validation.violated_soft_rules)
+    return base_bias + validation.soft_score + complexity_penalty + 0.01 * validation.soft_violations
 
 
 def try_impulse(window: list[WaveNode], evaluator: PatternEvaluator) -> PatternMatch | None:
     if len(window) != 5 or not is_alternating_directions(window):
         return None
-    validation, metrics = evaluator.evaluate("Impulse", "TrendingImpulse", window, context=compute_metrics_for_pattern("Impulse", "TrendingImpulse", window))
-    if validation.hard_valid:
-        score = _pattern_score(validation, "Impulse")
-        return PatternMatch("Impulse", "TrendingImpulse", window[0].start_idx, window[-1].end_idx, window, validation, metrics, score)
-    term_validation, term_metrics = evaluator.evaluate("Impulse", "TerminalImpulse", window, context=compute_metrics_for_pattern("Impulse", "TerminalImpulse", window))
-    if term_validation.hard_valid:
-        score = _pattern_score(term_validation, "Impulse") + 0.05
-        return PatternMatch("Impulse", "TerminalImpulse", window[0].start_idx, window[-1].end_idx, window, term_validation, term_metrics, score)
+    result, metrics = evaluator.score("Impulse", "TrendingImpulse", window)
+    if result.hard_valid:
+        score = _pattern_score(result, "Impulse")
+        return PatternMatch("Impulse", "TrendingImpulse", window[0].start_idx, window[-1].end_idx, window, None, metrics, score, evaluator)
+    term_result, term_metrics = evaluator.score("Impulse", "TerminalImpulse", window)
+    if term_result.hard_valid:
+        score = _pattern_score(term_result, "Impulse") + 0.05
+        return PatternMatch("Impulse", "TerminalImpulse", window[0].start_idx, window[-1].end_idx, window, None, term_metrics, score, evaluator)
     return None
 
 
 def try_zigzag(window: list[WaveNode], evaluator: PatternEvaluator) -> PatternMatch | None:
     if len(window) != 3 or not is_alternating_directions(window):
         return None
-    validation, metrics = evaluator.evaluate("Zigzag", "Standard", window, context=compute_metrics_for_pattern("Zigzag", "Standard", window))
-    if validation.hard_valid:
-        score = _pattern_score(validation, "Zigzag")
-        return PatternMatch("Zigzag", "Standard", window[0].start_idx, window[-1].end_idx, window, validation, metrics, score)
+    result, metrics = evaluator.score("Zigzag", "Standard", window)
+    if result.hard_valid:
+        score = _pattern_score(result, "Zigzag")
+        return PatternMatch("Zigzag", "Standard", window[0].start_idx, window[-1].end_idx, window, None, metrics, score, evaluator)
     return None
 
 
 def try_flat(window: list[WaveNode], evaluator: PatternEvaluator) -> PatternMatch | None:
     if len(window) != 3 or not is_alternating_directions(window):
         return None
-    candidates: list[PatternMatch] = []
-    for subtype in ["Normal", "Expanded", "Running"]:
-        validation, metrics = evaluator.evaluate("Flat", subtype, window, context=compute_metrics_for_pattern("Flat", subtype, window))
-        if validation.hard_valid:
-            score = _pattern_score(validation, "Flat")
-            candidates.append(PatternMatch("Flat", subtype, window[0].start_idx, window[-1].end_idx, window, validation, metrics, score))
-    if not candidates:
+    family = evaluator.evaluate_family("Flat", FLAT_SUBTYPES, window, rank=lambda v: _pattern_score(v, "Flat"), evidence=False)
+    if family.score is None:
         return None
-    return min(candidates, key=lambda c: c.score)
+    score = _pattern_score(family.score, "Flat")
+    return PatternMatch("Flat", family.best_subtype, window[0].start_idx, window[-1].end_idx, window, None, family.metrics, score, evaluator)
 
 
 def try_triangle(window: list[WaveNode], evaluator: PatternEvaluator) -> PatternMatch | None:
@@ -96,26 +134,190 @@ def try_triangle(window: list[WaveNode], evaluator: PatternEvaluator) -> Pattern
     # Triangles should be relatively sideways; strong net move biases toward impulse/correction.
     if net_move / total_move > 0.35:
         return None
-    candidates: list[PatternMatch] = []
-    for subtype in ["Contracting", "Expanding", "Neutral"]:
-        validation, metrics = evaluator.evaluate("Triangle", subtype, window, context=compute_metrics_for_pattern("Triangle", subtype, window))
-        if validation.hard_valid:
-            score = _pattern_score(validation, "Triangle")
-            candidates.append(PatternMatch("Triangle", subtype, window[0].start_idx, window[-1].end_idx, window, validation, metrics, score))
-    if not candidates:
+    family = evaluator.evaluate_family("Triangle", TRIANGLE_SUBTYPES, window, rank=lambda v: _pattern_score(v, "Triangle"), evidence=False)
+    if family.score is None:
         return None
-    return min(candidates, key=lambda c: c.score)
+    score = _pattern_score(family.score, "Triangle")
+    return PatternMatch("Triangle", family.best_subtype, window[0].start_idx, window[-1].end_idx, window, None, family.metrics, score, evaluator)
+
 
+CORRECTION_TYPES = frozenset({"Zigzag", "Flat", "Triangle"})
+COMPLEX_CONNECTOR_MAX_RATIO = 0.8  # X connector size relative to the largest W/Y/Z leg
+DIAMETRIC_LEGS = 7
+DIAMETRIC_DURATION_RATIO = 2.0  # slowest / fastest leg
 
-def try_complex_patterns(_nodes: list[WaveNode], _evaluator: PatternEvaluator) -> list[PatternMatch]:
-    # Placeholder for DoubleThree / Diametric / Symmetrical per the guideline's phased rollout.
-    return []
+# Indexed correction: (match, net price move, width in root nodes).
+_Leg = tuple[PatternMatch, float, int]
 
 
-def find_all_local_patterns(nodes: list[WaveNode], evaluator: PatternEvaluator) -> list[PatternMatch]:
+def _correction_index(nodes: Sequence[WaveNode], matches: Iterable[PatternMatch]) -> dict[int, list[_Leg]]:
+    """Best basic correction per (root position, width), grouped by the root position it starts at."""
+    position = {id(node): i for i, node in enumerate(nodes)}
+    best: dict[tuple[int, int], PatternMatch] = {}
+    for pm in matches:
+        if pm.pattern_type not in CORRECTION_TYPES or pm.legs is not None:
+            continue
+        key = (position[id(pm.wave_nodes[0])], len(pm.wave_nodes))
+        current = best.get(key)
+        if current is None or pm.score < current.score:
+            best[key] = pm
+    index: dict[int, list[_Leg]] = {}
+    for (start, width), pm in sorted(best.items()):
+        index.setdefault(start, []).append((pm, pm.wave_nodes[-1].end_price - pm.wave_nodes[0].start_price, width))
+    return index
+
+
+# Composition rules enforced while chaining legs, recorded as satisfied evidence.
+_COMPLEX_HARD_RULES = {
+    "DoubleThree": ("Corrections share the trend direction", "Connectors move against the trend"),
+    "TripleThree": ("Corrections share the trend direction", "Connectors move against the trend"),
+    "Diametric": ("Legs alternate direction", "Legs contract toward d and expand after it (or the reverse)"),
+}
+# The one soft rule per complex pattern: (description, weight, metric, upper bound).
+_COMPLEX_SOFT_RULES = {
+    "DoubleThree": ("Connector X not too large relative to W/Y/Z", 0.2, "connector_ratio", COMPLEX_CONNECTOR_MAX_RATIO),
+    "TripleThree": ("Connector X not too large relative to W/Y/Z", 0.2, "connector_ratio", COMPLEX_CONNECTOR_MAX_RATIO),
+    "Diametric": ("Diametric legs take similar time", 0.2, "duration_ratio", DIAMETRIC_DURATION_RATIO),
+}
+
+
+def complex_validation(pattern_type: str, metrics: dict[str, float]) -> PatternValidation:
+    """Rule evidence of a composed complex correction, rebuilt from its stored metrics."""
+    description, weight, metric, bound = _COMPLEX_SOFT_RULES[pattern_type]
+    validation = PatternValidation(hard_valid=True, soft_score=0.0, satisfied_rules=list(_COMPLEX_HARD_RULES[pattern_type]), violated_soft_rules=[], violated_hard_rules=[])
+    if metrics[metric] <= bound:
+        validation.satisfied_rules.append(description)
+    else:
+        validation.soft_score = weight
+        validation.violated_soft_rules.append(description)
+    return validation
+
+
+def _complex_score(pattern_type: str, ratio: float, legs: Sequence[_Leg]) -> float:
+    _, weight, _, bound = _COMPLEX_SOFT_RULES[pattern_type]
+    rule_score = PatternScore(True, weight, 1) if ratio > bound else PatternScore(True, 0.0, 0)
+    return _pattern_score(rule_score, pattern_type) + sum(pm.score for pm, _, _ in legs) / len(legs)
+
+
+# Composed candidate: (score, metric ratio, correction legs, connector root positions).
+_ComplexCandidate = tuple[float, float, tuple[_Leg, ...], tuple[int, ...]]
+
+
+def _offer(best: dict[tuple[str, int, int], _ComplexCandidate], pattern_type: str, start: int, end: int, ratio: float, legs: tuple[_Leg, ...], connectors: tuple[int, ...]) -> None:
+    """Keep the best candidate per pattern and root span; competing leg partitions of a span are dropped unbuilt."""
+    score = _complex_score(pattern_type, ratio, legs)
+    key = (pattern_type, start, end)
+    current = best.get(key)
+    if current is None or score < current[0]:
+        best[key] = (score, ratio, legs, connectors)
+
+
+def _build_complex(pattern_type: str, start: int, end: int, candidate: _ComplexCandidate, nodes: list[WaveNode]) -> PatternMatch:
+    score, ratio, corrections, connectors = candidate
+    legs: list[PatternMatch | WaveNode] = [corrections[0][0]]
+    for x, (pm, _, _) in zip(connectors, corrections[1:]):
+        legs += [nodes[x], pm]
+    if pattern_type == "Diametric":
+        legs = [pm for pm, _, _ in corrections]
+        subtype = "BowTie" if abs(corrections[3][1]) < abs(corrections[2][1]) else "Diamond"
+        metrics = {"legs": float(DIAMETRIC_LEGS), "duration_ratio": ratio}
+    else:
+        subtype = "-".join(pm.pattern_type for pm, _, _ in corrections)
+        metrics = {"legs": float(len(legs)), "connector_ratio": ratio}
+    span = nodes[start:end]
+    return PatternMatch(pattern_type, subtype, span[0].start_idx, span[-1].end_idx, span, None, metrics, score, legs=legs)
+
+
+def _diametric_chains(index: dict[int, list[_Leg]], start: int, chain: list[_Leg]) -> Iterable[list[_Leg]]:
+    """Alternating seven-leg chains whose sizes move monotonically into leg d and back out.
+
+    The second leg fixes the shape (smaller: bow tie, larger: diamond) and d must be the
+    strict extreme, so chains that break the shape are cut as soon as they do.
+    """
+    if len(chain) == DIAMETRIC_LEGS:
+        yield list(chain)
+        return
+    k = len(chain)
+    for leg in index.get(start, ()):
+        if chain:
+            prev = chain[-1][1]
+            if leg[1] * prev >= 0:
+                continue
+            size, prev_size = abs(leg[1]), abs(prev)
+            contracting = k == 1 and size <= prev_size or k > 1 and abs(chain[1][1]) <= abs(chain[0][1])
+            inward = k <= 3
+            strict = k in (3, 4)
+            if contracting == inward:
+                ok = size < prev_size if strict else size <= prev_size
+            else:
+                ok = size > prev_size if strict else size >= prev_size
+            if not ok:
+                continue
+        chain.append(leg)
+        yield from _diametric_chains(index, start + leg[2], chain)
+        chain.pop()
+
+
+def try_complex_patterns(nodes: list[WaveNode], matches: Iterable[PatternMatch]) -> list[PatternMatch]:
+    """DoubleThree, TripleThree and Diametric composed from the basic correction matches of ``nodes``.
+
+    Corrections are indexed by the root position they start at, so each composition
+    follows W → X connector → Y (→ X → Z) through dictionary lookups instead of testing
+    every 7-, 9- and 11-node window. With the best correction kept per position and
+    width, the work per start position is bounded and the search stays linear in the
+    number of basic matches. Only the best composition per pattern and span is built.
+    """
+    index = _correction_index(nodes, matches)
+    n = len(nodes)
+    best: dict[tuple[str, int, int], _ComplexCandidate] = {}
+    for start, w_legs in index.items():
+        for w in w_legs:
+            x = start + w[2]
+            if x >= n or nodes[x].price_change * w[1] >= 0:
+                continue
+            for y in index.get(x + 1, ()):
+                if y[1] * w[1] <= 0:
+                    continue
+                y_end = x + 1 + y[2]
+                largest = max(abs(w[1]), abs(y[1]))
+                _offer(best, "DoubleThree", start, y_end, nodes[x].abs_price_change / largest, (w, y), (x,))
+                if y_end >= n or nodes[y_end].price_change * w[1] >= 0:
+                    continue
+                for z in index.get(y_end + 1, ()):
+                    if z[1] * w[1] > 0:
+                        ratio = max(nodes[x].abs_price_change, nodes[y_end].abs_price_change) / max(largest, abs(z[1]))
+                        _offer(best, "TripleThree", start, y_end + 1 + z[2], ratio, (w, y, z), (x, y_end))
+        for legs in _diametric_chains(index, start, []):
+            durations = [sum(node.duration for node in pm.wave_nodes) for pm, _, _ in legs]
+            ratio = max(durations) / min(durations) if min(durations) > 0 else DIAMETRIC_DURATION_RATIO + 1.0
+            _offer(best, "Diametric", start, start + sum(leg[2] for leg in legs), ratio, tuple(legs), ())
+    return [_build_complex(ptype, start, end, candidate, nodes) for (ptype, start, end), candidate in best.items()]
+
+
+def _crosses(boundaries: Sequence[int], start_idx: int, end_idx: int) -> bool:
+    """Whether some boundary index lies strictly inside ``(start_idx, end_idx)``; ``boundaries`` is sorted."""
+    pos = bisect_right(boundaries, start_idx)
+    return pos < len(boundaries) and boundaries[pos] < end_idx
+
+
+def find_all_local_patterns(
+    nodes: list[WaveNode],
+    evaluator: PatternEvaluator,
+    min_end_idx: int | None = None,
+    boundaries: Sequence[int] | None = None,
+) -> list[PatternMatch]:
+    """Match every 5- and 3-node window, then compose complex corrections from the matches.
+
+    With ``min_end_idx`` only windows ending after it are tried; with ``boundaries``
+    (sorted indices) only windows with a boundary strictly inside them. Complex
+    corrections are composed from the tried windows only.
+    """
     matches: list[PatternMatch] = []
     n = len(nodes)
-    for i in range(n - 4):
+    first = bisect_right(nodes, min_end_idx, key=lambda node: node.end_idx) if min_end_idx is not None else 0
+    for i in range(max(first - 4, 0), n - 4):
+        if boundaries is not None and not _crosses(boundaries, nodes[i].start_idx, nodes[i + 4].end_idx):
+            continue
         window = nodes[i : i + 5]
         impulse = try_impulse(window, evaluator)
         if impulse:
@@ -123,7 +325,9 @@ def find_all_local_patterns(nodes: list[WaveNode], evaluator: PatternEvaluator)
         tri = try_triangle(window, evaluator)
         if tri:
             matches.append(tri)
-    for i in range(n - 2):
+    for i in range(max(first - 2, 0), n - 2):
+        if boundaries is not None and not _crosses(boundaries, nodes[i].start_idx, nodes[i + 2].end_idx):
+            continue
         window = nodes[i : i + 3]
         zz = try_zigzag(window, evaluator)
         if zz:
@@ -131,31 +335,65 @@ def find_all_local_patterns(nodes: list[WaveNode], evaluator: PatternEvaluator)
         fl = try_flat(window, evaluator)
         if fl:
             matches.append(fl)
-    matches.extend(try_complex_patterns(nodes, evaluator))
+    matches.extend(try_complex_patterns(nodes, matches))
     return matches
 
 
+# k-best entry: (total score, -covered length, selection chain as a persistent (match, parent) list).
+_Selection = tuple[float, int, "tuple[PatternMatch, Any] | None"]
+
+
+def _merge_k_best(skip: list[_Selection], take: list[_Selection], k: int) -> list[_Selection]:
+    """Merge two ranked selection lists, keeping the k best; ties prefer ``skip``."""
+    merged: list[_Selection] = []
+    i = j = 0
+    while len(merged) < k and (i < len(skip) or j < len(take)):
+        if j >= len(take) or (i < len(skip) and skip[i][:2] <= take[j][:2]):
+            merged.append(skip[i])
+            i += 1
+        else:
+            merged.append(take[j])
+            j += 1
+    return merged
+
+
+def _unwind(chain: tuple[PatternMatch, Any] | None) -> list[PatternMatch]:
+    combo: list[PatternMatch] = []
+    while chain is not None:
+        match, chain = chain
+        combo.append(match)
+    combo.reverse()
+    return combo
+
+
 def enumerate_non_overlapping_sets(candidates: list[PatternMatch], beam_width: int = 6) -> list[list[PatternMatch]]:
-    """Beam-search combinations of non-overlapping patterns ordered by score."""
+    """Exact k-best combinations of non-overlapping patterns, lowest total score first.
+
+    Weighted interval scheduling over candidates sorted by end index: ``best[i]`` holds
+    the ``beam_width`` best selections among the first ``i`` candidates, merged from
+    ``best[i - 1]`` (skip candidate i) and ``best[pred(i)]`` plus candidate i, where
+    ``pred`` is found by binary search on end indices. Ties on score prefer the larger
+    covered span. The empty selection takes part in the ranking, as it did in the former
+    beam search, and is dropped from the result.
+    """
+    if beam_width <= 0:
+        return []
     sorted_cands = sorted(candidates, key=lambda c: (c.end_index, c.start_index))
-    beams: list[tuple[list[PatternMatch], int, float, int]] = [([], -1, 0.0, 0)]
-    for cand in sorted_cands:
-        next_beams: list[tuple[list[PatternMatch], int, float]] = []
-        for combo, last_end, score, covered in beams:
-            next_beams.append((combo, last_end, score, covered))
-            if cand.start_index > last_end:
-                new_combo = combo + [cand]
-                new_score = score + cand.score
-                new_covered = covered + (cand.end_index - cand.start_index + 1)
-                next_beams.append((new_combo, cand.end_index, new_score, new_covered))
-        beams = sorted(next_beams, key=lambda item: (item[2], -item[3]))[:beam_width]
-    return [combo for combo, _, _, _ in beams if combo]
-
-
-def build_wavenode_from_match(pm: PatternMatch) -> WaveNode:
-    children = pm.wave_nodes
+    ends = [c.end_index for c in sorted_cands]
+    best: list[list[_Selection]] = [[(0.0, 0, None)]]
+    for i, cand in enumerate(sorted_cands):
+        pred = bisect_left(ends, cand.start_index, 0, i)
+        width = cand.end_index - cand.start_index + 1
+        taken = [(score + cand.score, neg_covered - width, (cand, chain)) for score, neg_covered, chain in best[pred]]
+        best.append(_merge_k_best(best[i], taken, beam_width))
+    return [_unwind(chain) for _, _, chain in best[-1] if chain is not None]
+
+
+def build_wavenode_from_match(pm: PatternMatch, interner: NodeInterner | None = None) -> WaveNode:
+    """Pattern node over the match's nodes; complex corrections get their legs as children."""
+    children = pm.wave_nodes if pm.legs is None else [_leg_node(leg, interner) for leg in pm.legs]
     return WaveNode(
-        id=_new_wave_id(),
+        id=content_wave_id(pm.pattern_type, pm.subtype, children),
         level=max(c.level for c in children) + 1 if children else 1,
         degree_label=None,
         start_idx=children[0].start_idx,
@@ -171,48 +409,230 @@ def build_wavenode_from_match(pm: PatternMatch) -> WaveNode:
         pattern_type=pm.pattern_type,
         pattern_subtype=pm.subtype,
         metrics=pm.metrics,
-        validation=pm.validation,
+        validation=pm.resolve_validation(),
         score=pm.score,
         label=pm.pattern_type,
     )
 
 
-def collapse_nodes(nodes: list[WaveNode], pattern_matches: list[PatternMatch]) -> list[WaveNode]:
+def _leg_node(leg: PatternMatch | WaveNode, interner: NodeInterner | None) -> WaveNode:
+    if isinstance(leg, WaveNode):
+        return leg
+    return interner.node_for(leg) if interner is not None else build_wavenode_from_match(leg)
+
+
+class NodeInterner:
+    """Hash-consing table returning one canonical WaveNode per (pattern_type, subtype, child identities).
+
+    Scenarios built through the same interner share identical subtrees as a DAG, so
+    interned nodes must be treated as read-only. The table holds references to every
+    node it hands out, which keeps child identities valid for the lifetime of the run.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[tuple[str, str | None, tuple[int, ...], tuple[int, ...] | None], WaveNode] = {}
+        self.hits = 0
+
+    def node_for(self, pm: PatternMatch) -> WaveNode:
+        shape = None if pm.legs is None else tuple(len(leg.wave_nodes) if isinstance(leg, PatternMatch) else 1 for leg in pm.legs)
+        key = (pm.pattern_type, pm.subtype, tuple(id(child) for child in pm.wave_nodes), shape)
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = build_wavenode_from_match(pm, self)
+        else:
+            self.hits += 1
+        return node
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+def _index_matches(pattern_matches: Iterable[PatternMatch]) -> list[PatternMatch]:
+    """The longest match per start index (first wins on ties), in start order."""
+    by_start: dict[int, PatternMatch] = {}
+    for pm in pattern_matches:
+        current = by_start.get(pm.start_index)
+        if current is None or pm.end_index > current.end_index:
+            by_start[pm.start_index] = pm
+    return [by_start[start] for start in sorted(by_start)]
+
+
+def collapse_nodes(nodes: list[WaveNode], pattern_matches: list[PatternMatch], interner: NodeInterner | None = None) -> list[WaveNode]:
+    """Replace each matched run of ``nodes`` by its pattern node.
+
+    Matches are indexed by start and their runs located by binary search, so the work
+    is O(matches · log n) plus the slice copies of the untouched runs. A match whose
+    start falls inside an earlier match's run, or on no node start, is ignored.
+    """
     result: list[WaveNode] = []
     i = 0
-    while i < len(nodes):
-        start_idx = nodes[i].start_idx
-        candidates = [pm for pm in pattern_matches if pm.start_index == start_idx]
-        if not candidates:
-            result.append(nodes[i])
-            i += 1
+    for match in _index_matches(pattern_matches):
+        pos = bisect_left(nodes, match.start_index, lo=i, key=lambda node: node.start_idx)
+        if pos == len(nodes) or nodes[pos].start_idx != match.start_index:
             continue
-        match = max(candidates, key=lambda pm: pm.end_index)
-        result.append(build_wavenode_from_match(match))
-        # Skip nodes covered by this match.
-        while i < len(nodes) and nodes[i].end_idx <= match.end_index:
-            i += 1
+        result.extend(nodes[i:pos])
+        result.append(interner.node_for(match) if interner is not None else build_wavenode_from_match(match))
+        i = bisect_right(nodes, match.end_index, lo=pos, key=lambda node: node.end_idx)
+    result.extend(nodes[i:])
     return result
 
 
-def expand_one_level(scenario: Scenario, evaluator: PatternEvaluator, beam_width: int = 6) -> tuple[bool, list[Scenario]]:
+def _scenarios_from_combos(
+    scenario: Scenario,
+    combos: list[list[PatternMatch]],
+    interner: NodeInterner | None = None,
+) -> list[Scenario]:
     nodes = scenario.root_nodes
-    candidates = find_all_local_patterns(nodes, evaluator)
-    if not candidates:
-        return False, [scenario]
     new_scenarios: list[Scenario] = []
-    for combo in enumerate_non_overlapping_sets(candidates, beam_width=beam_width):
-        new_nodes = collapse_nodes(nodes, combo)
+    for combo in combos:
+        new_nodes = collapse_nodes(nodes, combo, interner)
         new_score = scenario.global_score + sum(pm.score for pm in combo)
         new_scenario = Scenario(
-            id=_new_scenario_id(),
+            id=content_scenario_id(new_nodes),
             root_nodes=new_nodes,
             global_score=new_score,
             status="active",
             invalidation_reasons=list(scenario.invalidation_reasons),
         )
         new_scenarios.append(new_scenario)
-    return True, new_scenarios
+    return new_scenarios
+
+
+def expand_one_level(
+    scenario: Scenario,
+    evaluator: PatternEvaluator,
+    beam_width: int = 6,
+    interner: NodeInterner | None = None,
+    min_end_idx: int | None = None,
+    boundaries: Sequence[int] | None = None,
+) -> tuple[bool, list[Scenario]]:
+    candidates = find_all_local_patterns(scenario.root_nodes, evaluator, min_end_idx, boundaries)
+    if not candidates:
+        return False, [scenario]
+    return True, _scenarios_from_combos(scenario, enumerate_non_overlapping_sets(candidates, beam_width=beam_width), interner)
+
+
+# Parallel expansion: workers only run the pattern search over light copies of the root
+# nodes and return plain tuples; node construction, interning and id assignment stay in
+# the parent, in input order, so results match serial expansion exactly.
+PARALLEL_MIN_NODES = 64  # total root nodes per level below which process hand-off costs more than it saves
+
+# Process pools are created once per worker count and reused by every parallel path
+# (beam expansion, segmented analysis, batch verification) for the life of the process;
+# workers build one evaluator per rule set, keyed by its content hash.
+_executors: dict[int, ProcessPoolExecutor] = {}
+_worker_evaluators: dict[str, PatternEvaluator] = {}
+
+
+def shared_executor(workers: int) -> ProcessPoolExecutor:
+    """The process-wide pool with ``workers`` processes, created on first use."""
+    executor = _executors.get(workers)
+    if executor is None:
+        executor = _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return executor
+
+
+def shutdown_executors() -> None:
+    """Shut down the shared pools (e.g. at application shutdown); later use starts fresh ones."""
+    while _executors:
+        _, executor = _executors.popitem()
+        executor.shutdown()
+
+
+def _evaluator_for(rules_key: str, rules: dict[str, Any]) -> PatternEvaluator:
+    evaluator = _worker_evaluators.get(rules_key)
+    if evaluator is None:
+        evaluator = _worker_evaluators[rules_key] = PatternEvaluator(rules)
+    return evaluator
+
+# (pattern_type, subtype, root position, width, metrics, score, validation, legs); complex
+# corrections carry their eager validation and legs as light matches or connector positions.
+_LightMatch = tuple[str, str | None, int, int, dict[str, float], float, PatternValidation | None, tuple | None]
+
+
+def _light_node(node: WaveNode) -> WaveNode:
+    """Childless copy carrying only what the pattern search reads (price/time magnitudes and direction)."""
+    return WaveNode(
+        id=node.id,
+        level=node.level,
+        degree_label=None,
+        start_idx=node.start_idx,
+        end_idx=node.end_idx,
+        start_time=node.start_time,
+        end_time=node.end_time,
+        high_price=node.high_price,
+        low_price=node.low_price,
+        start_price=node.start_price,
+        end_price=node.end_price,
+        direction=node.direction,
+        pattern_type=node.pattern_type,
+        metrics={"price_change": node.price_change, "abs_price_change": node.abs_price_change, "duration": node.duration},
+    )
+
+
+def _search_worker(payload: tuple[str, dict[str, Any], list[WaveNode], int, int | None, Sequence[int] | None]) -> tuple[bool, list[list[_LightMatch]]]:
+    rules_key, rules, nodes, beam_width, min_end_idx, boundaries = payload
+    candidates = find_all_local_patterns(nodes, _evaluator_for(rules_key, rules), min_end_idx, boundaries)
+    if not candidates:
+        return False, []
+    position = {id(node): i for i, node in enumerate(nodes)}
+    combos = enumerate_non_overlapping_sets(candidates, beam_width=beam_width)
+    return True, [[_to_light(pm, position) for pm in combo] for combo in combos]
+
+
+def _to_light(pm: PatternMatch, position: dict[int, int]) -> _LightMatch:
+    legs = None
+    if pm.legs is not None:
+        legs = tuple(_to_light(leg, position) if isinstance(leg, PatternMatch) else position[id(leg)] for leg in pm.legs)
+    return (pm.pattern_type, pm.subtype, position[id(pm.wave_nodes[0])], len(pm.wave_nodes), pm.metrics, pm.score, pm.validation if legs else None, legs)
+
+
+def _from_light(light: _LightMatch, roots: list[WaveNode], evaluator: PatternEvaluator) -> PatternMatch:
+    ptype, subtype, pos, width, metrics, score, validation, light_legs = light
+    legs = None
+    if light_legs is not None:
+        legs = [roots[leg] if isinstance(leg, int) else _from_light(leg, roots, evaluator) for leg in light_legs]
+    nodes = roots[pos : pos + width]
+    return PatternMatch(ptype, subtype, nodes[0].start_idx, nodes[-1].end_idx, nodes, validation, metrics, score, evaluator, legs)
+
+
+def _expand_parallel(
+    scenarios: list[Scenario],
+    executor: Executor,
+    evaluator: PatternEvaluator,
+    beam_width: int,
+    interner: NodeInterner | None,
+    min_end_idx: int | None = None,
+    boundaries: Sequence[int] | None = None,
+    deadline: float | None = None,
+) -> tuple[bool, list[tuple[bool, list[Scenario]]]]:
+    """Expand ``scenarios`` in the pool; returns whether the deadline passed, and one outcome per scenario.
+
+    Once the deadline passes, scenarios whose expansion has not finished are carried
+    over unchanged and their pending work is cancelled.
+    """
+    rules = evaluator.rule_db
+    rules_key = rules_hash(rules)
+    futures = [
+        executor.submit(_search_worker, (rules_key, rules, [_light_node(node) for node in sc.root_nodes], beam_width, min_end_idx, boundaries))
+        for sc in scenarios
+    ]
+    expired = False
+    outcomes: list[tuple[bool, list[Scenario]]] = []
+    for sc, future in zip(scenarios, futures):
+        if not expired and deadline is not None:
+            expired = not wait([future], timeout=max(deadline - time.monotonic(), 0.0)).done
+        if expired:
+            future.cancel()
+            outcomes.append((False, [sc]))
+            continue
+        found, light_combos = future.result()
+        if not found:
+            outcomes.append((False, [sc]))
+            continue
+        combos = [[_from_light(light, sc.root_nodes, evaluator) for light in light_combo] for light_combo in light_combos]
+        outcomes.append((True, _scenarios_from_combos(sc, combos, interner)))
+    return expired, outcomes
 
 
 def _traverse(nodes: Iterable[WaveNode]) -> Iterable[WaveNode]:
@@ -222,31 +642,21 @@ def _traverse(nodes: Iterable[WaveNode]) -> Iterable[WaveNode]:
             yield from _traverse(node.children)
 
 
-def _group_by_level(nodes: Iterable[WaveNode]) -> dict[int, list[WaveNode]]:
-    grouped: dict[int, list[WaveNode]] = {}
-    for node in _traverse(nodes):
-        grouped.setdefault(node.level, []).append(node)
-    return grouped
-
-
-def _check_similarity_balance(level_nodes: list[WaveNode]) -> float:
-    penalty = 0.0
-    for left, right in zip(level_nodes, level_nodes[1:]):
-        price_ratio = min(left.abs_price_change, right.abs_price_change) / max(left.abs_price_change, right.abs_price_change) if max(left.abs_price_change, right.abs_price_change) else 1.0
-        time_ratio = min(left.duration, right.duration) / max(left.duration, right.duration) if max(left.duration, right.duration) else 1.0
-        if price_ratio < 0.33 and time_ratio < 0.33:
-            penalty += 0.3
-    return penalty
+def _similarity_penalty(left: WaveNode, right: WaveNode) -> float:
+    price_ratio = min(left.abs_price_change, right.abs_price_change) / max(left.abs_price_change, right.abs_price_change) if max(left.abs_price_change, right.abs_price_change) else 1.0
+    time_ratio = min(left.duration, right.duration) / max(left.duration, right.duration) if max(left.duration, right.duration) else 1.0
+    if price_ratio < 0.33 and time_ratio < 0.33:
+        return 0.3
+    return 0.0
 
 
-def _validate_node_internal_structure(node: WaveNode, scenario: Scenario) -> float:
+def _check_internal_structure(node: WaveNode) -> tuple[float, str | None]:
+    """Structure penalty of one node and, when the node breaks its pattern's leg count, the invalidation reason."""
     penalty = 0.0
     ptype = (node.pattern_type or "").lower()
     if ptype == "impulse":
         if len(node.children) != 5:
-            scenario.status = "invalidated"
-            scenario.invalidation_reasons.append("Impulse must have 5 subwaves")
-            return penalty
+            return penalty, "Impulse must have 5 subwaves"
         motive_ok = {"impulse", "terminalimpulse", "monowave"}
         corrective_ok = {"zigzag", "flat", "triangle", "monowave"}
         for idx in (0, 2, 4):
@@ -257,24 +667,24 @@ def _validate_node_internal_structure(node: WaveNode, scenario: Scenario) -> flo
                 penalty += 0.2
     if ptype == "zigzag":
         if len(node.children) != 3:
-            scenario.status = "invalidated"
-            scenario.invalidation_reasons.append("Zigzag must have 3 subwaves")
-            return penalty
+            return penalty, "Zigzag must have 3 subwaves"
         if (node.children[0].pattern_type or "").lower() not in {"impulse", "terminalimpulse", "monowave"}:
             penalty += 0.25
         if (node.children[2].pattern_type or "").lower() not in {"impulse", "terminalimpulse", "monowave"}:
             penalty += 0.25
     if ptype == "flat":
         if len(node.children) != 3:
-            scenario.status = "invalidated"
-            scenario.invalidation_reasons.append("Flat must have 3 subwaves")
-            return penalty
+            return penalty, "Flat must have 3 subwaves"
     if ptype == "triangle":
         if len(node.children) < 5:
-            scenario.status = "invalidated"
-            scenario.invalidation_reasons.append("Triangle must have 5+ legs")
-            return penalty
-    return penalty
+            return penalty, "Triangle must have 5+ legs"
+    if ptype == "doublethree" and len(node.children) != 3:
+        return penalty, "DoubleThree must have 3 subwaves (W-X-Y)"
+    if ptype == "triplethree" and len(node.children) != 5:
+        return penalty, "TripleThree must have 5 subwaves (W-X-Y-X-Z)"
+    if ptype == "diametric" and len(node.children) != 7:
+        return penalty, "Diametric must have 7 legs"
+    return penalty, None
 
 
 def _check_thermodynamic_balance(node: WaveNode) -> float:
@@ -290,68 +700,684 @@ def _check_thermodynamic_balance(node: WaveNode) -> float:
     return 0.0
 
 
-def validate_and_score_scenario(scenario: Scenario) -> Scenario:
-    penalty = 0.0
-    penalty += 0.05 * len(scenario.root_nodes)
-    grouped = _group_by_level(scenario.root_nodes)
-    for level_nodes in grouped.values():
-        penalty += _check_similarity_balance(sorted(level_nodes, key=lambda n: n.start_idx))
+@dataclass(slots=True)
+class SubtreeScore:
+    """Scenario-independent score components of one subtree.
+
+    ``edges`` maps each level present in the subtree to its first and last node, so
+    the similarity penalty between neighbouring subtrees can be added when they are joined.
+    """
+
+    penalty: float  # structure + thermodynamic penalties
+    similarity: float  # similarity penalties between adjacent same-level nodes inside the subtree
+    base: float  # sum of clamped node scores
+    reasons: tuple[str, ...]  # invalidation reasons in pre-order
+    edges: dict[int, tuple[WaveNode, WaveNode]]
+
+
+def _join_edges(edges: dict[int, tuple[WaveNode, WaveNode]], right: dict[int, tuple[WaveNode, WaveNode]]) -> float:
+    """Append ``right`` to ``edges`` in place, returning the similarity penalty across the seam."""
+    similarity = 0.0
+    for level, (first, last) in right.items():
+        current = edges.get(level)
+        if current is None:
+            edges[level] = (first, last)
+        else:
+            similarity += _similarity_penalty(current[1], first)
+            edges[level] = (current[0], last)
+    return similarity
+
+
+class ScenarioScorer:
+    """Fused scenario scorer: one post-order pass per subtree, memoized per node identity.
 
-    for node in _traverse(scenario.root_nodes):
-        penalty += _validate_node_internal_structure(node, scenario)
+    Scenarios expanded through a ``NodeInterner`` share subtrees, so scoring a
+    sibling scenario only visits nodes not seen before plus one join over its roots.
+    Nodes must not be mutated while they are cached; the scorer keeps a reference to
+    every node it scored so identities stay valid.
+    """
+
+    def __init__(self) -> None:
+        self._memo: dict[int, tuple[WaveNode, SubtreeScore]] = {}
+        self.hits = 0
+
+    def subtree(self, node: WaveNode) -> SubtreeScore:
+        cached = self._memo.get(id(node))
+        if cached is not None:
+            self.hits += 1
+            return cached[1]
+        penalty, reason = _check_internal_structure(node)
         penalty += _check_thermodynamic_balance(node)
+        similarity = 0.0
+        base = max(node.score, 0.0)
+        reasons: tuple[str, ...] = (reason,) if reason is not None else ()
+        edges: dict[int, tuple[WaveNode, WaveNode]] = {node.level: (node, node)}
+        for child in node.children:
+            part = self.subtree(child)
+            penalty += part.penalty
+            similarity += part.similarity + _join_edges(edges, part.edges)
+            base += part.base
+            reasons += part.reasons
+        result = SubtreeScore(penalty, similarity, base, reasons, edges)
+        self._memo[id(node)] = (node, result)
+        return result
+
+    def score(self, scenario: Scenario) -> Scenario:
+        penalty = 0.05 * len(scenario.root_nodes)
+        base = 0.0
+        edges: dict[int, tuple[WaveNode, WaveNode]] = {}
+        for root in scenario.root_nodes:
+            part = self.subtree(root)
+            penalty += part.penalty + part.similarity + _join_edges(edges, part.edges)
+            base += part.base
+            if part.reasons:
+                scenario.status = "invalidated"
+                scenario.invalidation_reasons.extend(part.reasons)
+        scenario.global_score = base + penalty
+        if scenario.status != "active":
+            scenario.global_score += 10.0
+        return scenario
+
+
+def validate_and_score_scenario(scenario: Scenario, scorer: ScenarioScorer | None = None) -> Scenario:
+    """Apply structural penalties and invalidations to ``scenario`` and set its ``global_score``.
+
+    Pass a shared ``scorer`` to reuse subtree results across scenarios of one run.
+    """
+    return (scorer if scorer is not None else ScenarioScorer()).score(scenario)
+
 
-    base_score = sum(max(node.score, 0.0) for node in _traverse(scenario.root_nodes))
-    scenario.global_score = base_score + penalty
-    if scenario.status != "active":
-        scenario.global_score += 10.0
-    return scenario
+def _node_signature(node: WaveNode, memo: dict[int, tuple]) -> tuple:
+    cached = memo.get(id(node))
+    if cached is None:
+        children = tuple(_node_signature(child, memo) for child in node.children)
+        cached = memo[id(node)] = (node.start_idx, node.end_idx, node.pattern_type, node.pattern_subtype, children)
+    return cached
+
+
+def scenario_signature(scenario: Scenario, memo: dict[int, tuple] | None = None) -> tuple:
+    """Canonical structure of a scenario: spans and pattern types of its roots and their subtrees."""
+    memo = {} if memo is None else memo
+    return tuple(_node_signature(root, memo) for root in scenario.root_nodes)
+
+
+def dedupe_scenarios(scenarios: list[Scenario]) -> list[Scenario]:
+    """Merge structurally identical scenarios, keeping the best (lowest) score of each.
+
+    The first occurrence of a structure keeps its position; ties keep the earlier scenario.
+    """
+    memo: dict[int, tuple] = {}
+    best: dict[tuple, Scenario] = {}
+    for sc in scenarios:
+        signature = scenario_signature(sc, memo)
+        current = best.get(signature)
+        if current is None or sc.global_score < current.global_score:
+            best[signature] = sc
+    return list(best.values())
 
 
 def prune_scenarios(scenarios: list[Scenario], beam_width: int = 6) -> list[Scenario]:
     return sorted(scenarios, key=lambda sc: sc.global_score)[:beam_width]
 
 
-def analyze_market_structure(
-    monowaves: Sequence[Monowave],
-    rule_db: dict[str, Any] | None = None,
-    beam_width: int = 6,
+@dataclass(slots=True)
+class AnalysisReport:
+    """Iteration and timing summary of one search run."""
+
+    iterations: int = 0
+    expansions: int = 0
+    states: int = 0  # scenarios generated by expansions
+    elapsed_ms: float = 0.0
+    iteration_ms: list[float] = field(default_factory=list)
+    time_budget_ms: float | None = None
+    partial: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "iterations": self.iterations,
+            "expansions": self.expansions,
+            "states": self.states,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "iteration_ms": [round(ms, 3) for ms in self.iteration_ms],
+            "time_budget_ms": self.time_budget_ms,
+            "partial": self.partial,
+        }
+
+
+class WaveIndex:
+    """Lookups precomputed in one walk over a scenario tree: id → node, level → nodes by start, level counts."""
+
+    __slots__ = ("by_id", "by_level", "counts")
+
+    def __init__(self, root_nodes: Sequence[WaveNode]):
+        self.by_id: dict[int, WaveNode] = {}
+        self.by_level: dict[int, list[WaveNode]] = {}
+        for node in _traverse(root_nodes):
+            self.by_id.setdefault(node.id, node)
+            self.by_level.setdefault(node.level, []).append(node)
+        for nodes in self.by_level.values():
+            nodes.sort(key=lambda n: n.start_idx)
+        self.counts: dict[int, int] = {level: len(nodes) for level, nodes in self.by_level.items()}
+
+    def find(self, node_id: int) -> WaveNode | None:
+        return self.by_id.get(node_id)
+
+    def level_nodes(self, level: int) -> list[WaveNode]:
+        return list(self.by_level.get(level, ()))
+
+    def view_level(self, target_wave_count: int) -> int | None:
+        if not self.counts:
+            return None
+        return min(self.counts, key=lambda lvl: abs(self.counts[lvl] - target_wave_count))
+
+    def view_nodes(self, target_wave_count: int) -> list[WaveNode]:
+        level = self.view_level(target_wave_count)
+        return [] if level is None else self.level_nodes(level)
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    scenarios: list[Scenario]
+    report: AnalysisReport
+    indexes: dict[int, WaveIndex] = field(default_factory=dict)  # scenario id -> index, built on first use
+
+    def index(self, scenario: Scenario) -> WaveIndex:
+        """The scenario's ``WaveIndex``, built lazily and cached."""
+        index = self.indexes.get(scenario.id)
+        if index is None:
+            index = self.indexes[scenario.id] = WaveIndex(scenario.root_nodes)
+        return index
+
+
+def _resolve_deadline(time_budget_ms: float | None, deadline: float | None) -> float | None:
+    """Combine a relative budget and an absolute ``time.monotonic()`` deadline; the earlier wins."""
+    if time_budget_ms is None:
+        return deadline
+    budget_deadline = time.monotonic() + time_budget_ms / 1000.0
+    return budget_deadline if deadline is None else min(deadline, budget_deadline)
+
+
+def _search(
+    scenarios: list[Scenario],
+    evaluator: PatternEvaluator,
+    rules: dict[str, Any],
+    beam_width: int,
+    workers: int = 0,
+    min_end_idx: int | None = None,
+    deadline: float | None = None,
+    report: AnalysisReport | None = None,
+    boundaries: Sequence[int] | None = None,
+    executor: Executor | None = None,
 ) -> list[Scenario]:
-    if not monowaves:
-        return []
-    nodes = wrap_monowaves(monowaves)
-    evaluator = PatternEvaluator(load_rule_db(rule_db) if rule_db is not None else RULE_DB)
-    scenarios: list[Scenario] = [Scenario(id=_new_scenario_id(), root_nodes=nodes, global_score=0.0, status="active", invalidation_reasons=[])]
+    """Expand and prune the beam until no scenario changes (or the deadline passes), then validate and rank.
 
+    When the deadline passes, scenarios not yet expanded on the current level are carried
+    over unchanged and the best-so-far beam is validated and marked ``partial``. Parallel
+    levels run in ``executor``, or the shared pool for ``workers`` when none is given.
+    """
+    report = report if report is not None else AnalysisReport()
+    started = time.perf_counter()
+    interner = NodeInterner()
+    parallel = workers > 1 and evaluator.profiler is None
+    partial = False
     while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            partial = True
+            break
+        level_started = time.perf_counter()
+        expired = False
         any_changed = False
         new_scenarios: list[Scenario] = []
-        for sc in scenarios:
-            changed, expanded = expand_one_level(sc, evaluator, beam_width=beam_width)
-            if changed:
-                any_changed = True
-                new_scenarios.extend(expanded)
-            else:
-                new_scenarios.append(sc)
-        scenarios = prune_scenarios(new_scenarios, beam_width=beam_width)
+        if parallel and sum(len(sc.root_nodes) for sc in scenarios) >= PARALLEL_MIN_NODES:
+            pool = executor if executor is not None else shared_executor(workers)
+            expired, outcomes = _expand_parallel(scenarios, pool, evaluator, beam_width, interner, min_end_idx, boundaries, deadline)
+        else:
+            outcomes = []
+            for sc in scenarios:
+                if deadline is not None and time.monotonic() >= deadline:
+                    expired = True
+                    outcomes.append((False, [sc]))
+                    continue
+                outcomes.append(expand_one_level(sc, evaluator, beam_width=beam_width, interner=interner, min_end_idx=min_end_idx, boundaries=boundaries))
+        for changed, expanded in outcomes:
+            any_changed = any_changed or changed
+            report.expansions += int(changed)
+            report.states += len(expanded) if changed else 0
+            new_scenarios.extend(expanded)
+        scenarios = prune_scenarios(dedupe_scenarios(new_scenarios), beam_width=beam_width)
+        report.iterations += 1
+        report.iteration_ms.append((time.perf_counter() - level_started) * 1000.0)
+        if expired:
+            partial = True
+            break
         if not any_changed:
             break
 
-    validated = [validate_and_score_scenario(sc) for sc in scenarios]
+    scorer = ScenarioScorer()
+    validated = [validate_and_score_scenario(sc, scorer) for sc in scenarios]
+    for sc in validated:
+        sc.partial = partial
+    report.partial = partial
+    report.elapsed_ms = (time.perf_counter() - started) * 1000.0
     return sorted(validated, key=lambda sc: sc.global_score)
 
 
-def collect_level_nodes(root_nodes: Sequence[WaveNode], level: int) -> list[WaveNode]:
-    collected: list[WaveNode] = []
+class SearchStrategy:
+    """How the space of pattern collapses is explored; see ``BeamSearch`` and ``BestFirstSearch``.
 
-    def _walk(node: WaveNode) -> None:
-        if node.level == level:
-            collected.append(node)
-        for child in node.children:
-            _walk(child)
+    ``search`` receives the seed scenarios and returns validated scenarios, best first,
+    filling in ``report``. ``beam_width`` is both the number of combinations expanded
+    per scenario and the number of scenarios returned. ``min_end_idx`` and
+    ``boundaries`` restrict the windows tried (see ``find_all_local_patterns``);
+    ``executor`` overrides the shared process pool used when ``workers`` > 1.
+    """
+
+    name = ""
+
+    def search(
+        self,
+        scenarios: list[Scenario],
+        evaluator: PatternEvaluator,
+        rules: dict[str, Any],
+        beam_width: int,
+        workers: int = 0,
+        min_end_idx: int | None = None,
+        deadline: float | None = None,
+        report: AnalysisReport | None = None,
+        boundaries: Sequence[int] | None = None,
+        executor: Executor | None = None,
+    ) -> list[Scenario]:
+        raise NotImplementedError
+
+
+class BeamSearch(SearchStrategy):
+    """Level-synchronous beam: every member is expanded each pass, then the beam is pruned by score."""
+
+    name = "beam"
+
+    def search(
+        self,
+        scenarios: list[Scenario],
+        evaluator: PatternEvaluator,
+        rules: dict[str, Any],
+        beam_width: int,
+        workers: int = 0,
+        min_end_idx: int | None = None,
+        deadline: float | None = None,
+        report: AnalysisReport | None = None,
+        boundaries: Sequence[int] | None = None,
+        executor: Executor | None = None,
+    ) -> list[Scenario]:
+        return _search(scenarios, evaluator, rules, beam_width, workers, min_end_idx, deadline, report, boundaries, executor)
+
+
+# Cheapest collapse per root removed: an Impulse match (bias 0.02) turns five roots into one.
+_MIN_COLLAPSE_COST_PER_ROOT = 0.02 / 4
+# Default inflation of the root collapse estimate. On zigzag inputs of 20-160 monowaves
+# this generates fewer states than the default beam and finds scenarios at least as good;
+# below ~15 the open list floods before the first scenario is fully collapsed.
+BEST_FIRST_WEIGHT = 20.0
+
+
+class BestFirstSearch(SearchStrategy):
+    """A*-style search: a priority queue of partial scenarios ordered by a lower bound of their final score.
+
+    The bound of a partial scenario is what no descendant can avoid: node scores and
+    structure/thermodynamic penalties of its existing nodes (they persist as subtrees),
+    the invalidation surcharge, and the cheapest possible way of collapsing its roots
+    (the 0.05 root penalty against the cheapest match cost per root removed). A fully
+    collapsed scenario is queued with its exact final score; the search stops once
+    ``beam_width`` of them have been popped. Structures reached twice are expanded once.
+    ``max_expansions`` caps the work; on the cap or the deadline the best queued
+    scenarios fill the result, marked ``partial``.
+
+    Only with ``weight=1.0`` is the bound admissible, so that each popped scenario is
+    proven best. That exact search grows exponentially with input size, because the
+    bound is loose (cheap Impulse collapses could in principle remove every root). The
+    default therefore inflates the root collapse estimate by ``BEST_FIRST_WEIGHT``
+    (weighted A*): popped scenarios score at most ``weight`` times the best, and the
+    search dives toward collapsed scenarios, generating fewer states than the beam.
+
+    With ``workers > 1`` the ``workers`` best open scenarios are popped together and
+    expanded in ``executor`` (or the shared pool), as ``BeamSearch`` expands a level.
+    Popping stops at a collapsed scenario, so the pops stay in bound order.
+    """
+
+    name = "best_first"
+
+    def __init__(self, max_expansions: int = 5000, weight: float = BEST_FIRST_WEIGHT):
+        self.max_expansions = max_expansions
+        self.weight = weight
+
+    def search(
+        self,
+        scenarios: list[Scenario],
+        evaluator: PatternEvaluator,
+        rules: dict[str, Any],
+        beam_width: int,
+        workers: int = 0,
+        min_end_idx: int | None = None,
+        deadline: float | None = None,
+        report: AnalysisReport | None = None,
+        boundaries: Sequence[int] | None = None,
+        executor: Executor | None = None,
+    ) -> list[Scenario]:
+        report = report if report is not None else AnalysisReport()
+        started = time.perf_counter()
+        interner = NodeInterner()
+        scorer = ScenarioScorer()
+        memo: dict[int, tuple] = {}
+        seen: set[tuple] = set()
+        queue: list[tuple[float, int, bool, Scenario]] = []
+        order = 0
+
+        def push(sc: Scenario, final: bool) -> None:
+            nonlocal order
+            heapq.heappush(queue, (sc.global_score if final else self._priority(sc, scorer), order, final, sc))
+            order += 1
+
+        for sc in scenarios:
+            signature = scenario_signature(sc, memo)
+            if signature not in seen:
+                seen.add(signature)
+                push(sc, final=False)
+        batch_size = workers if workers > 1 and evaluator.profiler is None else 1
+        results: list[Scenario] = []
+        partial = False
+        while queue and len(results) < beam_width:
+            if (deadline is not None and time.monotonic() >= deadline) or report.iterations >= self.max_expansions:
+                partial = True
+                break
+            if queue[0][2]:
+                results.append(heapq.heappop(queue)[3])
+                continue
+            batch: list[Scenario] = []
+            while queue and not queue[0][2] and len(batch) < min(batch_size, self.max_expansions - report.iterations):
+                batch.append(heapq.heappop(queue)[3])
+            report.iterations += len(batch)
+            if len(batch) > 1 and sum(len(sc.root_nodes) for sc in batch) >= PARALLEL_MIN_NODES:
+                pool = executor if executor is not None else shared_executor(workers)
+                expired, outcomes = _expand_parallel(batch, pool, evaluator, beam_width, interner, min_end_idx, boundaries, deadline)
+            else:
+                expired = False
+                outcomes = [expand_one_level(sc, evaluator, beam_width=beam_width, interner=interner, min_end_idx=min_end_idx, boundaries=boundaries) for sc in batch]
+            for sc, (changed, expanded) in zip(batch, outcomes):
+                if not changed:
+                    if expired:  # unfinished expansions come back unchanged; keep them open
+                        push(sc, final=False)
+                    else:
+                        push(scorer.score(sc), final=True)
+                    continue
+                report.expansions += 1
+                report.states += len(expanded)
+                for child in expanded:
+                    signature = scenario_signature(child, memo)
+                    if signature not in seen:
+                        seen.add(signature)
+                        push(child, final=False)
+            if expired:
+                partial = True
+                break
+        if partial:
+            while queue and len(results) < beam_width:
+                _, _, final, sc = heapq.heappop(queue)
+                results.append(sc if final else scorer.score(sc))
+            for sc in results:
+                sc.partial = True
+        report.partial = partial
+        report.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        return sorted(results, key=lambda sc: sc.global_score)
+
+    def _priority(self, scenario: Scenario, scorer: ScenarioScorer) -> float:
+        parts = [scorer.subtree(root) for root in scenario.root_nodes]
+        bound = sum(part.base + part.penalty for part in parts)
+        if scenario.status != "active" or any(part.reasons for part in parts):
+            bound += 10.0
+        return bound + self.weight * (0.05 + _MIN_COLLAPSE_COST_PER_ROOT * (len(parts) - 1))
+
+
+SEARCH_STRATEGIES: dict[str, type[SearchStrategy]] = {"beam": BeamSearch, "best_first": BestFirstSearch}
+
+
+def resolve_strategy(strategy: SearchStrategy | str | None) -> SearchStrategy:
+    if strategy is None:
+        return BeamSearch()
+    if isinstance(strategy, SearchStrategy):
+        return strategy
+    try:
+        return SEARCH_STRATEGIES[strategy]()
+    except KeyError:
+        raise ValueError(f"Unknown search strategy: {strategy!r} (expected one of {sorted(SEARCH_STRATEGIES)})") from None
+
+
+def run_analysis(
+    monowaves: Sequence[Monowave],
+    rule_db: dict[str, Any] | None = None,
+    beam_width: int = 6,
+    profiler: RuleProfiler | None = None,
+    workers: int = 0,
+    time_budget_ms: float | None = None,
+    deadline: float | None = None,
+    report: AnalysisReport | None = None,
+    strategy: SearchStrategy | str | None = None,
+    executor: Executor | None = None,
+) -> AnalysisResult:
+    """Search over pattern collapses, returning scenarios plus a run report.
+
+    ``strategy`` is a ``SearchStrategy`` or one of ``SEARCH_STRATEGIES`` ("beam", the
+    default level-synchronous beam, or "best_first").
+
+    With the beam, ``workers`` > 1 expands members in a process pool once a level has at least
+    ``PARALLEL_MIN_NODES`` root nodes; smaller levels, and runs with a profiler attached,
+    stay serial. Results are identical to serial mode. The pool is ``executor`` when given,
+    else the process-wide one from ``shared_executor``.
+
+    ``time_budget_ms`` (relative) and ``deadline`` (absolute, ``time.monotonic()``) bound
+    the search; on expiry the best-so-far scenarios are returned with ``partial`` set.
+    Pass ``report`` to have an existing ``AnalysisReport`` filled in.
+    """
+    search = resolve_strategy(strategy)
+    report = report if report is not None else AnalysisReport()
+    report.time_budget_ms = time_budget_ms
+    if not monowaves:
+        return AnalysisResult([], report)
+    nodes = wrap_monowaves(monowaves)
+    rules = load_rule_db(rule_db) if rule_db is not None else RULE_DB
+    evaluator = PatternEvaluator(rules, profiler=profiler)
+    scenarios: list[Scenario] = [Scenario(id=content_scenario_id(nodes), root_nodes=nodes, global_score=0.0, status="active", invalidation_reasons=[])]
+    limit = _resolve_deadline(time_budget_ms, deadline)
+    scenarios = search.search(scenarios, evaluator, rules, beam_width, workers, deadline=limit, report=report, executor=executor)
+    return AnalysisResult(scenarios, report)
+
+
+def analyze_market_structure(
+    monowaves: Sequence[Monowave],
+    rule_db: dict[str, Any] | None = None,
+    beam_width: int = 6,
+    profiler: RuleProfiler | None = None,
+    workers: int = 0,
+    time_budget_ms: float | None = None,
+    deadline: float | None = None,
+    strategy: SearchStrategy | str | None = None,
+    executor: Executor | None = None,
+) -> list[Scenario]:
+    """Scenarios only; see ``run_analysis`` for the parameters and the run report."""
+    return run_analysis(
+        monowaves,
+        rule_db=rule_db,
+        beam_width=beam_width,
+        profiler=profiler,
+        workers=workers,
+        time_budget_ms=time_budget_ms,
+        deadline=deadline,
+        strategy=strategy,
+        executor=executor,
+    ).scenarios
+
+
+def _leaf_key(node: WaveNode | Monowave) -> tuple[int, int, float, float]:
+    return (node.start_idx, node.end_idx, node.start_price, node.end_price)
+
+
+def _leaf_count(node: WaveNode) -> int:
+    return sum(_leaf_count(child) for child in node.children) if node.children else 1
+
+
+def analyze_incremental(
+    previous: Sequence[Scenario],
+    monowaves: Sequence[Monowave],
+    rule_db: dict[str, Any] | None = None,
+    beam_width: int = 6,
+    profiler: RuleProfiler | None = None,
+    workers: int = 0,
+    time_budget_ms: float | None = None,
+    strategy: SearchStrategy | str | None = None,
+    executor: Executor | None = None,
+) -> list[Scenario]:
+    """Re-analyze after monowaves were appended (or the last ones revised) at the right edge.
+
+    ``previous`` is a completed ``analyze_market_structure`` result for an earlier
+    version of the sequence. The longest run of unchanged leading monowaves is found,
+    every root that lies entirely inside it is reused as-is, and the search is seeded
+    with those roots followed by fresh leaves for the rest. Windows made only of reused
+    roots are skipped: the previous run already found no pattern among them. Falls back
+    to a full analysis when nothing can be reused. A ``partial`` previous result is
+    reused too, but without window skipping since it may not have converged.
+    """
+    if not monowaves:
+        return []
+    if not previous:
+        return analyze_market_structure(monowaves, rule_db=rule_db, beam_width=beam_width, profiler=profiler, workers=workers, time_budget_ms=time_budget_ms, strategy=strategy, executor=executor)
 
-    for root in root_nodes:
-        _walk(root)
+    old_leaves = collect_level_nodes(previous[0].root_nodes, level=0)
+    unchanged = 0
+    for old, new in zip(old_leaves, monowaves):
+        if _leaf_key(old) != _leaf_key(new):
+            break
+        unchanged += 1
+    if unchanged == 0:
+        return analyze_market_structure(monowaves, rule_db=rule_db, beam_width=beam_width, profiler=profiler, workers=workers, time_budget_ms=time_budget_ms, strategy=strategy, executor=executor)
+    boundary = old_leaves[unchanged - 1].end_idx
+
+    rules = load_rule_db(rule_db) if rule_db is not None else RULE_DB
+    evaluator = PatternEvaluator(rules, profiler=profiler)
+    seeds: list[Scenario] = []
+    kept_ends: list[int | None] = []
+    for sc in previous:
+        kept: list[WaveNode] = []
+        for root in sc.root_nodes:
+            if root.end_idx > boundary:
+                break
+            kept.append(root)
+        covered = sum(_leaf_count(root) for root in kept)
+        leaves = wrap_monowaves(monowaves[covered:])
+        seed_score = sum(max(node.score, 0.0) for node in _traverse(kept))
+        seeds.append(Scenario(id=content_scenario_id(kept + leaves), root_nodes=kept + leaves, global_score=seed_score, status="active", invalidation_reasons=[]))
+        kept_ends.append(kept[-1].end_idx if kept else None)
+    # Skipping is exact per seed up to its own reused prefix; use the most conservative one.
+    frozen_end = None if None in kept_ends or any(sc.partial for sc in previous) else min(kept_ends)
+    seeds = prune_scenarios(dedupe_scenarios(seeds), beam_width=beam_width)
+    deadline = _resolve_deadline(time_budget_ms, None)
+    return resolve_strategy(strategy).search(seeds, evaluator, rules, beam_width, workers, min_end_idx=frozen_end, deadline=deadline, executor=executor)
+
+
+SEGMENT_SIZE = 60  # monowaves per segment in analyze_segmented
+
+
+def segment_boundaries(monowaves: Sequence[Monowave], segment_size: int = SEGMENT_SIZE) -> list[int]:
+    """Exclusive end positions of segments cut after major pivots.
+
+    Around every multiple of ``segment_size`` the strongest pivot (per
+    ``identify_major_pivots``) within a quarter segment either side ends the segment,
+    so segments stay between roughly half and one and a half ``segment_size`` long.
+    """
+    if segment_size <= 0:
+        raise ValueError(f"segment_size must be positive, got {segment_size}")
+    n = len(monowaves)
+    if n <= segment_size:
+        return [n]
+    rank = {idx: r for r, idx in enumerate(identify_major_pivots(monowaves, max_pivots=n))}
+    slack = max(segment_size // 4, 1)
+    cuts: list[int] = []
+    start = 0
+    while n - start > segment_size + slack:
+        target = start + segment_size
+        candidates = range(max(target - slack, start + 1), min(target + slack, n - 1))
+        pivot = min(candidates, key=lambda idx: rank[idx]) if candidates else target - 1
+        cuts.append(pivot + 1)
+        start = pivot + 1
+    return cuts + [n]
+
+
+def _analyze_segment(payload: tuple[Sequence[Monowave], dict[str, Any], int, SearchStrategy | str | None, float | None]) -> list[Scenario]:
+    segment, rules, beam_width, strategy, deadline = payload
+    return run_analysis(segment, rule_db=rules, beam_width=beam_width, deadline=deadline, strategy=strategy).scenarios
+
+
+def _stitch(segment_results: list[list[Scenario]], k: int) -> list[list[Scenario]]:
+    """The ``k`` lowest-score picks of one scenario per segment (exact: sums keep their order)."""
+    picks: list[tuple[float, list[Scenario]]] = [(0.0, [])]
+    for scenarios in segment_results:
+        extended = [(score + sc.global_score, chosen + [sc]) for score, chosen in picks for sc in scenarios]
+        picks = heapq.nsmallest(k, extended, key=lambda item: item[0])
+    return [chosen for _, chosen in picks]
+
+
+def analyze_segmented(
+    monowaves: Sequence[Monowave],
+    rule_db: dict[str, Any] | None = None,
+    beam_width: int = 6,
+    segment_size: int = SEGMENT_SIZE,
+    workers: int = 0,
+    profiler: RuleProfiler | None = None,
+    time_budget_ms: float | None = None,
+    strategy: SearchStrategy | str | None = None,
+    executor: Executor | None = None,
+) -> list[Scenario]:
+    """Analyze a long sequence as segments cut at major pivots, then stitch the segments at the top level.
+
+    Segments (see ``segment_boundaries``) are analyzed independently, in ``executor`` (or
+    the shared process pool) when ``workers`` > 1 and no profiler is attached. The ``beam_width`` best combinations
+    of one scenario per segment seed a final search over the concatenated roots, which
+    only tries windows with a segment boundary strictly inside them: a converged
+    segment's roots admit no pattern on their own, and every node built by the final
+    search crosses a boundary itself. When any segment result is partial that does not
+    hold, so every window is tried. Patterns spanning a boundary below the top level are
+    not found, the price of runtime scaling with segment size.
+    """
+    bounds = segment_boundaries(monowaves, segment_size)
+    if len(bounds) <= 1:
+        return analyze_market_structure(monowaves, rule_db=rule_db, beam_width=beam_width, profiler=profiler, workers=workers, time_budget_ms=time_budget_ms, strategy=strategy, executor=executor)
+    rules = load_rule_db(rule_db) if rule_db is not None else RULE_DB
+    deadline = _resolve_deadline(time_budget_ms, None)
+    segments = [monowaves[start:end] for start, end in zip([0] + bounds[:-1], bounds)]
+    payloads = [(segment, rules, beam_width, strategy, deadline) for segment in segments]
+    if workers > 1 and profiler is None:
+        pool = executor if executor is not None else shared_executor(workers)
+        segment_results = list(pool.map(_analyze_segment, payloads))
+    else:
+        segment_results = [
+            run_analysis(segment, rule_db=rules, beam_width=beam_width, profiler=profiler, deadline=deadline, strategy=strategy).scenarios
+            for segment in segments
+        ]
+
+    seeds: list[Scenario] = []
+    for chosen in _stitch(segment_results, beam_width):
+        roots = [root for sc in chosen for root in sc.root_nodes]
+        seed_score = sum(max(node.score, 0.0) for node in _traverse(roots))
+        seeds.append(Scenario(id=content_scenario_id(roots), root_nodes=roots, global_score=seed_score, status="active", invalidation_reasons=[]))
+    partial = any(sc.partial for result in segment_results for sc in result)
+    crossing = None if partial else [monowaves[end - 1].end_idx for end in bounds[:-1]]
+    evaluator = PatternEvaluator(rules, profiler=profiler)
+    stitched = resolve_strategy(strategy).search(dedupe_scenarios(seeds), evaluator, rules, beam_width, deadline=deadline, boundaries=crossing)
+    if partial:
+        for sc in stitched:
+            sc.partial = True
+    return stitched
+
+
+def collect_level_nodes(root_nodes: Sequence[WaveNode], level: int) -> list[WaveNode]:
+    collected = [node for node in _traverse(root_nodes) if node.level == level]
     return sorted(collected, key=lambda n: n.start_idx)
 
 
@@ -363,11 +1389,8 @@ def count_nodes_by_level(root_nodes: Sequence[WaveNode]) -> dict[int, int]:
 
 
 def get_view_nodes(root_nodes: Sequence[WaveNode], target_wave_count: int) -> list[WaveNode]:
-    counts = count_nodes_by_level(root_nodes)
-    if not counts:
-        return []
-    best_level = min(counts.keys(), key=lambda lvl: abs(counts[lvl] - target_wave_count))
-    return collect_level_nodes(root_nodes, level=best_level)
+    """One-off view selection; reuse a ``WaveIndex`` when querying the same tree repeatedly."""
+    return WaveIndex(root_nodes).view_nodes(target_wave_count)
 
 
 def find_node_by_id(root_nodes: Sequence[WaveNode], node_id: int) -> WaveNode | None:
@@ -377,88 +1400,237 @@ def find_node_by_id(root_nodes: Sequence[WaveNode], node_id: int) -> WaveNode |
     return None
 
 
+# Pattern -> (number of legs, matcher) for goal-directed verification.
+_VERIFY_TARGETS: dict[str, tuple[int, Any]] = {
+    "Impulse": (5, try_impulse),
+    "Triangle": (5, try_triangle),
+    "Zigzag": (3, try_zigzag),
+    "Flat": (3, try_flat),
+}
+VERIFY_CHAINS = 4  # best leg chains (by summed subtree value) kept per chart cell
+VERIFY_MAX_LEAVES = 40  # larger windows go straight to the full analysis
+
+
+class GoalParser:
+    """Top-down chart parser answering "can leaves[i:j] reduce to one ``ptype`` node?".
+
+    A span is split into the pattern's number of legs; every leg must itself be a
+    single leaf or reduce to some pattern, and neighbouring legs must alternate in
+    direction. Each chart cell (legs, i, j) is computed once and keeps the
+    ``VERIFY_CHAINS`` best leg chains per first-leg direction, ranked by the summed
+    pattern scores of the legs' subtrees (leaves count zero). The pattern is matched
+    on those chains and the lowest total wins, so results do not depend on search
+    order; they are exact while a cell has no more chains than the cap (short windows)
+    and a beam approximation beyond. Span and match results are memoized too.
+    """
+
+    def __init__(self, monowaves: Sequence[Monowave], evaluator: PatternEvaluator):
+        self.leaves = [WaveNode.from_monowave(mw) for mw in monowaves]
+        self.evaluator = evaluator
+        self._nodes: dict[tuple[int, int], tuple[float, WaveNode] | None] = {}
+        self._matches: dict[tuple[str, int, int], tuple[float, PatternMatch] | None] = {}
+        self._chains: dict[tuple[int, int, int], dict[str | None, list[tuple[float, tuple[WaveNode, ...]]]]] = {}
+
+    def _direction(self, i: int, j: int) -> str | None:
+        if j - i == 1:
+            return self.leaves[i].direction
+        return infer_net_direction((self.leaves[i], self.leaves[j - 1]))
+
+    def node(self, i: int, j: int) -> WaveNode | None:
+        """The best node covering ``leaves[i:j]`` (the leaf itself for one monowave), or None."""
+        entry = self._best_node(i, j)
+        return entry[1] if entry is not None else None
+
+    def match(self, ptype: str, i: int, j: int) -> PatternMatch | None:
+        """The best ``ptype`` parse of ``leaves[i:j]``, or None."""
+        entry = self.best_match(ptype, i, j)
+        return entry[1] if entry is not None else None
+
+    def best_match(self, ptype: str, i: int, j: int) -> tuple[float, PatternMatch] | None:
+        """(summed subtree pattern score, match) of the best ``ptype`` parse of ``leaves[i:j]``."""
+        key = (ptype, i, j)
+        if key not in self._matches:
+            legs, matcher = _VERIFY_TARGETS[ptype]
+            best: tuple[float, PatternMatch] | None = None
+            if j - i >= legs:
+                for chains in self._leg_chains(legs, i, j).values():
+                    for value, window in chains:
+                        pm = matcher(list(window), self.evaluator)
+                        if pm is not None and (best is None or value + pm.score < best[0]):
+                            best = (value + pm.score, pm)
+            self._matches[key] = best
+        return self._matches[key]
+
+    def _best_node(self, i: int, j: int) -> tuple[float, WaveNode] | None:
+        if j - i == 1:
+            return 0.0, self.leaves[i]
+        key = (i, j)
+        if key not in self._nodes:
+            best: tuple[float, PatternMatch] | None = None
+            for ptype in _VERIFY_TARGETS:
+                entry = self.best_match(ptype, i, j)
+                if entry is not None and (best is None or entry[0] < best[0]):
+                    best = entry
+            self._nodes[key] = (best[0], build_wavenode_from_match(best[1])) if best is not None else None
+        return self._nodes[key]
+
+    def _leg_chains(self, legs: int, i: int, j: int) -> dict[str | None, list[tuple[float, tuple[WaveNode, ...]]]]:
+        """Best splits of ``leaves[i:j]`` into ``legs`` alternating reducible legs, keyed by the first leg's direction."""
+        key = (legs, i, j)
+        cell = self._chains.get(key)
+        if cell is None:
+            cell = {}
+            for cut in [j] if legs == 1 else range(i + 1, j - legs + 2):
+                head = self._best_node(i, cut)
+                if head is None:
+                    continue
+                direction = self._direction(i, cut)
+                if legs == 1:
+                    options = [(head[0], (head[1],))]
+                else:
+                    options = [
+                        (head[0] + value, (head[1],) + rest)
+                        for tail_direction, tails in self._leg_chains(legs - 1, cut, j).items()
+                        if tail_direction != direction
+                        for value, rest in tails
+                    ]
+                cell.setdefault(direction, []).extend(options)
+            for options in cell.values():
+                options.sort(key=lambda item: item[0])
+                del options[VERIFY_CHAINS:]
+            self._chains[key] = cell
+        return cell
+
+
 def verify_pattern(
     macro_node: WaveNode,
-    micro_monowaves: Sequence[Monowave],
+    micro_monowaves: Sequence[Monowave] | MonowaveIndex,
     rule_db: dict[str, Any] | None = None,
 ) -> PatternValidation:
     """
     Verify if the micro structure supports the macro pattern hypothesis.
-    
+
+    The micro monowaves inside the macro node's time range are located by binary
+    search, then a goal-directed parse looks only for ``macro_node.pattern_type`` over
+    the whole window; if it fails, the window is parsed as any other single pattern to
+    name what was found instead. Unsupported pattern types, and windows longer than
+    ``VERIFY_MAX_LEAVES``, go to a full analysis of the window instead.
+
     Args:
         macro_node: The high-level node (e.g. Impulse) to verify.
-        micro_monowaves: The detailed monowaves covering the same period.
+        micro_monowaves: The detailed monowaves (or a prebuilt index) covering the same period.
         rule_db: Rules database.
-        
+
     Returns:
         PatternValidation result.
     """
-    # 1. Slice micro waves to match macro node time range
-    # We assume micro_monowaves are sorted by time
-    start_time = macro_node.start_time
-    end_time = macro_node.end_time
-    
-    # Filter waves that fall within the macro node's duration
-    # We include waves that partially overlap if they are relevant?
-    # Strict containment is safer for verification.
-    subset = [
-        mw for mw in micro_monowaves 
-        if mw.start_time >= start_time and mw.end_time <= end_time
-    ]
-    
+    index = micro_monowaves if isinstance(micro_monowaves, MonowaveIndex) else MonowaveIndex(micro_monowaves)
+    rules = load_rule_db(rule_db) if rule_db is not None else RULE_DB
+    return _verify_window(macro_node.pattern_type, index.window(macro_node.start_time, macro_node.end_time), PatternEvaluator(rules))
+
+
+def verify_patterns(
+    macro_nodes: Sequence[WaveNode],
+    micro_monowaves: Sequence[Monowave] | MonowaveIndex,
+    rule_db: dict[str, Any] | None = None,
+    workers: int = 0,
+    executor: Executor | None = None,
+) -> list[PatternValidation]:
+    """Verify many macro hypotheses against one micro series, in input order.
+
+    The micro monowaves are indexed once and one evaluator is shared by every node;
+    with ``workers > 1`` the windows are verified in ``executor``, or the shared
+    process pool when none is given.
+    """
+    index = micro_monowaves if isinstance(micro_monowaves, MonowaveIndex) else MonowaveIndex(micro_monowaves)
+    rules = load_rule_db(rule_db) if rule_db is not None else RULE_DB
+    windows = [(node.pattern_type, index.window(node.start_time, node.end_time)) for node in macro_nodes]
+    if workers > 1 and len(windows) > 1:
+        rules_key = rules_hash(rules)
+        pool = executor if executor is not None else shared_executor(workers)
+        return list(pool.map(_verify_worker, [(rules_key, rules, target, subset) for target, subset in windows]))
+    evaluator = PatternEvaluator(rules)
+    return [_verify_window(target, subset, evaluator) for target, subset in windows]
+
+
+def _verify_worker(payload: tuple[str, dict[str, Any], str | None, list[Monowave]]) -> PatternValidation:
+    rules_key, rules, target, subset = payload
+    return _verify_window(target, subset, _evaluator_for(rules_key, rules))
+
+
+def _verify_window(target: str | None, subset: list[Monowave], evaluator: PatternEvaluator) -> PatternValidation:
     if not subset:
         return PatternValidation(
-            hard_valid=False, 
-            soft_score=100.0, 
+            hard_valid=False,
+            soft_score=100.0,
             violated_hard_rules=["No micro data found for verification"]
         )
-        
-    # 2. Analyze the subset
-    # We run the standard analysis on this subset
-    # Use a higher beam_width for verification as we are dealing with a smaller subset
-    # and want to ensure we find the correct pattern if it exists.
+    if target in _VERIFY_TARGETS and len(subset) <= VERIFY_MAX_LEAVES:
+        return _verify_by_parse(GoalParser(subset, evaluator), target)
+    return _verify_by_analysis(target, subset, evaluator.rule_db)
+
+
+def _root_score(root: WaveNode) -> float:
+    return validate_and_score_scenario(Scenario(id=content_scenario_id([root]), root_nodes=[root], global_score=0.0)).global_score
+
+
+def _verify_by_parse(parser: GoalParser, target: str) -> PatternValidation:
+    n = len(parser.leaves)
+    pm = parser.match(target, 0, n)
+    if pm is not None:
+        return PatternValidation(
+            hard_valid=True,
+            soft_score=_root_score(build_wavenode_from_match(pm)),
+            satisfied_rules=[f"Micro structure confirms {target}"]
+        )
+    root = parser.node(0, n)
+    if root is not None:
+        return PatternValidation(
+            hard_valid=False,
+            soft_score=50.0 + _root_score(root),
+            violated_hard_rules=[f"Expected {target}, found {root.pattern_type}"]
+        )
+    # Fewest reducible pieces the window splits into.
+    fewest = [0] + [n] * n
+    for j in range(1, n + 1):
+        for i in range(j):
+            if fewest[i] + 1 < fewest[j] and parser.node(i, j) is not None:
+                fewest[j] = fewest[i] + 1
+    return _fragments_validation(target, fewest[n])
+
+
+def _fragments_validation(target: str | None, fragments: int) -> PatternValidation:
+    # More than one root means the window could not be read as one pattern: the macro
+    # hypothesis is likely wrong, or the micro view is too noisy/complex.
+    return PatternValidation(
+        hard_valid=False,
+        soft_score=80.0,
+        violated_hard_rules=[f"Micro structure did not form a single {target} pattern (found {fragments} fragments)"]
+    )
+
+
+def _verify_by_analysis(target: str | None, subset: Sequence[Monowave], rule_db: dict[str, Any] | None) -> PatternValidation:
+    # Higher beam width than usual: the window is small and the correct pattern should not be pruned.
     scenarios = analyze_market_structure(subset, rule_db=rule_db, beam_width=10)
-    
     if not scenarios:
         return PatternValidation(
             hard_valid=False,
             soft_score=100.0,
             violated_hard_rules=["Analysis failed to find any valid structure"]
         )
-        
     best_scenario = scenarios[0]
-    
-    # 3. Check if the dominant pattern matches the macro hypothesis
-    # The best scenario might consist of multiple root nodes if it couldn't be collapsed into one.
-    # If macro_node is "Impulse", we expect the best scenario to be a single "Impulse" node
-    # OR a sequence that forms an Impulse (which analyze_market_structure should have collapsed).
-    
     roots = best_scenario.root_nodes
-    
-    # If we have a single root, check its type
-    if len(roots) == 1:
-        root = roots[0]
-        if root.pattern_type == macro_node.pattern_type:
-            # Match!
-            # We can also check subtype if needed, but pattern_type is the main check.
-            return PatternValidation(
-                hard_valid=True,
-                soft_score=best_scenario.global_score,
-                satisfied_rules=[f"Micro structure confirms {macro_node.pattern_type}"]
-            )
-        else:
-            # Mismatch
-            return PatternValidation(
-                hard_valid=False,
-                soft_score=50.0 + best_scenario.global_score,
-                violated_hard_rules=[f"Expected {macro_node.pattern_type}, found {root.pattern_type}"]
-            )
-            
-    # If we have multiple roots, it means the engine couldn't collapse them into one pattern.
-    # This implies the macro hypothesis (that it IS one pattern) is likely wrong
-    # OR the micro view is too noisy/complex.
+    if len(roots) != 1:
+        return _fragments_validation(target, len(roots))
+    root = roots[0]
+    if root.pattern_type == target:
+        return PatternValidation(
+            hard_valid=True,
+            soft_score=best_scenario.global_score,
+            satisfied_rules=[f"Micro structure confirms {target}"]
+        )
     return PatternValidation(
         hard_valid=False,
-        soft_score=80.0,
-        violated_hard_rules=[f"Micro structure did not form a single {macro_node.pattern_type} pattern (found {len(roots)} fragments)"]
+        soft_score=50.0 + best_scenario.global_score,
+        violated_hard_rules=[f"Expected {target}, found {root.pattern_type}"]
     )
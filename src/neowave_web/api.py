@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, AsyncIterator, Callable
 
 import logging
 import time
@@ -12,10 +13,13 @@ from fastapi import Body, FastAPI, HTTPException, Query
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
-from neowave_core import AnalysisConfig, RULE_DB, detect_monowaves_from_df, fetch_ohlcv, generate_scenarios, MacroScanner, verify_pattern, WaveNode, Monowave
+from neowave_core import AnalysisConfig, RULE_DB, detect_monowaves_from_df, fetch_ohlcv, generate_scenarios, MacroScanner, verify_pattern, verify_patterns, WaveNode, Monowave
 from neowave_core.data_loader import DataLoaderError
-from neowave_core.scenarios import find_wave_node, serialize_wave_node, serialize_scenario
-from neowave_web.schemas import CandleResponse, MonowaveResponse, RuleXRayResponse, ScenariosResponse, WaveChildrenResponse
+from neowave_core.models import PatternValidation
+from neowave_core.pattern_evaluator import RuleProfiler
+from neowave_core.wave_engine import AnalysisReport, shutdown_executors
+from neowave_core.scenarios import explain_wave_node, find_wave_node, serialize_wave_node, serialize_scenario
+from neowave_web.schemas import CandleResponse, CustomRangeRequest, MonowaveResponse, RuleStatsResponse, RuleXRayResponse, ScenariosResponse, WaveChildrenResponse
 
 STATIC_DIR = Path(__file__).parent / "static"
 
@@ -42,6 +46,39 @@ def _serialize_candles(df: pd.DataFrame) -> list[dict[str, Any]]:
     ]
 
 
+def _macro_node_from_payload(data: dict[str, Any]) -> WaveNode:
+    # Children are not needed for a verification target.
+    try:
+        return WaveNode(
+            id=data["id"],
+            level=data["level"],
+            degree_label=data.get("degree_label", ""),
+            start_idx=data["start_idx"],
+            end_idx=data["end_idx"],
+            start_time=pd.to_datetime(data["start_time"]),
+            end_time=pd.to_datetime(data["end_time"]),
+            start_price=data["start_price"],
+            end_price=data["end_price"],
+            high_price=data["high_price"],
+            low_price=data["low_price"],
+            direction=data["direction"],
+            pattern_type=data["pattern_type"],
+            children=[],
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid macro_node data: missing {e}")
+
+
+def _validation_payload(validation: PatternValidation) -> dict[str, Any]:
+    return {
+        "hard_valid": validation.hard_valid,
+        "soft_score": validation.soft_score,
+        "satisfied_rules": validation.satisfied_rules,
+        "violated_hard_rules": validation.violated_hard_rules,
+        "violated_soft_rules": validation.violated_soft_rules,
+    }
+
+
 def create_app(
     analysis_config: AnalysisConfig | None = None,
     data_provider: Callable[..., pd.DataFrame] | None = None,
@@ -51,8 +88,15 @@ def create_app(
     load_dotenv()
     config = analysis_config or AnalysisConfig.from_env()
     provider = data_provider or _default_data_provider
+    profiler = RuleProfiler() if config.profile_rules else None
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        # Parallel analysis reuses process-wide pools; release them with the app.
+        yield
+        shutdown_executors()
 
-    app = FastAPI(title="NEoWave Web Service", version="0.3.0")
+    app = FastAPI(title="NEoWave Web Service", version="0.3.0", lifespan=lifespan)
     index_html = (STATIC_DIR / "index.html").read_text(encoding="utf-8")
     app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
@@ -127,6 +171,7 @@ def create_app(
         interval: str = Query(config.interval),
         target_wave_count: int = Query(config.target_monowaves, ge=5, le=120),
         beam_width: int = Query(6, ge=2, le=12),
+        time_budget_ms: float | None = Query(None, ge=1, le=600_000),
     ) -> ScenariosResponse:
         df = _get_df(limit, symbol=symbol, interval=interval)
         t0 = time.perf_counter()
@@ -137,21 +182,34 @@ def create_app(
             similarity_threshold=config.similarity_threshold,
         )
         t1 = time.perf_counter()
-        scenarios = generate_scenarios(monowaves, rule_db=RULE_DB, beam_width=beam_width, target_wave_count=target_wave_count)
+        report = AnalysisReport()
+        scenarios = generate_scenarios(
+            monowaves,
+            rule_db=RULE_DB,
+            beam_width=beam_width,
+            target_wave_count=target_wave_count,
+            profiler=profiler,
+            workers=config.analysis_workers,
+            strategy=config.analysis_strategy,
+            time_budget_ms=time_budget_ms,
+            report=report,
+        )
         t2 = time.perf_counter()
         logger.info(
-            "Scenarios built symbol=%s interval=%s monowaves=%s scenarios=%s target=%s beam=%s detect=%.3fs analyze=%.3fs total=%.3fs",
+            "Scenarios built symbol=%s interval=%s monowaves=%s scenarios=%s target=%s beam=%s iterations=%s partial=%s detect=%.3fs analyze=%.3fs total=%.3fs",
             symbol,
             interval,
             len(monowaves),
             len(scenarios),
             target_wave_count,
             beam_width,
+            report.iterations,
+            report.partial,
             t1 - t0,
             t2 - t1,
             t2 - t0,
         )
-        return ScenariosResponse(scenarios=scenarios, count=len(scenarios))
+        return ScenariosResponse(scenarios=scenarios, count=len(scenarios), report=report.to_dict())
 
     @app.get("/api/waves/current", response_model=WaveChildrenResponse)
     def get_view_nodes(
@@ -162,7 +220,7 @@ def create_app(
     ) -> WaveChildrenResponse:
         df = _get_df(limit, symbol=symbol, interval=interval)
         monowaves = detect_monowaves_from_df(df, retrace_threshold_price=config.min_price_retrace_ratio, retrace_threshold_time_ratio=config.min_time_ratio, similarity_threshold=config.similarity_threshold)
-        scenarios = generate_scenarios(monowaves, rule_db=RULE_DB, target_wave_count=target_wave_count)
+        scenarios = generate_scenarios(monowaves, rule_db=RULE_DB, target_wave_count=target_wave_count, profiler=profiler, workers=config.analysis_workers, strategy=config.analysis_strategy)
         if not scenarios:
             return WaveChildrenResponse(parent_id=-1, children=[])
         view_nodes = scenarios[0].get("view_nodes", [])
@@ -177,7 +235,7 @@ def create_app(
     ) -> WaveChildrenResponse:
         df = _get_df(limit, symbol=symbol, interval=interval)
         monowaves = detect_monowaves_from_df(df, retrace_threshold_price=config.min_price_retrace_ratio, retrace_threshold_time_ratio=config.min_time_ratio, similarity_threshold=config.similarity_threshold)
-        node = find_wave_node(monowaves, wave_id, rule_db=RULE_DB)
+        node = find_wave_node(monowaves, wave_id, rule_db=RULE_DB, profiler=profiler, workers=config.analysis_workers, strategy=config.analysis_strategy)
         if not node:
             raise HTTPException(status_code=404, detail="Wave not found")
         return WaveChildrenResponse(parent_id=wave_id, children=[serialize_wave_node(child) for child in node.children])
@@ -191,9 +249,10 @@ def create_app(
     ) -> RuleXRayResponse:
         df = _get_df(limit, symbol=symbol, interval=interval)
         monowaves = detect_monowaves_from_df(df, retrace_threshold_price=config.min_price_retrace_ratio, retrace_threshold_time_ratio=config.min_time_ratio, similarity_threshold=config.similarity_threshold)
-        node = find_wave_node(monowaves, wave_id, rule_db=RULE_DB)
+        node = find_wave_node(monowaves, wave_id, rule_db=RULE_DB, profiler=profiler, workers=config.analysis_workers, strategy=config.analysis_strategy)
         if not node:
             raise HTTPException(status_code=404, detail="Wave not found")
+        explain_wave_node(node, rule_db=RULE_DB)
         return RuleXRayResponse(
             wave_id=wave_id,
             pattern_type=node.pattern_type,
@@ -202,12 +261,23 @@ def create_app(
             validation=serialize_wave_node(node).get("validation"),
         )
 
+    @app.get("/api/rules/stats", response_model=RuleStatsResponse)
+    def get_rule_stats() -> RuleStatsResponse:
+        rules = profiler.snapshot() if profiler is not None else []
+        return RuleStatsResponse(enabled=profiler is not None, rules=rules, count=len(rules))
+
+    @app.post("/api/rules/stats/reset", response_model=RuleStatsResponse)
+    def reset_rule_stats() -> RuleStatsResponse:
+        if profiler is not None:
+            profiler.reset()
+        return RuleStatsResponse(enabled=profiler is not None, rules=[], count=0)
+
     @app.post("/api/analyze/custom-range", response_model=ScenariosResponse)
-    def analyze_custom_range(payload: dict[str, Any] = Body(...)) -> ScenariosResponse:
-        symbol = payload.get("symbol", config.symbol)
-        interval = payload.get("interval", config.interval)
-        start_ts = payload.get("start_ts")
-        end_ts = payload.get("end_ts")
+    def analyze_custom_range(payload: CustomRangeRequest = Body(...)) -> ScenariosResponse:
+        symbol = payload.symbol or config.symbol
+        interval = payload.interval or config.interval
+        start_ts = payload.start_ts
+        end_ts = payload.end_ts
         if start_ts is None or end_ts is None:
             raise HTTPException(status_code=400, detail="start_ts and end_ts are required")
         start_dt = pd.to_datetime(start_ts, unit="s", utc=True)
@@ -226,9 +296,19 @@ def create_app(
             retrace_threshold_time_ratio=config.min_time_ratio,
             similarity_threshold=config.similarity_threshold,
         )
-        target_wave_count = int(payload.get("target_wave_count", config.target_monowaves))
-        scenarios = generate_scenarios(monowaves, rule_db=RULE_DB, target_wave_count=target_wave_count)
-        return ScenariosResponse(scenarios=scenarios, count=len(scenarios))
+        target_wave_count = payload.target_wave_count or config.target_monowaves
+        report = AnalysisReport()
+        scenarios = generate_scenarios(
+            monowaves,
+            rule_db=RULE_DB,
+            target_wave_count=target_wave_count,
+            profiler=profiler,
+            workers=config.analysis_workers,
+            strategy=config.analysis_strategy,
+            time_budget_ms=payload.time_budget_ms,
+            report=report,
+        )
+        return ScenariosResponse(scenarios=scenarios, count=len(scenarios), report=report.to_dict())
 
     @app.post("/api/scan/macro", response_model=ScenariosResponse)
     def scan_macro(
@@ -241,7 +321,7 @@ def create_app(
         
         df = _get_df(limit, symbol=symbol, interval=interval)
         
-        scanner = MacroScanner(RULE_DB)
+        scanner = MacroScanner(RULE_DB, profiler=profiler)
         scenarios = scanner.scan(df, target_wave_count=target_wave_count)
         
         # Serialize scenarios
@@ -261,28 +341,7 @@ def create_app(
         interval = payload.get("interval", config.interval)
         limit = payload.get("limit", config.lookback)
         
-        # Reconstruct WaveNode from dict (simplified)
-        # In a real app, we might need a proper deserializer
-        # For now, we assume basic fields are present
-        try:
-            macro_node = WaveNode(
-                id=macro_node_data["id"],
-                level=macro_node_data["level"],
-                degree_label=macro_node_data.get("degree_label", ""),
-                start_idx=macro_node_data["start_idx"],
-                end_idx=macro_node_data["end_idx"],
-                start_time=pd.to_datetime(macro_node_data["start_time"]),
-                end_time=pd.to_datetime(macro_node_data["end_time"]),
-                start_price=macro_node_data["start_price"],
-                end_price=macro_node_data["end_price"],
-                high_price=macro_node_data["high_price"],
-                low_price=macro_node_data["low_price"],
-                direction=macro_node_data["direction"],
-                pattern_type=macro_node_data["pattern_type"],
-                children=[] # Children not needed for verification target
-            )
-        except KeyError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid macro_node data: missing {e}")
+        macro_node = _macro_node_from_payload(macro_node_data)
 
         # Fetch micro data
         df = _get_df(limit, symbol=symbol, interval=interval)
@@ -298,13 +357,32 @@ def create_app(
         # Verify
         validation = verify_pattern(macro_node, micro_monowaves, rule_db=RULE_DB)
         
-        return {
-            "hard_valid": validation.hard_valid,
-            "soft_score": validation.soft_score,
-            "satisfied_rules": validation.satisfied_rules,
-            "violated_hard_rules": validation.violated_hard_rules,
-            "violated_soft_rules": validation.violated_soft_rules
-        }
+        return _validation_payload(validation)
+
+    @app.post("/api/verify/patterns")
+    def verify_patterns_endpoint(
+        payload: dict[str, Any] = Body(...),
+    ) -> dict[str, Any]:
+        # Many macro nodes against one micro series: fetched, detected and indexed once.
+        macro_nodes_data = payload.get("macro_nodes")
+        if not macro_nodes_data or not isinstance(macro_nodes_data, list):
+            raise HTTPException(status_code=400, detail="macro_nodes must be a non-empty list")
+        macro_nodes = [_macro_node_from_payload(data) for data in macro_nodes_data]
+
+        symbol = payload.get("symbol", config.symbol)
+        interval = payload.get("interval", config.interval)
+        limit = payload.get("limit", config.lookback)
+        df = _get_df(limit, symbol=symbol, interval=interval)
+        micro_monowaves = detect_monowaves_from_df(
+            df,
+            retrace_threshold_price=config.min_price_retrace_ratio,
+            retrace_threshold_time_ratio=config.min_time_ratio,
+            similarity_threshold=config.similarity_threshold,
+        )
+
+        validations = verify_patterns(macro_nodes, micro_monowaves, rule_db=RULE_DB, workers=config.analysis_workers)
+        results = [{"id": node.id, **_validation_payload(v)} for node, v in zip(macro_nodes, validations)]
+        return {"results": results, "count": len(results)}
 
     return app
 
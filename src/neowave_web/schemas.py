@@ -81,15 +81,36 @@ class ScenarioOut(BaseModel):
     status: str
     invalidation_reasons: list[str] = Field(default_factory=list)
     probability: float = 0.5
+    partial: bool = False
     invalidation_levels: list[dict[str, Any]] = Field(default_factory=list)
     roots: list[WaveNodeOut]
     view_nodes: list[WaveNodeOut] = Field(default_factory=list)
     view_level: int = 0
 
 
+class AnalysisReportOut(BaseModel):
+    iterations: int
+    expansions: int
+    states: int = 0
+    elapsed_ms: float
+    iteration_ms: list[float] = Field(default_factory=list)
+    time_budget_ms: float | None = None
+    partial: bool = False
+
+
+class CustomRangeRequest(BaseModel):
+    symbol: str | None = None
+    interval: str | None = None
+    start_ts: float | None = None  # epoch seconds
+    end_ts: float | None = None
+    target_wave_count: int | None = None
+    time_budget_ms: float | None = Field(None, ge=1, le=600_000)
+
+
 class ScenariosResponse(BaseModel):
     scenarios: list[ScenarioOut]
     count: int
+    report: AnalysisReportOut | None = None
 
 
 class WaveChildrenResponse(BaseModel):
@@ -105,4 +126,24 @@ class RuleXRayResponse(BaseModel):
     validation: ValidationOut | None = None
 
 
+class RuleStatsOut(BaseModel):
+    pattern: str
+    subtype: str
+    rule_id: str
+    evaluations: int
+    passed: int
+    failed: int
+    errors: int
+    pass_rate: float
+    total_time_ms: float
+    avg_time_us: float
+    last_error: str | None = None
+
+
+class RuleStatsResponse(BaseModel):
+    enabled: bool
+    rules: list[RuleStatsOut]
+    count: int
+
+
 WaveNodeOut.model_rebuild()
@@ -1,13 +1,50 @@
 from __future__ import annotations
 
+import itertools
+import random
+import time
+from concurrent.futures import Executor, Future
 from datetime import datetime, timedelta, timezone
 
 import pandas as pd
+import pytest
 from fastapi.testclient import TestClient
 
-from neowave_core.models import Monowave
+from neowave_core import wave_engine
+from neowave_core.config import AnalysisConfig
+from neowave_core.models import Monowave, PatternValidation, Scenario, WaveNode
+from neowave_core.pattern_evaluator import PatternEvaluator, PatternScore, RuleProfiler
+from neowave_core.rules_db import RULE_DB
 from neowave_core.swings import detect_monowaves_from_df, merge_by_similarity
-from neowave_core.wave_engine import analyze_market_structure
+from neowave_core.wave_engine import (
+    BestFirstSearch,
+    NodeInterner,
+    PatternMatch,
+    ScenarioScorer,
+    _check_internal_structure,
+    _check_thermodynamic_balance,
+    _from_light,
+    _similarity_penalty,
+    _to_light,
+    _traverse,
+    analyze_incremental,
+    analyze_market_structure,
+    analyze_segmented,
+    build_wavenode_from_match,
+    collapse_nodes,
+    collect_level_nodes,
+    count_nodes_by_level,
+    dedupe_scenarios,
+    enumerate_non_overlapping_sets,
+    expand_one_level,
+    find_all_local_patterns,
+    find_node_by_id,
+    run_analysis,
+    scenario_signature,
+    segment_boundaries,
+    try_zigzag,
+    wrap_monowaves,
+)
 from neowave_web.api import create_app
 
 
@@ -81,3 +118,434 @@ def test_api_endpoints_return_data():
     assert sc_resp.status_code == 200
     sc_data = sc_resp.json()
     assert sc_data["count"] >= 0
+    assert sc_data["report"]["partial"] is False
+
+    budget_resp = client.get("/api/scenarios", params={"time_budget_ms": 5000})
+    assert budget_resp.status_code == 200
+    assert budget_resp.json()["report"]["time_budget_ms"] == 5000
+
+    custom_range = {"start_ts": df["timestamp"].iloc[0].timestamp(), "end_ts": df["timestamp"].iloc[-1].timestamp()}
+    range_resp = client.post("/api/analyze/custom-range", json={**custom_range, "time_budget_ms": 5000})
+    assert range_resp.status_code == 200
+    assert range_resp.json()["report"]["time_budget_ms"] == 5000
+    for bad_budget in (0, 600_001, "soon"):
+        assert client.post("/api/analyze/custom-range", json={**custom_range, "time_budget_ms": bad_budget}).status_code == 422
+    assert client.post("/api/analyze/custom-range", json={"start_ts": custom_range["start_ts"]}).status_code == 400
+
+    macro = {
+        "id": 1, "level": 1, "start_idx": 0, "end_idx": len(closes) - 1,
+        "start_time": df["timestamp"].iloc[0].isoformat(), "end_time": df["timestamp"].iloc[-1].isoformat(),
+        "start_price": 100, "end_price": 140, "high_price": 140, "low_price": 100,
+        "direction": "up", "pattern_type": "Impulse",
+    }
+    verify_resp = client.post("/api/verify/patterns", json={"macro_nodes": [macro, {**macro, "id": 2, "pattern_type": "Zigzag"}]})
+    assert verify_resp.status_code == 200
+    verify_data = verify_resp.json()
+    assert verify_data["count"] == 2 and [r["id"] for r in verify_data["results"]] == [1, 2]
+    assert client.post("/api/verify/patterns", json={"macro_nodes": []}).status_code == 400
+
+
+def test_rule_profiler_counts_outcomes_and_errors():
+    rule_db = {
+        **RULE_DB,
+        "Zigzag": {
+            "Standard": {
+                "price_rules": [
+                    {"id": "b_depth", "expr": "B_over_A < 0.7", "hard": True, "weight": 0.5, "description": "B < 70% of A"},
+                    {"id": "broken", "expr": "missing_metric > 1", "hard": False, "weight": 0.1, "description": "Broken rule"},
+                ],
+                "time_rules": [],
+                "volume_rules": [],
+            }
+        },
+    }
+    profiler = RuleProfiler()
+    evaluator = PatternEvaluator(rule_db, profiler=profiler)
+    nodes = wrap_monowaves(_leg_monowaves([(100, 110), (110, 105), (105, 120)]))
+    evaluator.evaluate("Zigzag", "Standard", nodes)
+    evaluator.evaluate("Zigzag", "Standard", nodes)
+
+    stats = {row["rule_id"]: row for row in evaluator.rule_stats()}
+    assert stats["b_depth"]["evaluations"] == 2
+    assert stats["b_depth"]["passed"] == 2
+    assert stats["broken"]["failed"] == 2
+    assert stats["broken"]["errors"] == 2
+    assert "NameError" in stats["broken"]["last_error"]
+    profiler.reset()
+    assert evaluator.rule_stats() == []
+
+    unprofiled = PatternEvaluator(rule_db)
+    unprofiled.evaluate("Zigzag", "Standard", nodes)
+    assert unprofiled.rule_errors == 1
+
+
+def test_flat_family_evaluation_matches_per_subtype_evaluate():
+    legs = [(100, 90), (90, 102), (102, 88)]  # expanded flat: B > A
+    nodes = wrap_monowaves(_leg_monowaves(legs))
+    evaluator = PatternEvaluator(RULE_DB)
+    family = evaluator.evaluate_family("Flat", ["Normal", "Expanded", "Running"], nodes, include_all=True)
+
+    assert set(family.validations) == {"Normal", "Expanded", "Running"}
+    for subtype, validation in family.validations.items():
+        single, _ = evaluator.evaluate("Flat", subtype, nodes)
+        assert validation == single
+    assert family.best_subtype in {"Normal", "Expanded"}
+    assert family.validation.hard_valid
+    assert not family.validations["Running"].hard_valid
+
+
+def test_scoring_only_match_rebuilds_evidence_on_selection():
+    legs = [(100, 120), (120, 110), (110, 135)]
+    nodes = wrap_monowaves(_leg_monowaves(legs))
+    evaluator = PatternEvaluator(RULE_DB)
+    full, _ = evaluator.evaluate("Zigzag", "Standard", nodes)
+    quick, metrics = evaluator.score("Zigzag", "Standard", nodes)
+    assert quick == PatternScore.from_validation(full)
+
+    match = try_zigzag(nodes, evaluator)
+    assert match is not None and match.validation is None
+    node = build_wavenode_from_match(match)
+    assert node.validation == full
+    assert evaluator.explain("Zigzag", "Standard", metrics) == full
+
+
+def test_enumerate_non_overlapping_sets_is_exact_k_best():
+    rng = random.Random(3)
+    for _ in range(30):
+        candidates = []
+        for _ in range(rng.randint(1, 9)):
+            start = rng.randint(0, 12)
+            end = start + rng.choice([2, 4])
+            candidates.append(PatternMatch("Zigzag", "Standard", start, end, [], None, {}, round(rng.uniform(0.05, 0.5), 2)))
+
+        def key(combo):
+            return (sum(c.score for c in combo), -sum(c.end_index - c.start_index + 1 for c in combo))
+
+        feasible = [
+            combo
+            for r in range(len(candidates) + 1)
+            for combo in itertools.combinations(candidates, r)
+            if all(a.end_index < b.start_index for a, b in zip(sorted(combo, key=lambda c: c.start_index), sorted(combo, key=lambda c: c.start_index)[1:]))
+        ]
+        expected = sorted(key(combo) for combo in feasible)[:6]
+        result = enumerate_non_overlapping_sets(candidates, beam_width=6)
+        assert [key(combo) for combo in result] == [k for k in expected if k != (0, 0)]
+        for combo in result:
+            assert all(a.end_index < b.start_index for a, b in zip(combo, combo[1:]))
+
+
+def test_node_interner_shares_subtrees_across_scenarios():
+    legs = [(100, 110), (110, 105), (105, 125), (125, 118), (118, 140), (140, 128), (128, 133)]
+    nodes = wrap_monowaves(_leg_monowaves(legs))
+    evaluator = PatternEvaluator(RULE_DB)
+    interner = NodeInterner()
+    first = Scenario(id=1, root_nodes=list(nodes), global_score=0.0, status="active", invalidation_reasons=[])
+    second = Scenario(id=2, root_nodes=list(nodes), global_score=0.5, status="active", invalidation_reasons=[])
+    _, expanded_a = expand_one_level(first, evaluator, interner=interner)
+    _, expanded_b = expand_one_level(second, evaluator, interner=interner)
+
+    assert len(expanded_a) == len(expanded_b) > 0
+    for sc_a, sc_b in zip(expanded_a, expanded_b):
+        assert all(a is b for a, b in zip(sc_a.root_nodes, sc_b.root_nodes))
+    assert interner.hits > 0
+
+
+def test_dedupe_scenarios_keeps_best_score_per_structure():
+    legs = [(100, 110), (110, 105), (105, 125)]
+    nodes = wrap_monowaves(_leg_monowaves(legs))
+    copies = wrap_monowaves(_leg_monowaves(legs))
+    worse = Scenario(id=1, root_nodes=nodes, global_score=0.4, status="active", invalidation_reasons=[])
+    other = Scenario(id=2, root_nodes=nodes[:2], global_score=0.1, status="active", invalidation_reasons=[])
+    better = Scenario(id=3, root_nodes=copies, global_score=0.2, status="active", invalidation_reasons=[])
+
+    assert scenario_signature(worse) == scenario_signature(better)
+    assert [sc.id for sc in dedupe_scenarios([worse, other, better])] == [3, 2]
+
+
+def _leg_monowaves(legs: list[tuple[float, float]]) -> list[Monowave]:
+    """Consecutive one-hour monowaves through the given (start, end) price legs."""
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Monowave(i, i, i + 1, base_time + timedelta(hours=i), base_time + timedelta(hours=i + 1), s, e, max(s, e), min(s, e), "up" if e > s else "down", e - s, abs(e - s), 1)
+        for i, (s, e) in enumerate(legs)
+    ]
+
+
+def _zigzag_monowaves(count: int, seed: int) -> list[Monowave]:
+    rng = random.Random(seed)
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    price = 100.0
+    monowaves = []
+    for i in range(count):
+        move = rng.uniform(2.0, 12.0) * (1 if i % 2 == 0 else -1)
+        end = price + move
+        monowaves.append(
+            Monowave(i, i, i + 1, base_time + timedelta(hours=i), base_time + timedelta(hours=i + 1), price, end, max(price, end), min(price, end), "up" if move > 0 else "down", move, abs(move), rng.randint(1, 6))
+        )
+        price = end
+    return monowaves
+
+
+def test_parallel_expansion_matches_serial(monkeypatch):
+    monowaves = _zigzag_monowaves(40, seed=5)
+    serial = analyze_market_structure(monowaves, beam_width=4)
+    monkeypatch.setattr(wave_engine, "PARALLEL_MIN_NODES", 1)
+    parallel = analyze_market_structure(monowaves, beam_width=4, workers=2)
+
+    assert [(scenario_signature(sc), sc.global_score) for sc in parallel] == [(scenario_signature(sc), sc.global_score) for sc in serial]
+    # One pool per worker count, reused across calls.
+    assert wave_engine.shared_executor(2) is wave_engine.shared_executor(2)
+
+
+class _StalledExecutor(Executor):
+    """Accepts work and never runs it."""
+
+    def __init__(self) -> None:
+        self.submitted: list[Future] = []
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        self.submitted.append(future)
+        return future
+
+
+def test_parallel_expansion_honors_deadline_within_a_level(monkeypatch):
+    monkeypatch.setattr(wave_engine, "PARALLEL_MIN_NODES", 1)
+    monowaves = _zigzag_monowaves(20, seed=5)
+    executor = _StalledExecutor()
+    result = run_analysis(monowaves, beam_width=4, workers=2, time_budget_ms=50, executor=executor)
+
+    assert result.report.partial and result.report.iterations == 1
+    assert executor.submitted and all(future.cancelled() for future in executor.submitted)
+    assert [len(sc.root_nodes) for sc in result.scenarios] == [len(monowaves)]
+
+
+def test_incremental_analysis_reuses_prefix_and_covers_new_monowaves():
+    monowaves = _zigzag_monowaves(30, seed=9)
+    previous = analyze_market_structure(monowaves[:27], beam_width=4)
+    updated = analyze_incremental(previous, monowaves, beam_width=4)
+
+    assert updated
+    prior_ids = {id(root) for sc in previous for root in sc.root_nodes}
+    for sc in updated:
+        leaves = collect_level_nodes(sc.root_nodes, level=0)
+        assert [leaf.id for leaf in leaves] == [mw.id for mw in monowaves]
+    assert any(id(root) in prior_ids for sc in updated for root in sc.root_nodes if root.children)
+    # Nothing reusable: falls back to a full analysis.
+    assert analyze_incremental([], monowaves, beam_width=4)
+
+
+def test_expired_deadline_returns_partial_best_so_far():
+    monowaves = _zigzag_monowaves(30, seed=2)
+    result = run_analysis(monowaves, beam_width=4, deadline=time.monotonic())
+    assert result.report.partial and result.report.iterations == 0
+    assert len(result.scenarios) == 1
+    assert result.scenarios[0].partial
+    assert len(result.scenarios[0].root_nodes) == len(monowaves)
+
+    complete = run_analysis(monowaves, beam_width=4, time_budget_ms=60_000)
+    assert not complete.report.partial
+    assert complete.report.iterations == len(complete.report.iteration_ms) >= 1
+    assert not any(sc.partial for sc in complete.scenarios)
+
+
+def test_wave_and_scenario_ids_are_content_addressed():
+    monowaves = _zigzag_monowaves(24, seed=4)
+    first = analyze_market_structure(monowaves, beam_width=4)
+    second = analyze_market_structure(monowaves, beam_width=4)
+
+    assert [sc.id for sc in first] == [sc.id for sc in second]
+    assert len({sc.id for sc in first}) == len(first)
+    for sc_a, sc_b in zip(first, second):
+        for level in range(1, 4):
+            ids_a = [node.id for node in collect_level_nodes(sc_a.root_nodes, level)]
+            assert ids_a == [node.id for node in collect_level_nodes(sc_b.root_nodes, level)]
+            assert all(0 <= node_id < 2**53 for node_id in ids_a)
+
+
+def test_wave_index_matches_tree_walks():
+    monowaves = _zigzag_monowaves(30, seed=6)
+    result = run_analysis(monowaves, beam_width=4)
+    assert result.indexes == {}
+    for sc in result.scenarios:
+        index = result.index(sc)
+        assert index is result.indexes[sc.id]
+        assert index.counts == count_nodes_by_level(sc.root_nodes)
+        for level in index.counts:
+            assert index.level_nodes(level) == collect_level_nodes(sc.root_nodes, level)
+        for node in index.level_nodes(1):
+            assert index.find(node.id) is find_node_by_id(sc.root_nodes, node.id)
+        for target in (1, 5, 40):
+            level = min(index.counts, key=lambda lvl: abs(index.counts[lvl] - target))
+            assert index.view_nodes(target) == collect_level_nodes(sc.root_nodes, level)
+    assert result.index(result.scenarios[0]).find(-1) is None
+
+
+def test_fused_scorer_matches_per_level_walk():
+    def reference(sc):
+        penalty = 0.05 * len(sc.root_nodes)
+        levels: dict[int, list[WaveNode]] = {}
+        for node in _traverse(sc.root_nodes):
+            levels.setdefault(node.level, []).append(node)
+        for nodes in levels.values():
+            ordered = sorted(nodes, key=lambda n: n.start_idx)
+            penalty += sum(_similarity_penalty(left, right) for left, right in zip(ordered, ordered[1:]))
+        reasons = []
+        for node in _traverse(sc.root_nodes):
+            node_penalty, reason = _check_internal_structure(node)
+            penalty += node_penalty + _check_thermodynamic_balance(node)
+            if reason is not None:
+                reasons.append(reason)
+        base = sum(max(node.score, 0.0) for node in _traverse(sc.root_nodes))
+        return base + penalty + (10.0 if reasons else 0.0), reasons
+
+    scenarios = analyze_market_structure(_zigzag_monowaves(40, seed=3), beam_width=6)
+    scorer = ScenarioScorer()
+    for sc in scenarios:
+        expected_score, expected_reasons = reference(sc)
+        sc.status, sc.invalidation_reasons = "active", []
+        scorer.score(sc)
+        assert sc.global_score == pytest.approx(expected_score)
+        assert sc.invalidation_reasons == expected_reasons
+    assert scorer.hits > 0
+
+
+def test_collapse_nodes_matches_linear_scan():
+    def linear(nodes, matches):
+        result, i = [], 0
+        while i < len(nodes):
+            candidates = [pm for pm in matches if pm.start_index == nodes[i].start_idx]
+            if not candidates:
+                result.append(nodes[i])
+                i += 1
+                continue
+            match = max(candidates, key=lambda pm: pm.end_index)
+            result.append((match.start_index, match.end_index))
+            while i < len(nodes) and nodes[i].end_idx <= match.end_index:
+                i += 1
+        return result
+
+    nodes = [WaveNode.from_monowave(mw) for mw in _zigzag_monowaves(30, seed=8)]
+    rng = random.Random(8)
+    for _ in range(50):
+        matches = []
+        for _ in range(rng.randint(0, 8)):
+            pos = rng.randrange(len(nodes))
+            window = nodes[pos : pos + rng.choice((3, 5))]
+            matches.append(PatternMatch("Zigzag", "Standard", window[0].start_idx, window[-1].end_idx, window, PatternValidation(hard_valid=True, soft_score=0.0), {}, 0.1))
+        collapsed = collapse_nodes(nodes, matches)
+        assert [node if not node.children else (node.start_idx, node.end_idx) for node in collapsed] == linear(nodes, matches)
+
+
+def test_best_first_search_returns_proven_best_terminal_scenarios():
+    monowaves = _zigzag_monowaves(10, seed=1)
+    result = run_analysis(monowaves, beam_width=3, strategy=BestFirstSearch(weight=1.0))
+    assert not result.report.partial and len(result.scenarios) == 3
+
+    # Exhaustive enumeration of the same expansion tree.
+    evaluator, scorer = PatternEvaluator(RULE_DB), ScenarioScorer()
+    stack, seen, finals = [Scenario(id=0, root_nodes=wrap_monowaves(monowaves), global_score=0.0)], set(), []
+    while stack:
+        sc = stack.pop()
+        signature = scenario_signature(sc)
+        if signature in seen:
+            continue
+        seen.add(signature)
+        changed, expanded = expand_one_level(sc, evaluator, beam_width=3)
+        if changed:
+            stack.extend(expanded)
+        else:
+            finals.append(scorer.score(sc).global_score)
+    assert [sc.global_score for sc in result.scenarios] == pytest.approx(sorted(finals)[:3])
+    assert result.report.states < len(seen)
+    # The weighted default gives up the proof but stays within its weight of the best.
+    weighted = run_analysis(monowaves, beam_width=3, strategy="best_first")
+    assert weighted.scenarios[0].global_score <= BestFirstSearch().weight * min(finals)
+
+    capped = run_analysis(monowaves, beam_width=3, strategy=BestFirstSearch(max_expansions=1))
+    assert capped.report.partial and all(sc.partial for sc in capped.scenarios)
+    with pytest.raises(ValueError):
+        run_analysis(monowaves, strategy="depth_first")
+
+
+def test_parallel_best_first_matches_serial(monkeypatch):
+    monowaves = _zigzag_monowaves(12, seed=2)
+    serial = run_analysis(monowaves, beam_width=3, strategy=BestFirstSearch(weight=1.0))
+    monkeypatch.setattr(wave_engine, "PARALLEL_MIN_NODES", 1)
+    parallel = run_analysis(monowaves, beam_width=3, workers=2, strategy=BestFirstSearch(weight=1.0))
+
+    assert not parallel.report.partial
+    assert [sc.global_score for sc in parallel.scenarios] == pytest.approx([sc.global_score for sc in serial.scenarios])
+
+
+def test_unknown_strategy_env_falls_back_to_beam(monkeypatch):
+    monkeypatch.setenv("ANALYSIS_STRATEGY", "depth_first")
+    assert AnalysisConfig.from_env().analysis_strategy == "beam"
+    monkeypatch.setenv("ANALYSIS_STRATEGY", "best_first")
+    assert AnalysisConfig.from_env().analysis_strategy == "best_first"
+
+
+@pytest.mark.parametrize("count", [20, 40])
+def test_default_best_first_generates_fewer_states_than_the_beam(count):
+    monowaves = _zigzag_monowaves(count, seed=1)
+    beam = run_analysis(monowaves, beam_width=6, strategy="beam")
+    best_first = run_analysis(monowaves, beam_width=6, strategy="best_first")
+
+    assert not best_first.report.partial and len(best_first.scenarios) == 6
+    assert best_first.report.states < beam.report.states
+    assert best_first.scenarios[0].global_score <= beam.scenarios[0].global_score
+
+
+def test_segmented_analysis_stitches_segments_covering_all_monowaves():
+    monowaves = _zigzag_monowaves(40, seed=11)
+    bounds = segment_boundaries(monowaves, segment_size=12)
+    assert bounds[-1] == len(monowaves) and len(bounds) >= 3
+    assert all(6 <= end - start <= 18 for start, end in zip([0] + bounds[:-1], bounds))
+
+    serial = analyze_segmented(monowaves, beam_width=4, segment_size=12)
+    assert serial
+    for sc in serial:
+        assert [leaf.id for leaf in collect_level_nodes(sc.root_nodes, level=0)] == [mw.id for mw in monowaves]
+    parallel = analyze_segmented(monowaves, beam_width=4, segment_size=12, workers=2)
+    assert [(scenario_signature(sc), sc.global_score) for sc in parallel] == [(scenario_signature(sc), sc.global_score) for sc in serial]
+    assert segment_boundaries(monowaves, segment_size=60) == [len(monowaves)]
+    with pytest.raises(ValueError):
+        segment_boundaries(monowaves, segment_size=0)
+
+
+def test_boundary_windows_are_those_crossing_a_boundary():
+    evaluator = PatternEvaluator(RULE_DB)
+    nodes = wrap_monowaves(_zigzag_monowaves(60, seed=5))
+    boundaries = [nodes[19].end_idx, nodes[39].end_idx]
+    basic = {"Impulse", "Triangle", "Zigzag", "Flat"}
+    key = lambda pm: (pm.pattern_type, pm.subtype, pm.start_index, pm.end_index)
+    crossing = [key(pm) for pm in find_all_local_patterns(nodes, evaluator) if pm.pattern_type in basic and any(pm.start_index < b < pm.end_index for b in boundaries)]
+    filtered = [key(pm) for pm in find_all_local_patterns(nodes, evaluator, boundaries=boundaries) if pm.pattern_type in basic]
+    assert crossing and sorted(filtered) == sorted(crossing)
+
+
+def test_complex_corrections_are_composed_from_basic_matches():
+    evaluator = PatternEvaluator(RULE_DB)
+    nodes = wrap_monowaves(_zigzag_monowaves(120, seed=3))
+    position = {id(node): i for i, node in enumerate(nodes)}
+    matches = find_all_local_patterns(nodes, evaluator)
+    complex_matches = [pm for pm in matches if pm.legs is not None]
+    assert {"DoubleThree", "TripleThree"} <= {pm.pattern_type for pm in complex_matches}
+    interner = NodeInterner()
+    for pm in complex_matches:
+        # Legs tile the matched run exactly: corrections are basic matches, connectors single roots.
+        covered = [node for leg in pm.legs for node in (leg.wave_nodes if not isinstance(leg, WaveNode) else [leg])]
+        assert covered == pm.wave_nodes
+        corrections = [leg for leg in pm.legs if not isinstance(leg, WaveNode)]
+        assert all(leg.pattern_type in {"Zigzag", "Flat", "Triangle"} for leg in corrections)
+        moves = [leg.end_price - leg.start_price if isinstance(leg, WaveNode) else leg.wave_nodes[-1].end_price - leg.wave_nodes[0].start_price for leg in pm.legs]
+        if pm.pattern_type == "Diametric":
+            assert len(pm.legs) == 7 and all(a * b < 0 for a, b in zip(moves, moves[1:]))
+        else:
+            assert len(pm.legs) == (3 if pm.pattern_type == "DoubleThree" else 5)
+            assert all(m * moves[0] > 0 for m in moves[0::2]) and all(m * moves[0] < 0 for m in moves[1::2])
+        node = interner.node_for(pm)
+        assert len(node.children) == len(pm.legs) and node.validation.hard_valid
+        # Worker hand-off rebuilds the same composition from root positions.
+        rebuilt = _from_light(_to_light(pm, position), nodes, evaluator)
+        assert interner.node_for(rebuilt) is node
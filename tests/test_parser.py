@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from neowave_core import parser
+from neowave_core.patterns import complex_corrections
+from neowave_core.models import Monowave, WaveNode, WaveTree
+from neowave_core.parser import (
+    CHART_SPAN_ENDS,
+    ParseSettings,
+    WaveChart,
+    build_wave_leaves,
+    parse_wave_trees,
+)
+from neowave_core.rules_db import RULE_DB
+
+
+def _zigzag_monowaves(count: int, seed: int) -> list[Monowave]:
+    rng = random.Random(seed)
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    price = 100.0
+    monowaves = []
+    for i in range(count):
+        move = rng.uniform(2.0, 12.0) * (1 if i % 2 == 0 else -1)
+        end = price + move
+        monowaves.append(
+            Monowave(i, i, i + 1, base_time + timedelta(hours=i), base_time + timedelta(hours=i + 1), price, end, max(price, end), min(price, end), "up" if move > 0 else "down", move, abs(move), rng.randint(1, 6))
+        )
+        price = end
+    return monowaves
+
+
+def _chart(count: int, seed: int = 1) -> WaveChart:
+    leaves = build_wave_leaves(_zigzag_monowaves(count, seed), degree=parser._degree_for_level(0))
+    ctx = parser._rule_context(RULE_DB, ParseSettings())
+    return WaveChart(leaves, ctx, leaves[-1].end_idx)
+
+
+def _leaf_starts(node: WaveNode) -> list[int]:
+    if not node.sub_waves:
+        return [node.start_idx]
+    return [start for child in node.sub_waves for start in _leaf_starts(child)]
+
+
+def test_parse_wave_trees_cover_every_swing_in_order():
+    monowaves = _zigzag_monowaves(60, seed=1)
+    trees = parse_wave_trees(monowaves, RULE_DB, k=3)
+
+    assert trees and all(isinstance(tree, WaveTree) for tree in trees)
+    for tree in trees:
+        assert [start for root in tree.roots for start in _leaf_starts(root)] == [mw.start_idx for mw in monowaves]
+
+
+def test_build_reproduces_the_recorded_derivation():
+    chart = _chart(40)
+
+    for key in chart.cells:
+        derivation = chart.best(key)
+        if derivation.kind == "leaf":
+            continue
+        children = derivation.children
+        assert derivation.value == derivation.node.score + sum(child.value for child in children)
+        assert children[0].node.start_idx == chart.leaves[key[0]].start_idx
+        assert all(left.node.end_idx == right.node.start_idx for left, right in zip(children, children[1:]))
+
+        built = chart.build(derivation)
+        assert (built.pattern_type, built.score, built.degree_level) == (derivation.node.pattern_type, derivation.node.score, key[2])
+        assert _leaf_starts(built) == [leaf.start_idx for leaf in chart.leaves[key[0] : key[1]]]
+
+
+def test_chart_work_grows_polynomially(monkeypatch):
+    merges = []
+    merge = WaveChart._merge
+
+    def counting_merge(self, *args, **kwargs):
+        merges.append(1)
+        return merge(self, *args, **kwargs)
+
+    monkeypatch.setattr(WaveChart, "_merge", counting_merge)
+    counts = []
+    for count in (80, 160):
+        merges.clear()
+        chart = _chart(count)
+        counts.append(len(merges))
+        # Only the best span ends per (start, degree) are extended above the leaves.
+        assert all(len(ends) <= CHART_SPAN_ENDS for (_, level), ends in chart.ends.items() if level >= 1)
+
+    # Doubling the swings roughly doubles the checked windows; the exhaustive chart blew up exponentially.
+    assert counts[1] < 4 * counts[0]
+
+
+def test_building_trees_does_not_relabel_shared_chart_nodes():
+    chart = _chart(40)
+    for key in chart.cells:
+        chart.build(chart.best(key))
+
+    assert [leaf.label for leaf in chart.leaves] == [str(i) for i in range(40)]
+    assert all("wave_label" not in leaf.metadata for leaf in chart.leaves)
+
+
+def test_combinations_reuse_the_basic_merges_segment_results(monkeypatch):
+    calls = []
+    for pattern, check in complex_corrections._BASIC_CHECKERS.items():
+
+        def counting(swings, rules=None, evidence=True, pattern=pattern, check=check):
+            calls.append((complex_corrections._segment_span(swings), pattern, evidence))
+            return check(swings, rules, evidence=evidence)
+
+        monkeypatch.setitem(complex_corrections._BASIC_CHECKERS, pattern, counting)
+    chart = _chart(60)
+
+    # Every span is checked at most once per pattern and evidence level, across both passes.
+    assert len(calls) == len(set(calls)) == chart.segments.misses
+    assert chart.segments.hits > 0
+    assert any(cell for (_, _, degree), cell in chart.cells.items() if degree >= 1 and set(cell) & set(parser._COMBINATIONS))
+
+
+def _cover_totals(chart: WaveChart) -> list[float]:
+    return [round(sum(chart.value(key) for key in cover), 9) for cover in chart.k_best_covers(3)]
+
+
+@pytest.mark.parametrize("count", [10, 15])
+@pytest.mark.parametrize("seed", range(4))
+def test_pruned_chart_matches_exhaustive_enumeration_on_short_inputs(monkeypatch, count, seed):
+    pruned = _cover_totals(_chart(count, seed))
+    monkeypatch.setattr(parser, "CHART_SPAN_ENDS", 10**6)
+    monkeypatch.setattr(parser, "CHART_CHAINS", 10**6)
+
+    assert pruned == _cover_totals(_chart(count, seed))
+
+
+def test_pruned_chart_never_beats_exhaustive_enumeration(monkeypatch):
+    # Past the caps the chart is a beam: its best cover is at most the exhaustive best.
+    pruned = _cover_totals(_chart(25, seed=1))
+    monkeypatch.setattr(parser, "CHART_SPAN_ENDS", 10**6)
+    monkeypatch.setattr(parser, "CHART_CHAINS", 10**6)
+
+    assert pruned[0] <= _cover_totals(_chart(25, seed=1))[0]
+
+
+def test_composite_root_only_when_no_combination_merged_at_the_top():
+    ctx = parser._rule_context(RULE_DB, ParseSettings())
+    roots = build_wave_leaves(_zigzag_monowaves(3, seed=1), degree=parser._degree_for_level(0))
+
+    finished = parser._finish_roots(list(roots), ctx, tail_end_idx=roots[-1].end_idx)
+    assert [root.pattern_type for root in finished] == ["Composite"]
+
+    with_combo = [replace(roots[0], pattern_type="DoubleThree")] + roots[1:]
+    assert parser._finish_roots(with_combo, ctx, tail_end_idx=roots[-1].end_idx) == with_combo
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from neowave_core.patterns import (
+    SegmentCache,
+    SwingArrays,
+    is_double_three,
+    is_flat,
+    is_flat_batch,
+    is_impulse,
+    is_impulse_batch,
+    is_terminal_impulse,
+    is_terminal_impulse_batch,
+    is_triangle,
+    is_triangle_batch,
+    is_triple_three,
+    is_zigzag,
+    is_zigzag_batch,
+)
+from neowave_core.swings import Direction
+
+
+def _random_swings(count: int, seed: int) -> list[SimpleNamespace]:
+    rng = random.Random(seed)
+    price = 100.0
+    swings = []
+    direction = Direction.UP
+    for i in range(count):
+        length = rng.choice([0.0, rng.uniform(0.5, 20.0)])
+        duration = rng.choice([0, rng.randint(1, 12)])
+        end = price + length if direction == Direction.UP else price - length
+        swings.append(
+            SimpleNamespace(
+                start_idx=i,
+                end_idx=i + 1,
+                length=length,
+                duration=duration,
+                direction=direction,
+                high=max(price, end),
+                low=min(price, end),
+            )
+        )
+        price = end
+        # Occasionally repeat a direction so the alternation guards are exercised.
+        if rng.random() > 0.1:
+            direction = Direction.DOWN if direction == Direction.UP else Direction.UP
+    return swings
+
+
+def test_batch_kernels_match_scalar_checkers():
+    swings = _random_swings(400, seed=7)
+    arrays = SwingArrays.from_swings(swings)
+    lengths, durations, directions = arrays.lengths, arrays.durations, arrays.directions
+    cases = [
+        (5, is_impulse, is_impulse_batch(lengths, durations, directions, arrays.highs, arrays.lows)),
+        (5, is_terminal_impulse, is_terminal_impulse_batch(lengths, durations, directions, arrays.highs, arrays.lows)),
+        (5, is_triangle, is_triangle_batch(lengths, durations, directions)),
+        (3, is_zigzag, is_zigzag_batch(lengths, durations, directions)),
+        (3, is_flat, is_flat_batch(lengths, durations, directions)),
+    ]
+    for width, scalar, batch in cases:
+        assert batch.scores.shape == (len(swings) - width + 1,)
+        expected = [scalar(swings[i : i + width]) for i in range(len(swings) - width + 1)]
+        np.testing.assert_allclose(batch.scores, [r.score for r in expected], atol=1e-12, err_msg=scalar.__name__)
+        assert batch.valid.tolist() == [r.is_valid for r in expected], scalar.__name__
+        assert batch.valid.any(), scalar.__name__
+
+
+def test_scalar_checkers_without_evidence_keep_scores():
+    swings = _random_swings(60, seed=11)
+    for width, checker in ((5, is_impulse), (5, is_terminal_impulse), (5, is_triangle), (3, is_zigzag), (3, is_flat)):
+        for i in range(len(swings) - width + 1):
+            window = swings[i : i + width]
+            full = checker(window)
+            quick = checker(window, evidence=False)
+            assert (quick.score, quick.is_valid) == (full.score, full.is_valid)
+            if full.rule_checks:
+                assert quick.rule_checks == [] and quick.details is None
+
+
+def test_segment_cache_composes_combinations_from_shared_segments():
+    swings = _random_swings(80, seed=5)
+    segments = SegmentCache()
+    for width, checker in ((7, is_double_three), (11, is_triple_three)):
+        for i in range(len(swings) - width + 1):
+            window = swings[i : i + width]
+            cached = checker(window, segments=segments)
+            plain = checker(window)
+            assert (cached.score, cached.is_valid, cached.violations) == (plain.score, plain.is_valid, plain.violations)
+            assert cached.details == plain.details
+    # Each 3-swing segment is checked once per pattern; every later window reuses it.
+    assert len(segments) == segments.misses <= 2 * (len(swings) - 2)
+    assert segments.hits > 0
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from neowave_core import rule_engine
+from neowave_core.models import Monowave
+from neowave_core.parser import parse_wave_tree
+from neowave_core.rules_db import RULE_DB
+from neowave_core.swings import MonowaveIndex, SwingRangeIndex
+
+
+def _micro_monowaves(count: int, seed: int) -> list[Monowave]:
+    rng = random.Random(seed)
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    price = 100.0
+    monowaves = []
+    for i in range(count):
+        move = rng.uniform(2.0, 12.0) * (1 if i % 2 == 0 else -1)
+        end = price + move
+        monowaves.append(
+            Monowave(
+                i, i, i + 1, base_time + timedelta(hours=i), base_time + timedelta(hours=i + 1),
+                price, end, max(price, end), min(price, end), "up" if move > 0 else "down", move, abs(move), 1,
+                volume_sum=rng.uniform(0.0, 1000.0),
+            )
+        )
+        price = end
+    return monowaves
+
+
+def _macro_monowaves(micro: list[Monowave], width: int) -> list[Monowave]:
+    """One macro swing per ``width`` consecutive micro swings."""
+    macro = []
+    for i in range(0, len(micro) - width + 1, width):
+        group = micro[i : i + width]
+        first, last = group[0], group[-1]
+        change = last.end_price - first.start_price
+        macro.append(
+            Monowave(
+                len(macro), len(macro), len(macro) + 1, first.start_time, last.end_time,
+                first.start_price, last.end_price, max(mw.high_price for mw in group), min(mw.low_price for mw in group),
+                "up" if change >= 0 else "down", change, abs(change), width,
+                volume_sum=sum(mw.volume_sum for mw in group),
+            )
+        )
+    return macro
+
+
+def _micro_tree(seed: int = 3):
+    micro = _micro_monowaves(90, seed)
+    return micro, parse_wave_tree(_macro_monowaves(micro, 3), RULE_DB)
+
+
+def _nodes(tree) -> list:
+    return [node for root in tree.roots for node in rule_engine._walk(root)]
+
+
+def test_attach_micro_to_tree_matches_linear_window_scan():
+    micro, tree = _micro_tree()
+    rule_engine._attach_micro_to_tree(tree.roots, MonowaveIndex(micro), 0.33, RULE_DB)
+
+    patterns = 0
+    for node in _nodes(tree):
+        window = [mw for mw in micro if node.start_time <= mw.start_time and mw.end_time <= node.end_time]
+        analysis = node.sub_scale_analysis
+        assert analysis["swing_count"] == len(window)
+        assert analysis.get("pattern") == rule_engine._micro_pattern(window, RULE_DB, 0.33)
+        patterns += "pattern" in analysis
+    # Every macro swing spans three micro swings, so every window parses.
+    assert patterns == len(_nodes(tree))
+
+
+@pytest.mark.parametrize("use_executor", [False, True], ids=["shared-pool", "executor"])
+def test_pooled_micro_parses_match_serial(use_executor):
+    micro, serial_tree = _micro_tree()
+    _, pooled_tree = _micro_tree()
+    rule_engine._attach_micro_to_tree(serial_tree.roots, MonowaveIndex(micro), 0.33, RULE_DB)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rule_engine._attach_micro_to_tree(
+            pooled_tree.roots, MonowaveIndex(micro), 0.33, RULE_DB, workers=2, executor=executor if use_executor else None
+        )
+
+    assert [node.sub_scale_analysis for node in _nodes(pooled_tree)] == [node.sub_scale_analysis for node in _nodes(serial_tree)]
+
+
+def _sliced_metrics(node, swings: list[Monowave], typical_scale: float) -> tuple[float, float] | None:
+    """Reference: slice the node's swings and scan them, as _annotate_metrics did before the range index."""
+    start = max(0, min(node.start_idx, node.end_idx))
+    end = min(len(swings) - 1, max(node.start_idx, node.end_idx))
+    window = swings[start : end + 1]
+    if not window:
+        return None
+    time_range = (window[-1].end_time - window[0].start_time).total_seconds()
+    price_range = max(sw.high_price for sw in window) - min(sw.low_price for sw in window)
+    avg_volume = sum(sw.volume_sum for sw in window) / len(window)
+    return price_range / (max(time_range, 1.0) * typical_scale), price_range * max(time_range, 1.0) * max(avg_volume, 1.0)
+
+
+def test_annotated_metrics_match_slice_and_scan():
+    micro, tree = _micro_tree()
+    swings = _macro_monowaves(micro, 3)
+    index = SwingRangeIndex(swings)
+    typical_scale = rule_engine._typical_scale(swings)
+    for root in tree.roots:
+        rule_engine._annotate_tree(root, index, typical_scale)
+
+    for node in _nodes(tree):
+        expected = _sliced_metrics(node, swings, typical_scale)
+        assert (node.box_ratio, node.energy_metric) == pytest.approx(expected)
+
+
+def test_score_scenario_with_neowave_rules_scores_a_parsed_tree():
+    micro, tree = _micro_tree()
+    result = rule_engine.score_scenario_with_neowave_rules(tree, _macro_monowaves(micro, 3), RULE_DB, micro_swings=micro)
+
+    assert 0.0 <= result.score <= 1.0
+    assert any(check.key == "box_ratio" for check in result.evidence)
+    assert all(node.sub_scale_analysis is not None for node in _nodes(tree))
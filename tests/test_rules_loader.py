@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+
+from neowave_core import rules_loader
+from neowave_core.rules_loader import compile_rules, load_compiled_rules, rules_hash
+
+
+def _write_rules(path, wave2_rule: str) -> None:
+    rules = {
+        "Impulse": {"TrendingImpulse": {"price_rules": [wave2_rule], "time_rules": []}},
+        "Corrections": {"Combination": {"allow_double": True}},
+    }
+    path.write_text(json.dumps(rules), encoding="utf-8")
+
+
+def test_compiled_rules_are_cached_and_invalidated_by_content(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    cache_dir = tmp_path / "cache"
+    _write_rules(rules_path, "wave2_ratio >= 0.3 && wave2_ratio < 0.9")
+
+    first = load_compiled_rules(rules_path, cache_dir=cache_dir)
+    assert (first.impulse.wave2_min, first.impulse.wave2_max) == (0.3, 0.9)
+    assert len(list(cache_dir.glob("*.json"))) == 1
+    assert load_compiled_rules(rules_path, cache_dir=cache_dir) is first
+
+    _write_rules(rules_path, "wave2_ratio >= 0.25 && wave2_ratio < 0.95")
+    second = load_compiled_rules(rules_path, cache_dir=cache_dir)
+    assert (second.impulse.wave2_min, second.impulse.wave2_max) == (0.25, 0.95)
+    # The stale artifact is replaced by the one for the new content hash.
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+
+def test_compile_rules_memoizes_by_content_hash():
+    rules = {"Corrections": {"Zigzag": {"price_rules": ["waveB_ratio <= 0.5"]}}}
+    compiled = compile_rules(rules)
+    assert compiled.zigzag.b_max == 0.5
+    assert compile_rules(rules) is compiled
+    assert compile_rules(json.loads(json.dumps(rules))) is compiled
+    assert compiled.source_hash == rules_hash(rules)
+
+
+def test_compile_rules_sees_in_place_mutation_and_stays_bounded(monkeypatch):
+    monkeypatch.setattr(rules_loader, "_COMPILED_CACHE_SIZE", 2)
+    rules = {"Corrections": {"Zigzag": {"price_rules": ["waveB_ratio <= 0.5"]}}}
+    assert compile_rules(rules).zigzag.b_max == 0.5
+    rules["Corrections"]["Zigzag"]["price_rules"] = ["waveB_ratio <= 0.6"]
+    assert compile_rules(rules).zigzag.b_max == 0.6
+    compile_rules({"Corrections": {"Zigzag": {"price_rules": ["waveB_ratio <= 0.7"]}}})
+    assert len(rules_loader._COMPILED_BY_HASH) == 2
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from neowave_core.models import Monowave
+from neowave_core.swings import SwingRangeIndex
+
+
+def _random_monowaves(count: int, seed: int) -> list[Monowave]:
+    rng = random.Random(seed)
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    price = 100.0
+    monowaves = []
+    for i in range(count):
+        end = price + rng.uniform(-15.0, 15.0)
+        high = max(price, end) + rng.uniform(0.0, 3.0)
+        low = min(price, end) - rng.uniform(0.0, 3.0)
+        monowaves.append(
+            Monowave(
+                i, i, i + 1, base_time + timedelta(hours=i), base_time + timedelta(hours=i + 1),
+                price, end, high, low, "up" if end > price else "down", end - price, abs(end - price), 1,
+                volume_sum=rng.uniform(0.0, 1000.0),
+            )
+        )
+        price = end
+    return monowaves
+
+
+def _scan_bounds(monowaves: list[Monowave], start_idx: int, end_idx: int) -> tuple[int, int] | None:
+    covered = [pos for pos in range(len(monowaves)) if min(start_idx, end_idx) <= pos <= max(start_idx, end_idx)]
+    return (covered[0], covered[-1]) if covered else None
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 7, 16, 33])
+def test_swing_range_index_matches_slice_and_scan(count):
+    monowaves = _random_monowaves(count, seed=count)
+    index = SwingRangeIndex(monowaves)
+    assert len(index) == count
+    # Reversed, clamped and fully out-of-range index pairs included.
+    for start_idx in range(-3, count + 3):
+        for end_idx in range(-3, count + 3):
+            bounds = index.bounds(start_idx, end_idx)
+            assert bounds == _scan_bounds(monowaves, start_idx, end_idx)
+            if bounds is None:
+                continue
+            start, end = bounds
+            window = monowaves[start : end + 1]
+            assert index.high(start, end) == max(mw.high_price for mw in window)
+            assert index.low(start, end) == min(mw.low_price for mw in window)
+            assert index.volume(start, end) == pytest.approx(sum(mw.volume_sum for mw in window))
@@ -1,7 +1,11 @@
 import unittest
 from datetime import datetime, timedelta
-from neowave_core.models import Monowave, WaveNode
-from neowave_core.wave_engine import verify_pattern
+from unittest import mock
+from neowave_core import wave_engine
+from neowave_core.models import Monowave, PatternValidation, WaveNode
+from neowave_core.swings import MonowaveIndex
+from neowave_core.pattern_evaluator import PatternEvaluator
+from neowave_core.wave_engine import _VERIFY_TARGETS, GoalParser, build_wavenode_from_match, shared_executor, verify_pattern, verify_patterns
 from neowave_core.rules_db import RULE_DB
 
 class TestVerificationBridge(unittest.TestCase):
@@ -110,5 +114,160 @@ class TestVerificationBridge(unittest.TestCase):
         self.assertTrue(any("found Zigzag" in r or "found Flat" in r or "found 3 fragments" in r for r in validation.violated_hard_rules), 
                         f"Unexpected violation message: {validation.violated_hard_rules}")
 
+    def test_verify_with_prebuilt_index_slices_macro_range(self):
+        base_time = datetime(2023, 1, 1)
+        times = [base_time + timedelta(hours=i) for i in range(8)]
+        prices = [95, 100, 110, 105, 120, 112, 125, 118]
+        micro_waves = [
+            self.create_monowave(i, i + 1, prices[i], prices[i + 1], times[i], times[i + 1])
+            for i in range(7)
+        ]
+        index = MonowaveIndex(reversed(micro_waves))
+        self.assertEqual(index.window(times[1], times[4]), micro_waves[1:4])
+        self.assertEqual(index.window(times[4], times[1]), [])
+        self.assertEqual(index.span(times[1], times[4]), (1, 4))
+        lo, hi = index.span(times[4], times[1])
+        self.assertEqual(lo, hi)
+        groups = index.group_spans([(times[1], times[4]), (times[0], times[2]), (times[1], times[4]), (times[4], times[1])])
+        self.assertEqual(groups, {(1, 4): [0, 2], (0, 2): [1], (lo, hi): [3]})
+
+        macro_node = WaveNode(
+            id=998,
+            level=1,
+            degree_label="Macro",
+            start_idx=1,
+            end_idx=4,
+            start_time=times[1],
+            end_time=times[4],
+            start_price=100,
+            end_price=120,
+            high_price=120,
+            low_price=100,
+            direction='up',
+            pattern_type='Zigzag',
+            children=[]
+        )
+        validation = verify_pattern(macro_node, index, rule_db=RULE_DB)
+        linear = verify_pattern(macro_node, micro_waves, rule_db=RULE_DB)
+
+        self.assertTrue(validation.hard_valid, f"Reasons: {validation.violated_hard_rules}")
+        self.assertIn("Micro structure confirms Zigzag", validation.satisfied_rules)
+        self.assertEqual(validation, linear)
+
+    def test_batch_verification_matches_single_calls(self):
+        base_time = datetime(2023, 1, 1)
+        times = [base_time + timedelta(hours=i) for i in range(9)]
+        prices = [100, 110, 105, 125, 115, 130, 120, 126, 110]
+        micro_waves = [
+            self.create_monowave(i, i + 1, prices[i], prices[i + 1], times[i], times[i + 1])
+            for i in range(8)
+        ]
+
+        def macro(start, end, pattern_type):
+            return WaveNode(
+                id=start * 10 + end,
+                level=1,
+                degree_label="Macro",
+                start_idx=start,
+                end_idx=end,
+                start_time=times[start],
+                end_time=times[end],
+                start_price=prices[start],
+                end_price=prices[end],
+                high_price=max(prices[start:end + 1]),
+                low_price=min(prices[start:end + 1]),
+                direction='up' if prices[end] >= prices[start] else 'down',
+                pattern_type=pattern_type,
+                children=[]
+            )
+
+        macro_nodes = [macro(0, 5, 'Impulse'), macro(5, 8, 'Zigzag'), macro(0, 3, 'Impulse'), macro(2, 2, 'Flat')]
+        single = [verify_pattern(node, micro_waves, rule_db=RULE_DB) for node in macro_nodes]
+
+        self.assertEqual(verify_patterns(macro_nodes, micro_waves, rule_db=RULE_DB), single)
+        self.assertEqual(verify_patterns(macro_nodes, MonowaveIndex(micro_waves), rule_db=RULE_DB, workers=2), single)
+        self.assertIs(shared_executor(2), shared_executor(2))
+        self.assertEqual(verify_patterns(macro_nodes, micro_waves, rule_db=RULE_DB, workers=2, executor=shared_executor(2)), single)
+        self.assertTrue(single[0].hard_valid)
+        self.assertIn("No micro data found for verification", single[3].violated_hard_rules)
+
+
+    def test_goal_parser_returns_best_scoring_parse(self):
+        evaluator = PatternEvaluator(RULE_DB)
+
+        def parses(leaves, legs_left, window, value):
+            # Every parse of ``leaves`` into ``legs_left`` alternating legs, exhaustively.
+            if legs_left == 0:
+                if not leaves:
+                    yield window, value
+                return
+            for cut in range(1, len(leaves) - legs_left + 2):
+                for child, child_value in spans(leaves[:cut]):
+                    if window and child.direction == window[-1].direction:
+                        continue
+                    yield from parses(leaves[cut:], legs_left - 1, window + [child], value + child_value)
+
+        def spans(leaves):
+            if len(leaves) == 1:
+                yield leaves[0], 0.0
+                return
+            for legs, matcher in _VERIFY_TARGETS.values():
+                for window, value in parses(leaves, legs, [], 0.0):
+                    pm = matcher(window, evaluator)
+                    if pm is not None:
+                        yield build_wavenode_from_match(pm), value + pm.score
+
+        base_time = datetime(2023, 1, 1)
+        prices = [100, 110, 104, 118, 112, 126, 119, 131, 124, 140]
+        micro_waves = [
+            self.create_monowave(i, i + 1, prices[i], prices[i + 1], base_time + timedelta(hours=i), base_time + timedelta(hours=i + 1))
+            for i in range(len(prices) - 1)
+        ]
+        parser = GoalParser(micro_waves, evaluator)
+        n = len(parser.leaves)
+        for target, (legs, matcher) in _VERIFY_TARGETS.items():
+            for i in range(n):
+                for j in range(i + legs, n + 1):
+                    found = parser.best_match(target, i, j)
+                    values = [value + pm.score for window, value in parses(parser.leaves[i:j], legs, [], 0.0) if (pm := matcher(window, evaluator)) is not None]
+                    if not values:
+                        self.assertIsNone(found)
+                    else:
+                        self.assertAlmostEqual(found[0], min(values))
+
+
+    def test_goal_parser_checks_each_chart_cell_once(self):
+        evaluator = PatternEvaluator(RULE_DB)
+        base_time = datetime(2023, 1, 1)
+        prices = [100 + (7 if i % 2 else 0) + i for i in range(31)]
+        micro_waves = [
+            self.create_monowave(i, i + 1, prices[i], prices[i + 1], base_time + timedelta(hours=i), base_time + timedelta(hours=i + 1))
+            for i in range(len(prices) - 1)
+        ]
+        calls = []
+
+        def counting(matcher):
+            def match(window, ev):
+                calls.append(len(window))
+                return matcher(window, ev)
+            return match
+
+        targets = {name: (legs, counting(matcher)) for name, (legs, matcher) in _VERIFY_TARGETS.items()}
+        with mock.patch.dict(wave_engine._VERIFY_TARGETS, targets):
+            parser = GoalParser(micro_waves, evaluator)
+            wave_engine._verify_by_parse(parser, "Impulse")
+        # At most the kept chains of both first-leg directions are matched per (pattern, span).
+        self.assertLessEqual(len(calls), 2 * wave_engine.VERIFY_CHAINS * len(parser._matches))
+
+    def test_long_windows_skip_the_goal_parser(self):
+        base_time = datetime(2023, 1, 1)
+        micro_waves = [
+            self.create_monowave(i, i + 1, 100 + (i % 2) * 5, 105 - (i % 2) * 5, base_time + timedelta(hours=i), base_time + timedelta(hours=i + 1))
+            for i in range(wave_engine.VERIFY_MAX_LEAVES + 1)
+        ]
+        with mock.patch.object(wave_engine, "GoalParser", side_effect=AssertionError("parsed a long window")):
+            validation = wave_engine._verify_window("Impulse", micro_waves, PatternEvaluator(RULE_DB))
+        self.assertIsInstance(validation, PatternValidation)
+
 if __name__ == '__main__':
     unittest.main()